@@ -1,8 +1,20 @@
 import pygame
 import numpy as np
 import os
+import re
 from typing import Dict, List, Optional
 import utils
+import sample_bank
+import sample_manifest
+from sample_cache import SampleCache
+from soft_mixer import MixerSound, SoftMixer, create_backend
+from voice_pool import VoicePool
+from latency_tracer import get_tracer
+from log_utils import get_logger
+
+logger = get_logger("audio")
+
+_NOTE_NAME_RE = re.compile(r"string\d+_fret\d+$")
 
 class AudioSystem:
     """高级音频处理系统"""
@@ -15,45 +27,127 @@ class AudioSystem:
         self.samples = {}
         self.channels = {}
         self.effects = {}
+        self.sample_check = {}
         self._volume = config.get('volume', 0.7)
+        self.mixer: Optional[SoftMixer] = None
+        self.engine = config.get('engine', 'pygame')
+        self._bank: Optional[sample_bank.SampleBank] = None   # 按需加载时保持映射，close() 时释放
         
-        # 初始化pygame mixer
-        pygame.mixer.init(
-            frequency=config['sample_rate'],
-            size=-16,
-            channels=config['channels'],
-            buffer=config['buffer_size']
-        )
+        if self.engine == 'numpy':
+            self.init_soft_mixer()
+        if self.mixer is None:
+            self.engine = 'pygame'
+            # 初始化pygame mixer
+            pygame.mixer.init(
+                frequency=config['sample_rate'],
+                size=-16,
+                channels=config['channels'],
+                buffer=config['buffer_size']
+            )
+        self.voices = self.create_voice_pool()
         
         self.load_samples()
+
+    def create_voice_pool(self) -> VoicePool:
+        """按 audio.max_voices / voice_steal / string_choke 创建声部池
+
+        pygame 引擎下为 6 根弦各预留一个 Channel（同弦新音直接替换旧音）；
+        其余声音使用另外 2 × max_voices 个通道（被抢占的声部淡出期间仍占用通道），保证池的上限先于 pygame 通道耗尽生效。
+        """
+        config = self.config
+        max_voices = int(config.get('max_voices', 12))
+        choke = bool(config.get('string_choke', True))
+        reserved = None
+        if self.mixer is None and choke:
+            pygame.mixer.set_num_channels(2 * max_voices + 6)
+            pygame.mixer.set_reserved(6)
+            reserved = lambda group: pygame.mixer.Channel(group - 1) if isinstance(group, int) and 1 <= group <= 6 else None
+        elif self.mixer is None:
+            pygame.mixer.set_num_channels(2 * max_voices)
+        force_channel = (lambda: pygame.mixer.find_channel(True)) if self.mixer is None else None
+        return VoicePool(max_voices, steal=config.get('voice_steal', 'oldest'), choke=choke,
+                         reserved=reserved, force_channel=force_channel)
+
+    def get_voice_stats(self) -> Dict:
+        """声部统计：当前/峰值发声数、累计开始、被抢占、被同弦闷掉、无通道丢弃的次数"""
+        return self.voices.stats()
+
+    def init_soft_mixer(self):
+        """启用 NumPy 软件混音引擎（audio.engine: numpy）
+
+        输出后端由 audio.output 选择（sounddevice / null / file），每次回调 mixer_block_size 帧。
+        后端无法启动（如未安装 sounddevice）时给出警告并回退到 pygame.mixer。
+        """
+        config = self.config
+        mixer = SoftMixer(config['sample_rate'], config['channels'], config.get('mixer_block_size', 128))
+        mixer.set_master_volume(config.get('master_volume', 1.0))
+        try:
+            mixer.start(create_backend(config.get('output', 'sounddevice'), path=config.get('output_file')))
+        except (ImportError, OSError, ValueError) as e:
+            print(f"Warning: 软件混音输出启动失败，改用 pygame.mixer: {e}")
+            return
+        self.mixer = mixer
+
+    def output_format(self):
+        """当前输出的 (采样率, 声道数)"""
+        if self.mixer is not None:
+            return self.mixer.sample_rate, self.mixer.channels
+        rate, _, channels = pygame.mixer.get_init()
+        return rate, channels
+
+    def sound_from_file(self, path: str):
+        """加载 WAV 为当前引擎的样本对象（pygame.mixer.Sound 或 MixerSound）"""
+        if self.mixer is None:
+            return pygame.mixer.Sound(path)
+        _, pcm = sample_bank.read_wav_int16(path, self.mixer.channels)
+        return MixerSound.from_int16(self.mixer, pcm)
+
+    def sound_from_buffer(self, buffer, channels: Optional[int] = None):
+        """由 int16 交错 PCM 缓冲区构造当前引擎的样本对象（channels 为源声道数，仅软件混音使用）"""
+        if self.mixer is None:
+            return pygame.mixer.Sound(buffer=buffer)
+        return MixerSound.from_int16(self.mixer, buffer, channels)
     
     def load_samples(self):
-        """加载所有音频样本"""
+        """加载所有音频样本（优先使用打包采样库，否则逐个加载 WAV）"""
         base_path = "assets/guitar_samples"
+        # 兼容：预命名的 stringX_fretY.wav 文件（0-10品，6弦）
+        names = [f"string{s}_fret{f}.wav" for s in range(1, 7) for f in range(0, 11)]
+        
+        bank_path = self.config.get('sample_bank') or os.path.join(base_path, sample_bank.BANK_NAME)
+        bank = self.open_sample_bank(bank_path, base_path)
+        if self.config.get('lazy_samples', False):
+            self.init_lazy_samples(bank, base_path)
+            return
+        if bank is not None:
+            self.load_sample_bank(bank, names)
+            return
         
         # 加载单音
         single_notes_path = os.path.join(base_path, "single_notes")
-        # 兼容：加载预命名的 stringX_fretY.wav 文件（0-10品，6弦）
-        for s in range(1, 7):
-            for f in range(0, 11):
-                fname = f"string{s}_fret{f}.wav"
-                file_path = os.path.join(single_notes_path, fname)
-                key = f"string{s}_fret{f}"
-                if os.path.exists(file_path):
-                    try:
-                        self.samples[key] = pygame.mixer.Sound(file_path)
-                    except Exception:
-                        print(f"Warning: 无法加载样本 {file_path}")
-                else:
-                    # 缺失样本时不立刻创建，以免阻塞，使用警告
-                    print(f"Warning: Sample file {file_path} not found")
+        # 先用 manifest 做一次完整性检查（单次 scandir），不再逐个 os.path.exists
+        self.sample_check = sample_manifest.verify_files(single_notes_path, names)
+        self.sample_check['source'] = single_notes_path
+        for fname in self.sample_check['present']:
+            file_path = os.path.join(single_notes_path, fname)
+            try:
+                self.samples[fname[:-4]] = self.sound_from_file(file_path)
+            except Exception:
+                print(f"Warning: 无法加载样本 {file_path}")
+        # 缺失样本时不立刻创建，以免阻塞，汇总为一条警告
+        if self.sample_check['missing']:
+            print(f"Warning: {single_notes_path} 缺少 {len(self.sample_check['missing'])} 个单音样本，"
+                  f"可运行 generate_guitar_samples.py 生成")
+        if self.sample_check['corrupt']:
+            print(f"Warning: {len(self.sample_check['corrupt'])} 个单音样本与 manifest 记录不符，已跳过: "
+                  f"{', '.join(self.sample_check['corrupt'])}")
         
         # 加载和弦
         chords_path = os.path.join(base_path, "chords")
         for chord in ["C_major", "G_major", "D_major", "A_minor", "E_minor", "F_major"]:
             file_path = os.path.join(chords_path, f"{chord}.wav")
             if os.path.exists(file_path):
-                self.samples[chord] = pygame.mixer.Sound(file_path)
+                self.samples[chord] = self.sound_from_file(file_path)
             else:
                 print(f"Warning: Chord file {file_path} not found")
         
@@ -62,7 +156,112 @@ class AudioSystem:
         for effect in ["pick_noise", "string_slide", "harmonic"]:
             file_path = os.path.join(effects_path, f"{effect}.wav")
             if os.path.exists(file_path):
-                self.effects[effect] = pygame.mixer.Sound(file_path)
+                self.effects[effect] = self.sound_from_file(file_path)
+
+    def open_sample_bank(self, bank_path: str, base_path: str) -> Optional[sample_bank.SampleBank]:
+        """打开内存映射的打包采样库（sample_bank.py 生成）
+
+        文件不存在、与混音器格式不符或落后于单音 manifest 时返回 None，由调用方回退到 WAV。
+        """
+        if not os.path.exists(bank_path):
+            return None
+        try:
+            bank = sample_bank.SampleBank(bank_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: 无法打开采样库 {bank_path}: {e}")
+            return None
+        mixer_rate, mixer_channels = self.output_format()
+        if (bank.sample_rate, bank.channels) != (mixer_rate, mixer_channels):
+            print(f"Warning: 采样库格式 {bank.sample_rate}Hz/{bank.channels}ch 与混音器不一致，改为加载 WAV")
+            return None
+        if bank.manifest != sample_bank.manifest_digest(base_path):
+            print("Warning: 采样库落后于重新生成的单音，改为加载 WAV（运行 python sample_bank.py 重新打包）")
+            return None
+        return bank
+
+    def load_sample_bank(self, bank: sample_bank.SampleBank, names: List[str]):
+        """从打包采样库一次性加载全部样本
+
+        只读取一次索引，每个 Sound 直接由映射区切片构造，不再逐个打开、解析 WAV。
+        """
+        for key in bank.keys():
+            group, name = key.split('/', 1)
+            # pygame 会把缓冲区复制进 SDL 的音频块，之后即可释放映射
+            sound = self.sound_from_buffer(bank.buffer(key))
+            if group == 'effects':
+                self.effects[name] = sound
+            else:
+                self.samples[name] = sound
+        bank.close()
+        
+        missing = [n for n in names if n[:-4] not in self.samples]
+        self.sample_check = {
+            'present': [n for n in names if n[:-4] in self.samples],
+            'missing': missing,
+            'corrupt': [],
+            'has_manifest': bool(bank.manifest),
+            'source': bank.path,
+        }
+        if missing:
+            print(f"Warning: 采样库 {bank.path} 缺少 {len(missing)} 个单音样本")
+
+    def init_lazy_samples(self, bank: Optional[sample_bank.SampleBank], base_path: str):
+        """按需加载模式：单音与和弦在首次播放时解码，放入按 sample_cache_mb 限额的 LRU 缓存
+
+        可用样本由采样库索引或一次目录扫描得出（不限于 0-10 品），特效音较小，仍在启动时加载。
+        播放某弦某品后，后台预取同一根弦上相邻 prefetch_frets 个品位。
+        """
+        if bank is not None:
+            entries = {key.split('/', 1)[1]: key for key in bank.keys()
+                       if not key.startswith('effects/')}
+            loader = lambda name: self.sound_from_buffer(bank.buffer(entries[name]))
+            for key in bank.keys('effects'):
+                self.effects[key.split('/', 1)[1]] = self.sound_from_buffer(bank.buffer(key))
+            source = bank.path
+            self._bank = bank
+        else:
+            entries = {}
+            for group in ("single_notes", "chords"):
+                group_path = os.path.join(base_path, group)
+                listing = sample_manifest.verify_files(group_path, sample_manifest.scan_sizes(group_path))
+                for fname in listing['present']:
+                    if fname.endswith('.wav'):
+                        entries[fname[:-4]] = os.path.join(group_path, fname)
+            loader = lambda name: self.sound_from_file(entries[name])
+            effects_path = os.path.join(base_path, "effects")
+            for effect in ["pick_noise", "string_slide", "harmonic"]:
+                file_path = os.path.join(effects_path, f"{effect}.wav")
+                if os.path.exists(file_path):
+                    self.effects[effect] = self.sound_from_file(file_path)
+            source = os.path.join(base_path, "single_notes")
+
+        mixer_rate, mixer_channels = self.output_format()
+        bytes_per_second = mixer_rate * mixer_channels * 2
+        self.samples = SampleCache(
+            loader, entries,
+            max_bytes=float(self.config.get('sample_cache_mb', 48)) * 1e6,
+            size_of=lambda snd: snd.nbytes if isinstance(snd, MixerSound) else snd.get_length() * bytes_per_second,
+            in_use=lambda snd: snd.get_num_channels() > 0,
+        )
+        notes = sorted(n for n in entries if _NOTE_NAME_RE.match(n))
+        self.sample_check = {'present': [n + '.wav' for n in notes], 'missing': [], 'corrupt': [],
+                             'has_manifest': bank is not None and bool(bank.manifest), 'source': source}
+        if not notes:
+            print(f"Warning: {source} 中没有单音样本，可运行 generate_guitar_samples.py 生成")
+
+    def prefetch_neighbours(self, string_number: int, fret: int):
+        """按需加载模式下，后台预取同一根弦上相邻的品位"""
+        if not isinstance(self.samples, SampleCache):
+            return
+        radius = int(self.config.get('prefetch_frets', 1))
+        self.samples.prefetch(f"string{string_number}_fret{f}"
+                              for d in range(1, radius + 1) for f in (fret + d, fret - d) if f >= 0)
+
+    def get_sample_stats(self) -> Dict:
+        """样本缓存统计；一次性加载模式下所有样本常驻，只报告数量"""
+        if isinstance(self.samples, SampleCache):
+            return self.samples.stats()
+        return {'resident': len(self.samples), 'available': len(self.samples)}
 
     def play_string_fret(self, string_number: int, fret: int, volume: float = None):
         """按照命名约定播放指定弦与品位的样本（例如 string1_fret0.wav）。"""
@@ -71,14 +270,17 @@ class AudioSystem:
 
         key = f"string{string_number}_fret{fret}"
         if key in self.samples:
+            tracer = get_tracer()
             try:
-                snd = self.samples[key]
-                snd.set_volume(volume)
-                snd.play()
+                with tracer.span('audio_trigger'):
+                    # 以弦号为分组：同一根弦上的新音闷掉旧音
+                    self.voices.play(self.samples[key], group=string_number, volume=volume)
+                tracer.audio_trigger(key)
             except Exception as e:
-                print(f"播放样本失败 {key}: {e}")
+                logger.warning("播放样本失败 %s: %s", key, e)
+            self.prefetch_neighbours(string_number, fret)
         else:
-            print(f"样本未找到: {key}")
+            logger.debug("样本未找到: %s", key)
     
     def create_default_sample(self, frequency: float, duration: float) -> pygame.mixer.Sound:
         """创建默认音频样本（正弦波）"""
@@ -103,7 +305,7 @@ class AudioSystem:
         
         # 转换为pygame声音
         wave = (wave * 32767).astype(np.int16)
-        return pygame.mixer.Sound(buffer=wave)
+        return self.sound_from_buffer(wave, channels=1)
     
     def play_note(self, note: str, volume: float = None):
         """播放单个音符"""
@@ -114,8 +316,7 @@ class AudioSystem:
                 volume = self.config.get('volume', 0.7)
 
         if note in self.samples:
-            self.samples[note].set_volume(volume)
-            self.samples[note].play()
+            self.voices.play(self.samples[note], group=f"note:{note}", volume=volume)
     
     def play_chord(self, chord: str, volume: float = None):
         """播放和弦"""
@@ -129,15 +330,8 @@ class AudioSystem:
             volume = _get_default_volume()
 
         if chord in self.samples:
-            # 停止同名正在播放的通道
-            if chord in self.channels and self.channels[chord] is not None:
-                try:
-                    self.channels[chord].stop()
-                except Exception:
-                    pass
-
-            # play() 返回 Channel 对象
-            channel = self.samples[chord].play()
+            # 同名和弦作为一个分组：声部池会先停掉正在播放的旧和弦
+            channel = self.voices.play(self.samples[chord], group=f"chord:{chord}")
             if channel is not None:
                 try:
                     channel.set_volume(volume)
@@ -154,8 +348,7 @@ class AudioSystem:
     def play_effect(self, effect: str, volume: float = 0.5):
         """播放特效音"""
         if effect in self.effects:
-            self.effects[effect].set_volume(volume)
-            self.effects[effect].play()
+            self.voices.play(self.effects[effect], volume=volume)
     
     def stop_all(self):
         """停止所有音频"""
@@ -167,11 +360,29 @@ class AudioSystem:
             except Exception:
                 pass
         self.channels.clear()
+        self.voices.stop_all()
+        if self.mixer is not None:
+            self.mixer.stop_all()
+            return
         try:
             pygame.mixer.stop()
         except Exception:
             pass
     
+    def close(self):
+        """停止发声并释放资源：软件混音的输出流（文件输出会写完 WAV 头）、样本缓存的预取线程与采样库映射
+
+        可重复调用；Streamlit 每次重跑都会新建应用，旧实例必须 close() 才不会泄漏输出流与打开的文件。
+        """
+        self.stop_all()
+        if isinstance(self.samples, SampleCache):
+            self.samples.close()
+        if self._bank is not None:
+            self._bank.close()
+            self._bank = None
+        if self.mixer is not None:
+            self.mixer.close()
+    
     def set_volume(self, volume: float):
         """设置主音量"""
         try:
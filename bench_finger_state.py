@@ -0,0 +1,65 @@
+"""手指状态判定微基准：逐指 get_finger_state vs 批量 finger_states_batch
+
+  python bench_finger_state.py [手数]
+
+同时校验两条路径对每只手、每根手指的判定结果完全一致。
+"""
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from finger_geometry import FingerGeometry, finger_states_batch
+
+# 与 HandTracker.process_frame 中的调用参数一致
+_CALLS = [(4, 3, 2, 0), (8, 7, 6, 0), (12, 11, 10, 0), (16, 15, 14, 0), (20, 19, 18, 0)]
+
+
+def make_hands(n: int, seed: int = 0) -> np.ndarray:
+    """生成 n 只随机手：在张开手掌模板上叠加较大扰动，覆盖伸直/弯曲两类情况"""
+    rng = np.random.default_rng(seed)
+    template = np.zeros((21, 3))
+    template[0] = (0.5, 0.8, 0.0)
+    for f, x in enumerate((0.38, 0.45, 0.5, 0.55, 0.6)):
+        for j in range(4):
+            template[1 + f * 4 + j] = (x + (x - 0.5) * 0.2 * j, 0.7 - 0.08 * (j + 1), 0.0)
+    noise = rng.normal(scale=0.06, size=(n, 21, 3))
+    return template[None] + noise
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    hands = make_hands(n)
+    geom = FingerGeometry()
+
+    # 逐指路径的 Landmark 对象构造不计入耗时
+    landmark_lists = [[SimpleNamespace(x=float(p[0]), y=float(p[1]), z=float(p[2])) for p in c] for c in hands]
+    t0 = time.perf_counter()
+    ref = np.zeros((n, 5), dtype=bool)
+    for h, lm in enumerate(landmark_lists):
+        for f, args in enumerate(_CALLS):
+            ref[h, f] = geom.get_finger_state(lm, *args)
+    t_ref = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = finger_states_batch(hands)
+    t_batch = time.perf_counter() - t0
+
+    # 单手调用（实时场景每帧 1-2 只手）
+    t0 = time.perf_counter()
+    for coords in hands:
+        finger_states_batch(coords)
+    t_single = time.perf_counter() - t0
+
+    mismatches = int(np.count_nonzero(ref != batch))
+    print(f"hands={n}  extended ratio={ref.mean():.2f}  mismatches={mismatches}")
+    print(f"per-finger : {t_ref * 1e6 / n:8.1f} us/hand")
+    print(f"batch(N)   : {t_batch * 1e6 / n:8.1f} us/hand")
+    print(f"batch(1)   : {t_single * 1e6 / n:8.1f} us/hand")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""3D 吉他渲染基准：立即模式 vs VBO 保留模式（OSMesa 离屏渲染，无需显示器）
+
+测帧率之外，还在同一时刻、同一振动状态下各渲染一帧，报告两种模式输出的像素差异。
+需要 PyOpenGL 与 libOSMesa（如 Debian/Ubuntu 的 libosmesa6）：
+  python bench_guitar_3d.py
+  python bench_guitar_3d.py --frames 1000 --size 1280 720 --save guitar   # 另存 guitar_immediate.png / guitar_retained.png
+"""
+import os
+
+# 必须在导入任何 OpenGL 模块之前选择平台
+os.environ.setdefault('PYOPENGL_PLATFORM', 'osmesa')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+import pygame
+
+import utils
+from guitar_3d_engine import Guitar3DEngine, OffscreenContext
+
+
+def bench(config, frames: int, retained: bool, context: OffscreenContext) -> float:
+    """返回平均每帧耗时（秒）；每 10 帧拨一根弦，保持弦在振动"""
+    engine = Guitar3DEngine(config, retained=retained, headless=True)
+    engine.render(1 / 60)
+    context.read_pixels()   # 预热并等待渲染完成
+    t0 = time.perf_counter()
+    for f in range(frames):
+        if f % 10 == 0:
+            engine.string_vibration[(f // 10) % 6] = 1.0
+        engine.render(1 / 60)
+    context.read_pixels()
+    elapsed = time.perf_counter() - t0
+    engine.release()
+    return elapsed / frames
+
+
+def render_frame(config, retained: bool, context: OffscreenContext, ticks: int = 1234) -> np.ndarray:
+    """固定 pygame 时钟与弦振幅，渲染一帧并读回 RGB"""
+    get_ticks = pygame.time.get_ticks
+    pygame.time.get_ticks = lambda: ticks
+    try:
+        engine = Guitar3DEngine(config, retained=retained, headless=True)
+        engine.string_vibration = [1.0, 0.8, 0.6, 0.4, 0.2, 0.0]
+        engine.render(0.0)   # delta_time 为 0：弦振幅不衰减
+        frame = context.read_pixels()
+        engine.release()
+    finally:
+        pygame.time.get_ticks = get_ticks
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="立即模式 vs VBO 保留模式的离屏渲染帧率")
+    parser.add_argument('--frames', type=int, default=500)
+    parser.add_argument('--size', type=int, nargs=2, default=[640, 480], metavar=('W', 'H'))
+    parser.add_argument('--save', help="把两种模式的对比帧另存为 <前缀>_immediate.png / <前缀>_retained.png")
+    args = parser.parse_args()
+
+    pygame.init()
+    config = utils.load_config()['rendering']
+    context = OffscreenContext(*args.size)
+    print(f"{'mode':<12}{'FPS':>10}{'ms/frame':>10}")
+    for name, retained in (('immediate', False), ('retained', True)):
+        seconds = bench(config, args.frames, retained, context)
+        print(f"{name:<12}{1 / seconds:>10.1f}{seconds * 1000:>10.3f}")
+
+    frames = {name: render_frame(config, retained, context) for name, retained in
+              (('immediate', False), ('retained', True))}
+    diff = np.abs(frames['immediate'].astype(np.int16) - frames['retained']).max(axis=2)
+    print(f"输出对比：最大像素差 {int(diff.max())}，不同像素 {int((diff > 0).sum())} / {diff.size}"
+          f"（{'一致' if not diff.any() else '不一致'}）")
+    if args.save:
+        for name, frame in frames.items():
+            cv2.imwrite(f"{args.save}_{name}.png", cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+    context.release()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""启动耗时 / 常驻内存基准：旧版 HandTracker（内嵌 AirGuitarGestureRecognizer）vs 现版 HandTracker
+
+旧版 HandTracker 为了调用 get_finger_state 内嵌一个 AirGuitarGestureRecognizer，启动时构建两个 Hands 图；
+现版手指判定改用不持有模型的 FingerGeometry，只构建一个。
+
+每种模式在独立子进程中运行，避免模型缓存互相影响：
+  python bench_hands_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def _rss_mb() -> float:
+    """当前进程常驻内存（MB）"""
+    try:
+        with open('/proc/self/status', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    try:
+        import resource
+        # macOS 返回字节，Linux 返回 KB；这里只作为兜底
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage / (1024.0 * 1024.0) if sys.platform == 'darwin' else usage / 1024.0
+    except Exception:
+        return 0.0
+
+
+def _run_mode(mode: str) -> dict:
+    import mediapipe as mp  # noqa: F401  预先导入，只统计模型构建开销
+    import utils
+
+    config = utils.load_config()['hand_tracking']
+    rss_before = _rss_mb()
+    t0 = time.perf_counter()
+
+    if mode == 'separate':
+        # 旧行为：HandTracker 与其内嵌的 AirGuitarGestureRecognizer 各自构建一个 Hands
+        hands_a = mp.solutions.hands.Hands(
+            model_complexity=config['model_complexity'],
+            min_detection_confidence=config['min_detection_confidence'],
+            min_tracking_confidence=config['min_tracking_confidence'],
+            max_num_hands=config['max_num_hands']
+        )
+        hands_b = mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=2,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.7
+        )
+        instances = 2
+        closers = [hands_a.close, hands_b.close]
+    else:
+        from hand_tracker import HandTracker
+        from hands_pool import pool_stats
+
+        tracker = HandTracker(config)
+        instances = pool_stats()['instances']
+        closers = [tracker.release]
+
+    elapsed = time.perf_counter() - t0
+    rss_after = _rss_mb()
+    for close in closers:
+        close()
+    return {
+        'mode': mode,
+        'instances': instances,
+        'startup_s': round(elapsed, 3),
+        'rss_delta_mb': round(rss_after - rss_before, 1),
+    }
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        print(json.dumps(_run_mode(sys.argv[2])))
+        return
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    for mode in ('separate', 'current'):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode],
+                             cwd=here, capture_output=True, text=True)
+        if out.returncode != 0:
+            print(f"{mode}: 失败\n{out.stderr}")
+            continue
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"{'mode':<10}{'instances':>10}{'startup(s)':>12}{'RSS Δ(MB)':>12}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['instances']:>10}{r['startup_s']:>12.3f}{r['rss_delta_mb']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Karplus-Strong 合成基准：渲染完整 66 音（6 弦 × 0-10 品）单音库
+
+  python bench_karplus_strong.py              # 分块向量化 vs 逐样本循环
+  python bench_karplus_strong.py --skip-reference
+
+两条路径使用相同的随机种子，逐音比较输出（归一化到 ±0.9 的立体声）的最大绝对误差。
+只渲染到内存，不写 WAV 文件。
+"""
+import sys
+import time
+
+import numpy as np
+
+import generate_guitar_samples as gen
+
+TOLERANCE = 1e-6
+
+
+def render_library(delay_line):
+    """用指定延迟线实现渲染全部 66 个单音，返回 (耗时, 输出列表)"""
+    original = gen.karplus_strong_delay_line
+    gen.karplus_strong_delay_line = delay_line
+    try:
+        outputs = []
+        t0 = time.perf_counter()
+        for s_idx, base in enumerate(gen.BASE_FREQS, start=1):
+            for fret in range(0, 11):
+                np.random.seed(s_idx * 100 + fret)
+                freq = base * (2 ** (fret / 12.0))
+                outputs.append(gen.improved_karplus_strong(freq, s_idx, fret))
+        return time.perf_counter() - t0, outputs
+    finally:
+        gen.karplus_strong_delay_line = original
+
+
+def main():
+    t_block, block_out = render_library(gen.karplus_strong_delay_line)
+    print(f"block (vectorized): {t_block:6.2f}s  ({t_block / len(block_out) * 1000:.1f} ms/note)")
+
+    if '--skip-reference' in sys.argv:
+        return
+
+    t_ref, ref_out = render_library(gen.karplus_strong_delay_line_reference)
+    print(f"reference (loop)  : {t_ref:6.2f}s  ({t_ref / len(ref_out) * 1000:.1f} ms/note)")
+    print(f"speedup           : {t_ref / t_block:6.1f}x")
+
+    max_err = max(float(np.max(np.abs(a.astype(np.float64) - b))) for a, b in zip(block_out, ref_out))
+    print(f"max abs error     : {max_err:.2e} (tolerance {TOLERANCE:.0e})")
+    if max_err > TOLERANCE:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
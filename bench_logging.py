@@ -0,0 +1,64 @@
+"""热路径日志开销基准：每帧两只手经过 GestureAnalyzer 的耗时
+
+  python bench_logging.py [帧数]
+
+对比三种配置：
+  sync-debug   : DEBUG 全量同步写出（等价于原先每条 print）
+  off          : 默认配置（WARNING，调试日志只做级别判断）
+  sampled-async: DEBUG + 每 30 条采样 + 异步环形缓冲
+输出写入 os.devnull，实际写到管道/Streamlit 日志时同步写出的代价更高。
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+import utils
+from bench_finger_state import make_hands
+from finger_geometry import finger_states_batch, finger_states_dict
+from gesture_analyzer import GestureAnalyzer
+from hand_frame import HandFrame
+from log_utils import configure_logging
+
+CONFIGS = [
+    ('sync-debug', {'level': 'DEBUG', 'sample_every': 1, 'ring_buffer': 0}),
+    ('off', {'level': 'WARNING'}),
+    ('sampled-async', {'level': 'DEBUG', 'sample_every': 30, 'ring_buffer': 1024}),
+]
+
+
+def run(analyzer: GestureAnalyzer, frames) -> float:
+    t0 = time.perf_counter()
+    for left, right in frames:
+        la = analyzer.analyze_hand_position(left, (480, 640))
+        analyzer.map_left_hand_to_string(la['hand_features'])
+        ra = analyzer.analyze_hand_position(right, (480, 640))
+        analyzer.determine_fret_from_right_hand(ra['hand_features'], right)
+    return time.perf_counter() - t0
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    coords = make_hands(n * 2).astype(np.float32)
+    states = finger_states_batch(coords)
+    hands = [HandFrame(c, 'Left' if i % 2 == 0 else 'Right', 0.9, finger_states=finger_states_dict(s))
+             for i, (c, s) in enumerate(zip(coords, states))]
+    frames = list(zip(hands[0::2], hands[1::2]))
+
+    config = utils.load_config()
+    analyzer = GestureAnalyzer(config)
+    os.environ.pop("AIRGUITAR_LOG_LEVEL", None)
+
+    with open(os.devnull, 'w', encoding='utf-8') as sink:
+        run(analyzer, frames[:100])  # 预热
+        print(f"{'config':<15}{'us/frame':>10}")
+        for name, log_cfg in CONFIGS:
+            configure_logging(log_cfg, stream=sink)
+            elapsed = run(analyzer, frames)
+            print(f"{name:<15}{elapsed * 1e6 / n:>10.1f}")
+        configure_logging({'level': 'WARNING', 'ring_buffer': 0})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""粒子绘制基准：逐粒子 cv2 绘制（main_app1 原实现）vs 预渲染精灵合成 ParticleRenderer
+
+在 640x480 帧上保持指定数量的存活粒子（六种和弦轮流生成），测量每帧绘制耗时：
+  python bench_particle_draw.py
+  python bench_particle_draw.py --frames 50 --sizes 100 500 --save-dir ./particle_frames
+"""
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+from particle_engine import KIND_NAMES, PARTICLE_PRESETS, ParticleSystem
+from particle_sprites import ParticleRenderer
+
+CHORDS = list(PARTICLE_PRESETS)
+
+
+def legacy_draw(frame, p):
+    """与 main_app1 原 draw_particles 相同：每个粒子若干次 cv2.circle / cv2.line，光晕靠层层调暗的实心圆"""
+    frame_height, frame_width = frame.shape[:2]
+
+    for k in range(len(p)):
+        if p.life[k] > 0:
+            x, y = int(p.x[k]), int(p.y[k])
+            size = int(p.size[k])
+            color = tuple(int(c) for c in p.color[k])
+            alpha = p.life[k] / p.max_life[k]
+            alpha *= p.alpha[k]  # 应用随机alpha
+            kind = KIND_NAMES[p.kind[k]]
+
+            # 确保粒子在画面内
+            if x < 0 or x >= frame_width or y < 0 or y >= frame_height:
+                continue
+
+            # 根据粒子类型绘制不同形状
+            if kind == 'balloon':
+                # 绘制圆形气球，带阴影效果
+                radius = max(1, int(size * alpha))
+                glow_radius = int(radius * 1.5)
+
+                # 绘制发光效果
+                for r in range(glow_radius, 0, -1):
+                    alpha_layer = alpha * (r / glow_radius) * 0.2
+                    color_with_alpha = tuple(int(c * alpha_layer) for c in color)
+                    cv2.circle(frame, (x, y), r, color_with_alpha, -1)
+
+                # 绘制主气球
+                cv2.circle(frame, (x, y), radius, color, -1)
+                # 气球线
+                line_length = size // 2
+                cv2.line(frame, (x, y+radius), (x, y+radius+line_length), color, 2)
+
+            elif kind == 'snow':
+                # 绘制雪花（多个交叉的线）
+                angle = p.rotation[k]
+                for i in range(6):
+                    rad = np.radians(angle + i * 60)
+                    x1 = int(x + np.cos(rad) * size)
+                    y1 = int(y + np.sin(rad) * size)
+                    cv2.line(frame, (x, y), (x1, y1), color, 2)
+
+                # 中心点
+                cv2.circle(frame, (x, y), 2, color, -1)
+
+            elif kind == 'bubble':
+                # 绘制泡泡（圆形加高光）
+                cv2.circle(frame, (x, y), size, color, 2)
+                # 高光
+                highlight_x = x - size//3
+                highlight_y = y - size//3
+                highlight_size = size//4
+                cv2.circle(frame, (highlight_x, highlight_y), highlight_size, (255, 255, 255), -1)
+
+            elif kind == 'sparkle':
+                # 绘制闪烁星星
+                angle = p.rotation[k]
+                for i in range(4):
+                    rad = np.radians(angle + i * 90)
+                    x1 = int(x + np.cos(rad) * size)
+                    y1 = int(y + np.sin(rad) * size)
+                    cv2.line(frame, (x, y), (x1, y1), color, 2)
+
+                # 绘制对角线
+                for i in range(4):
+                    rad = np.radians(angle + i * 90 + 45)
+                    x1 = int(x + np.cos(rad) * size * 0.7)
+                    y1 = int(y + np.sin(rad) * size * 0.7)
+                    cv2.line(frame, (x, y), (x1, y1), color, 1)
+
+            elif kind == 'firefly':
+                # 绘制萤火虫（发光点）
+                glow_size = int(size * p.glow[k] * 2.5)
+                for r in range(glow_size, 0, -1):
+                    alpha_layer = alpha * (r / glow_size) * 0.4
+                    color_with_alpha = tuple(int(c * alpha_layer) for c in color)
+                    cv2.circle(frame, (x, y), r, color_with_alpha, -1)
+
+                # 中心亮点
+                cv2.circle(frame, (x, y), size, color, -1)
+
+            elif kind == 'magic':
+                # 绘制魔法星形
+                angle = p.rotation[k]
+                points = []
+                for i in range(5):
+                    outer_angle = np.radians(angle + i * 72)
+                    outer_x = int(x + np.cos(outer_angle) * size)
+                    outer_y = int(y + np.sin(outer_angle) * size)
+                    points.append((outer_x, outer_y))
+
+                    inner_angle = np.radians(angle + i * 72 + 36)
+                    inner_x = int(x + np.cos(inner_angle) * (size/2))
+                    inner_y = int(y + np.sin(inner_angle) * (size/2))
+                    points.append((inner_x, inner_y))
+
+                # 绘制五角星
+                for i in range(len(points)):
+                    cv2.line(frame, points[i], points[(i+1)%len(points)], color, 3)
+
+                # 中心光晕
+                for r in range(size*2, 0, -2):
+                    alpha_layer = alpha * (r / (size*2)) * 0.3
+                    color_with_alpha = tuple(int(c * alpha_layer) for c in color)
+                    cv2.circle(frame, (x, y), r, color_with_alpha, 1)
+
+    return frame
+
+
+def _frames(size: int, frames: int, seed: int = 0):
+    """生成 frames 帧的粒子状态（每帧前补足到 size 个粒子），逐帧产出同一个粒子系统"""
+    system = ParticleSystem(capacity=size, seed=seed)
+    rng = np.random.default_rng(seed)
+    i = 0
+    for f in range(frames):
+        while system.n < size - 20:
+            x, y = rng.integers(80, 560), rng.integers(80, 400)
+            system.spawn(x, y, CHORDS[i % len(CHORDS)])
+            i += 1
+        system.update(f / 30.0)
+        yield system
+
+
+def bench(size: int, frames: int, draw) -> float:
+    background = np.full((480, 640, 3), 40, dtype=np.uint8)
+    total = 0.0
+    for system in _frames(size, frames):
+        frame = background.copy()
+        t0 = time.perf_counter()
+        draw(frame, system)
+        total += time.perf_counter() - t0
+    return total / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="逐粒子 cv2 绘制 vs 精灵合成耗时")
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--save-dir', help="另存最后一帧的两种绘制结果以便目视对比")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    renderer = ParticleRenderer()
+    print(f"精灵预渲染: {len(renderer.sprites)} 个, {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    print(f"{'particles':>10}{'cv2 draw (ms)':>15}{'sprites (ms)':>14}{'speedup':>10}")
+    for size in args.sizes:
+        legacy = bench(size, args.frames, legacy_draw)
+        sprite = bench(size, args.frames, renderer.draw)
+        print(f"{size:>10}{legacy * 1000:>15.2f}{sprite * 1000:>14.2f}{legacy / sprite:>9.1f}x")
+
+    if args.save_dir:
+        os.makedirs(args.save_dir, exist_ok=True)
+        for system in _frames(args.sizes[0], args.frames):
+            pass   # 推进到最后一帧
+        for name, draw in (('cv2', legacy_draw), ('sprites', renderer.draw)):
+            frame = np.full((480, 640, 3), 40, dtype=np.uint8)
+            cv2.imwrite(os.path.join(args.save_dir, f"particles_{name}.png"), draw(frame, system))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""粒子更新基准：旧版 dict 列表（main_app1 原实现）vs 结构数组 ParticleSystem
+
+在 500 / 5,000 / 50,000 个粒子的稳态下（每帧按死亡数补充新粒子）测量每帧更新耗时：
+  python bench_particles.py
+  python bench_particles.py --frames 50 --sizes 500 5000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from particle_engine import PARTICLE_PRESETS, ParticleSystem
+
+CHORDS = list(PARTICLE_PRESETS)
+
+
+def _legacy_spawn(particles, x, y, chord):
+    """与 main_app1 原 create_particle 相同：每个粒子一个 15 键 dict"""
+    config = PARTICLE_PRESETS[chord]
+    for _ in range(config['count']):
+        life = random.randint(*config['life_range'])
+        variation = random.randint(-30, 30)
+        particles.append({
+            'x': x + random.randint(-60, 60),
+            'y': y + random.randint(-60, 60),
+            'color': tuple(max(0, min(255, c + variation)) for c in config['color']),
+            'size': random.randint(*config['size_range']),
+            'life': life,
+            'max_life': life,
+            'speed_x': random.uniform(*config['speed_x_range']),
+            'speed_y': random.uniform(*config['speed_y_range']),
+            'type': config['type'],
+            'particle_type': chord,
+            'alpha': random.uniform(*config['alpha_range']),
+            'rotation': random.uniform(0, 360),
+            'rotation_speed': random.uniform(-5, 5),
+            'glow_intensity': random.uniform(0.5, 1.0),
+        })
+
+
+def _legacy_update(particles, now, cap):
+    """与 main_app1 原 update_particles 相同（上限 cap 代替固定的 500）"""
+    for particle in particles[:]:
+        particle['x'] += particle['speed_x']
+        particle['y'] += particle['speed_y']
+        particle['life'] -= 1
+        particle['rotation'] += particle['rotation_speed']
+        if particle['type'] == 'bubble':
+            particle['size'] += 0.15
+            particle['speed_y'] -= 0.02
+        elif particle['type'] == 'sparkle':
+            particle['speed_x'] *= 0.97
+            particle['speed_y'] *= 0.97
+            particle['alpha'] = particle['alpha'] * (0.7 + 0.3 * np.sin(now * 15))
+        elif particle['type'] == 'firefly':
+            particle['size'] = particle['size'] * (0.6 + 0.5 * np.sin(now * 12))
+            if random.random() < 0.05:
+                particle['speed_x'] += random.uniform(-0.3, 0.3)
+                particle['speed_y'] += random.uniform(-0.3, 0.3)
+        elif particle['type'] == 'magic':
+            particle['size'] = particle['size'] * (0.9 + 0.2 * np.sin(now * 8))
+        if len(particles) > cap:
+            if particle['life'] < particle['max_life'] * 0.3:
+                particles.remove(particle)
+                continue
+        if particle['life'] <= 0:
+            particles.remove(particle)
+
+
+def bench_legacy(size: int, frames: int) -> float:
+    random.seed(0)
+    particles = []
+    i = 0
+    while len(particles) < size:
+        _legacy_spawn(particles, 320, 240, CHORDS[i % len(CHORDS)])
+        i += 1
+    total = 0.0
+    for f in range(frames):
+        while len(particles) < size:
+            _legacy_spawn(particles, 320, 240, CHORDS[i % len(CHORDS)])
+            i += 1
+        t0 = time.perf_counter()
+        _legacy_update(particles, f / 30.0, size)
+        total += time.perf_counter() - t0
+    return total / frames
+
+
+def bench_soa(size: int, frames: int) -> float:
+    system = ParticleSystem(capacity=size, seed=0)
+    i = 0
+    while system.n < size:
+        system.spawn(320, 240, CHORDS[i % len(CHORDS)])
+        i += 1
+    total = 0.0
+    for f in range(frames):
+        while system.n < size - 20:
+            system.spawn(320, 240, CHORDS[i % len(CHORDS)])
+            i += 1
+        t0 = time.perf_counter()
+        system.update(f / 30.0)
+        total += time.perf_counter() - t0
+    return total / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="dict 列表 vs 结构数组粒子更新耗时")
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 5000, 50000])
+    args = parser.parse_args()
+
+    print(f"{'particles':>10}{'dict list (ms)':>16}{'SoA (ms)':>12}{'speedup':>10}")
+    for size in args.sizes:
+        legacy = bench_legacy(size, args.frames)
+        soa = bench_soa(size, args.frames)
+        print(f"{size:>10}{legacy * 1000:>16.3f}{soa * 1000:>12.3f}{legacy / soa:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
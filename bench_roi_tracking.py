@@ -0,0 +1,137 @@
+"""ROI 跟踪基准：整帧推理 vs ROI 裁剪推理的关键点一致性与送入模型的像素比例
+
+同一组帧分别交给 roi_tracking 关闭 / 开启的 HandTracker，逐帧按手型配对两边的关键点，
+报告手数一致率、关键点偏差（像素，均值 / P95 / 最大）与 ROI 统计；全帧→ROI 切换后的第一帧单独统计。
+  python bench_roi_tracking.py                       # 合成的移动手部视频
+  python bench_roi_tracking.py input.mp4 --frames 300
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+import utils
+from hand_tracker import HandTracker
+
+SKIN = (150, 180, 225)
+# 掌心坐标系下的五根手指：(指根, 指尖, 半宽)
+FINGERS = (((-38, -35), (-48, -130), 11), ((-13, -40), (-14, -150), 12), ((12, -40), (16, -140), 12),
+           ((36, -35), (48, -115), 10), ((-48, 20), (-105, -20), 13))
+PALM = ((-45, -40), (45, -40), (50, 30), (30, 60), (-30, 60), (-50, 30))
+
+
+def draw_hand(frame: np.ndarray, cx: float, cy: float, scale: float = 1.3, angle: float = 0.0) -> np.ndarray:
+    """在帧上画一只张开的卡通手（带明暗、轮廓），MediaPipe 能稳定检出"""
+    c, s = np.cos(angle) * scale, np.sin(angle) * scale
+
+    def point(x, y):
+        return int(cx + c * x - s * y), int(cy + s * x + c * y)
+
+    mask = np.zeros(frame.shape[:2], dtype=np.uint8)
+    cv2.fillConvexPoly(mask, np.array([point(x, y) for x, y in PALM], np.int32), 255, cv2.LINE_AA)
+    for base, tip, width in FINGERS:
+        cv2.line(mask, point(*base), point(*tip), 255, int(2 * width * scale), cv2.LINE_AA)
+        cv2.circle(mask, point(*tip), int(width * scale), 255, -1, cv2.LINE_AA)
+    # 边缘暗、中间亮
+    depth = cv2.distanceTransform((mask > 127).astype(np.uint8), cv2.DIST_L2, 5)
+    shade = np.clip(0.75 + depth / 40, 0.75, 1.05)[..., None]
+    hand = np.clip(np.array(SKIN, np.float32) * shade, 0, 255)
+    frame[:] = np.where(mask[..., None] > 127, hand, frame).astype(np.uint8)
+    contours, _ = cv2.findContours((mask > 127).astype(np.uint8), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
+    cv2.drawContours(frame, contours, -1, (90, 110, 150), 2, cv2.LINE_AA)
+    return frame
+
+
+def synthetic_frames(count: int, width: int = 640, height: int = 480, seed: int = 0):
+    """手沿椭圆轨迹缓慢移动并轻微转动的 640x480 视频帧"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(count):
+        t = i / 30.0
+        frame = np.full((height, width, 3), 30, dtype=np.uint8)
+        draw_hand(frame, width / 2 + 110 * np.sin(t * 1.3), height / 2 + 60 + 30 * np.sin(t * 2.1),
+                  angle=0.15 * np.sin(t * 0.9))
+        noisy = frame + rng.normal(0, 6, frame.shape)
+        frames.append(cv2.GaussianBlur(np.clip(noisy, 0, 255).astype(np.uint8), (0, 0), 1.0))
+    return frames
+
+
+def _load_frames(source, count: int):
+    if source:
+        from headless_runner import iter_frames
+        frames = [frame for _, frame, _ in iter_frames(source)][:count]
+        if frames:
+            return frames
+    return synthetic_frames(count)
+
+
+def _run(config, frames, roi: bool):
+    """逐帧跑 HandTracker，返回 (每帧 [(手型, 像素关键点)], 每帧是否 ROI 推理, 统计, 耗时)"""
+    tracker = HandTracker(dict(config, roi_tracking=roi))
+    per_frame, modes = [], []
+    t0 = time.perf_counter()
+    for frame in frames:
+        h, w = frame.shape[:2]
+        roi_before = tracker.roi_stats['roi']
+        _, hands = tracker.process_frame(frame.copy())
+        modes.append(tracker.roi_stats['roi'] > roi_before)
+        per_frame.append([(hand.handedness, hand.coords[:, :2] * (w, h)) for hand in hands])
+    elapsed = time.perf_counter() - t0
+    stats = tracker.get_roi_stats()
+    tracker.release()
+    return per_frame, modes, stats, elapsed
+
+
+def _errors(full, roi):
+    """同手型按出现顺序配对，返回每只配对手的 21 点平均偏差（像素）与手数是否一致"""
+    errors = []
+    remaining = list(full)
+    for hand_type, coords in roi:
+        match = next((i for i, (t, _) in enumerate(remaining) if t == hand_type), None)
+        if match is not None:
+            errors.append(float(np.linalg.norm(coords - remaining.pop(match)[1], axis=1).mean()))
+    return errors, len(full) == len(roi)
+
+
+def _summary(name: str, errors, agree, total):
+    if not total:
+        return
+    e = np.asarray(errors) if errors else np.zeros(1)
+    print(f"{name:<22}{total:>7}{agree / total:>10.1%}{e.mean():>10.2f}{np.percentile(e, 95):>10.2f}{e.max():>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="整帧 vs ROI 裁剪推理的关键点一致性")
+    parser.add_argument('source', nargs='?', help="视频文件或图片目录（默认合成的移动手部视频）")
+    parser.add_argument('--frames', type=int, default=150)
+    args = parser.parse_args()
+
+    config = utils.load_config()['hand_tracking']
+    frames = _load_frames(args.source, args.frames)
+    n = len(frames)
+    full, _, _, full_s = _run(config, frames, roi=False)
+    roi, modes, stats, roi_s = _run(config, frames, roi=True)
+
+    groups = {'all frames': ([], 0, 0), 'ROI frames': ([], 0, 0), 'first ROI after full': ([], 0, 0)}
+    for i in range(n):
+        errors, same = _errors(full[i], roi[i])
+        names = ['all frames']
+        if modes[i]:
+            names.append('ROI frames')
+            if i == 0 or not modes[i - 1]:
+                names.append('first ROI after full')
+        for name in names:
+            errs, agree, total = groups[name]
+            groups[name] = (errs + errors, agree + same, total + 1)
+
+    print(f"{n} 帧 {frames[0].shape[1]}x{frames[0].shape[0]}；整帧检出手的帧 {sum(1 for f in full if f)}")
+    print(f"{'frames':<22}{'count':>7}{'same #':>10}{'mean px':>10}{'p95 px':>10}{'max px':>10}")
+    for name, (errs, agree, total) in groups.items():
+        _summary(name, errs, agree, total)
+    print(f"ROI: full={stats['full']} roi={stats['roi']} lost={stats['lost']} pixel_ratio={stats['pixel_ratio']:.2f}")
+    print(f"FPS: full-frame {n / full_s:.1f}  roi {n / roi_s:.1f}")
+
+
+if __name__ == '__main__':
+    main()
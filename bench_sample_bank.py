@@ -0,0 +1,91 @@
+"""AudioSystem 冷启动基准：逐个加载 WAV vs 内存映射打包采样库
+
+  python bench_sample_bank.py [轮数]
+
+需先生成 assets/guitar_samples 下的 WAV（generate_guitar_samples.py 等）。
+采样库打包到临时文件，不改动 assets 目录。每轮在独立子进程中构造 AudioSystem（SDL 使用 dummy 音频驱动），
+启动前用 posix_fadvise(DONTNEED) 把相关文件逐出页缓存（支持的平台上），近似冷启动。
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import sample_bank
+
+BASE_PATH = sample_bank.DEFAULT_BASE_PATH
+
+
+def _evict(paths):
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+
+def _child(mode: str, bank_path: str) -> dict:
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import utils
+    from audio_system import AudioSystem
+
+    config = dict(utils.load_config()['audio'])
+    config['lazy_samples'] = False  # 比较的是一次性加载全部样本的耗时
+    config['sample_bank'] = bank_path if mode == 'bank' else os.path.join(tempfile.gettempdir(), 'no_such_bank.bin')
+    t0 = time.perf_counter()
+    audio = AudioSystem(config)
+    elapsed = time.perf_counter() - t0
+    return {'mode': mode, 'startup_s': elapsed, 'sounds': len(audio.samples) + len(audio.effects)}
+
+
+def main():
+    if len(sys.argv) > 3 and sys.argv[1] == '--child':
+        print(json.dumps(_child(sys.argv[2], sys.argv[3])))
+        return
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    wavs = [os.path.join(BASE_PATH, g, f) for g in sample_bank.GROUPS
+            if os.path.isdir(os.path.join(BASE_PATH, g))
+            for f in os.listdir(os.path.join(BASE_PATH, g)) if f.endswith('.wav')]
+    if not wavs:
+        print(f"{BASE_PATH} 下没有 WAV，请先运行 generate_guitar_samples.py")
+        sys.exit(1)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        bank_path = os.path.join(tmp, sample_bank.BANK_NAME)
+        t0 = time.perf_counter()
+        sample_bank.pack_directory(BASE_PATH, bank_path)
+        print(f"pack: {len(wavs)} wavs -> {os.path.getsize(bank_path) / 1e6:.1f} MB in {time.perf_counter() - t0:.2f}s")
+
+        timings = {'wav': [], 'bank': []}
+        sounds = {}
+        for _ in range(rounds):
+            for mode in timings:
+                _evict(wavs + [bank_path])
+                out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, bank_path],
+                                     cwd=here, capture_output=True, text=True)
+                if out.returncode != 0:
+                    print(f"{mode}: 失败\n{out.stderr}")
+                    sys.exit(1)
+                result = json.loads(out.stdout.strip().splitlines()[-1])
+                timings[mode].append(result['startup_s'])
+                sounds[mode] = result['sounds']
+
+    print(f"{'mode':<8}{'sounds':>8}{'median(ms)':>12}{'min(ms)':>10}")
+    for mode, values in timings.items():
+        print(f"{mode:<8}{sounds[mode]:>8}{statistics.median(values) * 1000:>12.1f}{min(values) * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
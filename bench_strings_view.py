@@ -0,0 +1,109 @@
+"""吉他弦曲线谱基准
+
+渲染：每帧重建（探测字体 + PIL 整图重绘，相当于原 draw_guitar_strings）vs 缓存静态图层；
+波形更新：原 update_strings_wave 的列表追加 + 切片 vs WaveHistory 环形缓冲（不同历史长度）。
+  python bench_strings_view.py
+  python bench_strings_view.py --frames 500 --history 100 1000 --save strings.png
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import cv2
+import numpy as np
+
+import strings_view
+from strings_view import StringsRenderer, WaveHistory
+
+COLORS = {
+    'E_low': (255, 200, 50), 'A': (255, 150, 50), 'D': (255, 100, 100),
+    'G': (100, 255, 100), 'B': (100, 200, 255), 'E_high': (200, 150, 255),
+}
+
+
+def _strings_data(t: float):
+    """合成 100 点波形，奇数弦激活"""
+    steps = np.arange(100) / 30.0 + t
+    return {
+        key: {'wave': list(30 * np.sin(steps * (2 + i)) if i % 2 else 5 * np.sin(steps)),
+              'color': color, 'active': bool(i % 2)}
+        for i, (key, color) in enumerate(COLORS.items())
+    }
+
+
+def bench(frames: int, cached: bool) -> float:
+    renderer = StringsRenderer()
+    total = 0.0
+    for f in range(frames):
+        data = _strings_data(f / 30.0)
+        t0 = time.perf_counter()
+        if not cached:
+            # 清空字体缓存并重建静态图层，模拟原实现每帧的工作量
+            strings_view._FONT_CACHE.clear()
+            strings_view._font_probed = False
+            renderer = StringsRenderer()
+        renderer.render(data)
+        total += time.perf_counter() - t0
+    return total / frames
+
+
+def _legacy_update(strings_data, now, length):
+    """与原 update_strings_wave 相同（保留点数改为 length）"""
+    for string_name, string_data in strings_data.items():
+        wave = string_data['wave']
+        if len(wave) > length:
+            wave = wave[-length:]
+        if string_data['active']:
+            amplitude = 25 + 15 * np.sin(now * 6 + hash(string_name) % 10)
+            frequency = 2.5 + 1.5 * np.sin(now * 2.5)
+        else:
+            amplitude = 5 + 2 * np.sin(now * 2 + hash(string_name) % 10)
+            frequency = 0.5
+        wave.append(amplitude * np.sin(now * frequency))
+        string_data['wave'] = wave[-length:]
+
+
+def bench_update(frames: int, length: int, ring: bool) -> float:
+    strings_data = {key: {'wave': [], 'active': bool(i % 2)} for i, key in enumerate(COLORS)}
+    history = WaveHistory(list(COLORS), length)
+    active = [data['active'] for data in strings_data.values()]
+    # 先填满历史，只测稳态
+    for f in range(length):
+        history.push(f / 30.0, active) if ring else _legacy_update(strings_data, f / 30.0, length)
+    t0 = time.perf_counter()
+    for f in range(frames):
+        if ring:
+            history.push(f / 30.0, active)
+        else:
+            _legacy_update(strings_data, f / 30.0, length)
+    return (time.perf_counter() - t0) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="曲线谱每帧重建 vs 缓存静态图层耗时")
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--history', type=int, nargs='+', default=[100, 1000, 10000], help="波形历史长度")
+    parser.add_argument('--save', help="保存最后一帧（PNG）以便目视检查")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):   # 找不到中文字体时每次重建都会打印警告
+        rebuild = bench(args.frames, cached=False)
+    cached = bench(args.frames, cached=True)
+    print(f"{'mode':<12}{'ms/frame':>10}")
+    print(f"{'rebuild':<12}{rebuild * 1000:>10.3f}")
+    print(f"{'cached':<12}{cached * 1000:>10.3f}")
+    print(f"speedup {rebuild / cached:.1f}x")
+
+    print(f"\n{'history':>8}{'list (us)':>12}{'ring (us)':>12}")
+    for length in args.history:
+        legacy = bench_update(args.frames, length, ring=False)
+        ring = bench_update(args.frames, length, ring=True)
+        print(f"{length:>8}{legacy * 1e6:>12.1f}{ring * 1e6:>12.1f}")
+    if args.save:
+        canvas = StringsRenderer().render(_strings_data(args.frames / 30.0))
+        cv2.imwrite(args.save, cv2.cvtColor(canvas, cv2.COLOR_RGB2BGR))
+
+
+if __name__ == '__main__':
+    main()
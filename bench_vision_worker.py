@@ -0,0 +1,94 @@
+"""手部追踪吞吐基准：主进程内推理 vs 独立视觉工作进程（共享内存帧环）
+
+每帧在主进程中额外做 --ui-ms 毫秒持有 GIL 的纯 Python 计算，模拟 Streamlit 界面与音频触发；
+工作进程的流水线模式在推理当前帧的同时处理上一帧结果，二者可以重叠（需要至少 2 个 CPU 核心）。
+  python bench_vision_worker.py                       # 合成 640x480 帧
+  python bench_vision_worker.py input.mp4 --frames 300 --ui-ms 15
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+import utils
+from hand_tracker import HandTracker
+from vision_worker import VisionWorkerTracker
+
+
+def _load_frames(source, count: int):
+    if source:
+        from headless_runner import iter_frames
+        frames = [frame for _, frame, _ in iter_frames(source)][:count]
+        if frames:
+            return frames
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8), (15, 15), 0)
+    return [np.roll(base, i * 4, axis=1) for i in range(count)]
+
+
+def _ui_work(ms: float):
+    """持有 GIL 的忙等，模拟主线程上的界面渲染"""
+    deadline = time.perf_counter() + ms / 1000.0
+    x = 0
+    while time.perf_counter() < deadline:
+        x += 1
+    return x
+
+
+def bench_inprocess(config, frames, ui_ms):
+    tracker = HandTracker(config)
+    tracker.process_frame(frames[0].copy())   # 预热
+    t0 = time.perf_counter()
+    for frame in frames:
+        tracker.process_frame(frame.copy())
+        _ui_work(ui_ms)
+    elapsed = time.perf_counter() - t0
+    tracker.release()
+    return elapsed
+
+
+def bench_worker(config, frames, ui_ms, pipelined: bool):
+    tracker = VisionWorkerTracker(config)
+    tracker.process_frame(frames[0].copy())   # 启动工作进程并预热
+    t0 = time.perf_counter()
+    if pipelined:
+        tracker.submit(frames[0].copy(), 0)
+        for i in range(1, len(frames) + 1):
+            if i < len(frames):
+                tracker.submit(frames[i].copy(), i)
+            tracker.collect()
+            _ui_work(ui_ms)
+    else:
+        for frame in frames:
+            tracker.process_frame(frame.copy())
+            _ui_work(ui_ms)
+    elapsed = time.perf_counter() - t0
+    tracker.release()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="主进程推理 vs 视觉工作进程 FPS 对比")
+    parser.add_argument('source', nargs='?', help="视频文件或图片目录（默认合成帧）")
+    parser.add_argument('--frames', type=int, default=150)
+    parser.add_argument('--ui-ms', type=float, default=10.0, help="每帧主线程模拟负载（毫秒）")
+    args = parser.parse_args()
+
+    config = utils.load_config()['hand_tracking']
+    frames = _load_frames(args.source, args.frames)
+    n = len(frames)
+    print(f"{n} 帧 {frames[0].shape[1]}x{frames[0].shape[0]}，主线程负载 {args.ui_ms:.0f} ms/帧")
+
+    results = [
+        ('in-process', bench_inprocess(config, frames, args.ui_ms)),
+        ('worker (sync)', bench_worker(config, frames, args.ui_ms, pipelined=False)),
+        ('worker (pipelined)', bench_worker(config, frames, args.ui_ms, pipelined=True)),
+    ]
+    print(f"{'mode':<20}{'FPS':>8}{'ms/frame':>10}")
+    for name, elapsed in results:
+        print(f"{name:<20}{n / elapsed:>8.1f}{elapsed / n * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+
+class ThreadedCapture:
+    """后台线程摄像头采集：单槽缓冲、最新帧覆盖旧帧
+
+    采集线程持续调用 cap.read()，只保留最新一帧及其时间戳；推理循环调用 read()
+    总是拿到最新帧，未被消费就被覆盖的帧计入 dropped。
+    """
+
+    def __init__(self, source: Union[int, str] = 0, width: Optional[int] = None,
+                 height: Optional[int] = None, cap: Optional[Any] = None):
+        self.source = source
+        self.cap = cap if cap is not None else cv2.VideoCapture(source)
+        if width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        # 尽量减小驱动缓冲，避免旧帧堆积（部分后端不支持，忽略失败）
+        try:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        except Exception:
+            pass
+
+        self._cond = threading.Condition()
+        self._frame: Optional[np.ndarray] = None
+        self._frame_id = 0
+        self._frame_ts = 0.0
+        self._consumed_id = 0
+        self._running = False
+        self._ended = False
+        self._thread: Optional[threading.Thread] = None
+
+        # 统计计数
+        self.captured_frames = 0
+        self.dropped_frames = 0
+        self.consumed_frames = 0
+        self.last_age_ms = 0.0
+        self._age_sum_ms = 0.0
+
+    def isOpened(self) -> bool:
+        return bool(self.cap is not None and self.cap.isOpened())
+
+    @property
+    def ended(self) -> bool:
+        """采集线程已结束（读帧失败或已停止）；read_latest 单纯超时不算结束"""
+        return self._ended or not self._running
+
+    def start(self) -> 'ThreadedCapture':
+        """启动采集线程"""
+        if self._running:
+            return self
+        self._running = True
+        self._ended = False
+        self._thread = threading.Thread(target=self._reader, name="camera-capture", daemon=True)
+        self._thread.start()
+        return self
+
+    def _reader(self):
+        while self._running:
+            ret, frame = self.cap.read()
+            ts = time.perf_counter()
+            with self._cond:
+                if not ret:
+                    self._ended = True
+                    self._cond.notify_all()
+                    break
+                # 上一帧尚未被取走即被覆盖 -> 计为丢帧
+                if self._frame_id > self._consumed_id:
+                    self.dropped_frames += 1
+                self._frame = frame
+                self._frame_id += 1
+                self._frame_ts = ts
+                self.captured_frames += 1
+                self._cond.notify_all()
+        self._running = False
+
+    def read_latest(self, timeout: float = 1.0) -> Tuple[bool, Optional[np.ndarray], int, float]:
+        """等待并返回比上次更新的一帧：(ok, frame, frame_id, capture_ts)
+
+        capture_ts 为 time.perf_counter() 时间戳。超时或采集结束时 ok 为 False。
+        """
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while self._frame_id <= self._consumed_id:
+                if self._ended or not self._running:
+                    return False, None, self._consumed_id, 0.0
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False, None, self._consumed_id, 0.0
+                self._cond.wait(remaining)
+            frame = self._frame
+            frame_id = self._frame_id
+            ts = self._frame_ts
+            self._consumed_id = frame_id
+
+        self.consumed_frames += 1
+        self.last_age_ms = (time.perf_counter() - ts) * 1000.0
+        self._age_sum_ms += self.last_age_ms
+        return True, frame, frame_id, ts
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """与 cv2.VideoCapture.read() 兼容的接口"""
+        ok, frame, _, _ = self.read_latest()
+        return ok, frame
+
+    def get_stats(self) -> Dict[str, float]:
+        """返回采集统计：采集/消费/丢弃帧数与帧龄"""
+        mean_age = self._age_sum_ms / self.consumed_frames if self.consumed_frames else 0.0
+        return {
+            'captured_frames': self.captured_frames,
+            'consumed_frames': self.consumed_frames,
+            'dropped_frames': self.dropped_frames,
+            'last_age_ms': self.last_age_ms,
+            'mean_age_ms': mean_age,
+        }
+
+    def release(self):
+        """停止采集线程并释放摄像头"""
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        if self.cap is not None and self.cap.isOpened():
+            self.cap.release()
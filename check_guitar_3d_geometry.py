@@ -0,0 +1,146 @@
+"""不需要 GL 上下文的几何核对：VBO 保留模式的顶点 vs 立即模式实际发出的顶点
+
+把 guitar_3d_engine 模块中的 GL 函数换成记录器，运行立即模式的 render_guitar_body / render_guitar_neck /
+render_strings，收集每个 glVertex3f（叠加 glTranslatef 平移）及当时的 glColor3f；再与 build_static_geometry()
+以及 GuitarMeshBuffers.update_strings() 写入的弦顶点逐个比较。只需安装 PyOpenGL（导入模块用），不创建窗口或上下文：
+  python check_guitar_3d_geometry.py
+"""
+import sys
+from contextlib import contextmanager
+
+import numpy as np
+import pygame
+
+import guitar_3d_engine as g3d
+
+TOLERANCE = 1e-6
+
+
+class GLRecorder:
+    """记录立即模式调用：每个 glBegin 产生一组 (图元, [(x, y, z, r, g, b), ...])"""
+
+    def __init__(self):
+        self.offset = np.zeros(3)
+        self._stack = []
+        self.color = (1.0, 1.0, 1.0)
+        self.batches = []
+
+    def glColor3f(self, r, g, b):
+        self.color = (r, g, b)
+
+    def glPushMatrix(self):
+        self._stack.append(self.offset.copy())
+
+    def glPopMatrix(self):
+        self.offset = self._stack.pop()
+
+    def glTranslatef(self, x, y, z):
+        self.offset = self.offset + (x, y, z)
+
+    def glBegin(self, mode):
+        self.batches.append((mode, []))
+
+    def glVertex3f(self, x, y, z):
+        self.batches[-1][1].append(tuple(self.offset + (x, y, z)) + tuple(self.color))
+
+    def glEnd(self):
+        pass
+
+    # GuitarMeshBuffers 的缓冲操作：不需要真正上传
+    def glGenBuffers(self, n):
+        return tuple(range(1, n + 1))
+
+    def glBindBuffer(self, *args):
+        pass
+
+    def glBufferData(self, *args):
+        pass
+
+    def glBufferSubData(self, *args):
+        pass
+
+    def take(self):
+        batches, self.batches = self.batches, []
+        return batches
+
+
+@contextmanager
+def recording(ticks: int):
+    """在 guitar_3d_engine 中用记录器替换 GL 函数，并固定 pygame.time.get_ticks()"""
+    recorder = GLRecorder()
+    names = [name for name in vars(GLRecorder) if name.startswith('gl')]
+    saved = {name: getattr(g3d, name) for name in names}
+    saved_ticks = pygame.time.get_ticks
+    try:
+        for name in names:
+            setattr(g3d, name, getattr(recorder, name))
+        pygame.time.get_ticks = lambda: ticks
+        yield recorder
+    finally:
+        for name, func in saved.items():
+            setattr(g3d, name, func)
+        pygame.time.get_ticks = saved_ticks
+
+
+def _report(name: str, expected: np.ndarray, actual: np.ndarray) -> bool:
+    if expected.shape != actual.shape:
+        print(f"{name:<24}FAIL  顶点形状不同: 立即模式 {expected.shape} / 保留模式 {actual.shape}")
+        return False
+    error = float(np.abs(expected - actual).max()) if expected.size else 0.0
+    ok = error <= TOLERANCE
+    print(f"{name:<24}{'OK' if ok else 'FAIL':<6}{len(expected):>4} 个顶点，最大偏差 {error:.2e}")
+    return ok
+
+
+def check_static() -> bool:
+    """琴身、琴颈、品丝：顶点、颜色与图元类型都要与 build_static_geometry() 一致"""
+    engine = g3d.Guitar3DEngine.__new__(g3d.Guitar3DEngine)
+    with recording(0) as recorder:
+        engine.render_guitar_body()
+        engine.render_guitar_neck()
+        batches = recorder.take()
+    static, ranges = g3d.build_static_geometry()
+
+    ok = True
+    groups = {'body': batches[:1], 'neck': batches[1:2], 'frets': batches[2:]}
+    modes = {'body': g3d.GL_QUADS, 'neck': g3d.GL_QUADS, 'frets': g3d.GL_LINES}
+    for name, group in groups.items():
+        if any(mode != modes[name] for mode, _ in group):
+            print(f"{name:<24}FAIL  图元类型与保留模式不同")
+            ok = False
+        first, count = ranges[name]
+        immediate = np.array([v for _, vertices in group for v in vertices], dtype=np.float32).reshape(-1, 6)
+        ok &= _report(name, immediate, static[first:first + count])
+    return ok
+
+
+def check_strings(vibrations, ticks: int = 1234) -> bool:
+    """不同振动状态下，update_strings() 写入的弦顶点与 render_strings() 发出的顶点一致"""
+    ok = True
+    with recording(ticks) as recorder:
+        mesh = g3d.GuitarMeshBuffers()
+        for label, vibration in vibrations:
+            engine = g3d.Guitar3DEngine.__new__(g3d.Guitar3DEngine)
+            engine.string_vibration = list(vibration)
+            engine.render_strings()
+            batches = recorder.take()
+            if any(mode != g3d.GL_LINE_STRIP for mode, _ in batches):
+                print(f"strings ({label})".ljust(24) + "FAIL  图元类型与保留模式不同")
+                ok = False
+            immediate = np.array([v for _, vertices in batches for v in vertices], dtype=np.float32)
+            mesh.update_strings(engine.string_offsets())
+            ok &= _report(f"strings ({label})", immediate, mesh.strings.reshape(-1, 6))
+    return ok
+
+
+def main() -> int:
+    rng = np.random.default_rng(0)
+    vibrations = [('rest', [0.0] * 6), ('all plucked', [1.0] * 6), ('random', rng.uniform(0, 1, 6).tolist())]
+    ok = check_static()
+    ok &= check_strings(vibrations)
+    print("一致" if ok else "不一致")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
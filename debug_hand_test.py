@@ -1,10 +1,12 @@
 import cv2
 from hand_tracker import HandTracker
+from hands_pool import pool_stats
 import utils
 
 def main():
     config = utils.load_config()['hand_tracking']
     ht = HandTracker(config)
+    print(f"Hands pool: {pool_stats()}")
     cap = cv2.VideoCapture(0)
     try:
         while True:
@@ -17,7 +19,7 @@ def main():
                 # 若加载了 MediaPipe Gesture Recognizer，则尝试通过模型获取标签
                 mp_label = ''
                 if getattr(ht, 'gesture_model_loaded', False):
-                    mp_label = ht._recognize_with_media_pipe(proc, h.get('world_landmarks'))
+                    mp_label = ht._recognize_with_media_pipe(proc, h.coords)
                 gesture = ht.get_hand_gesture(h)
                 print(f"Hand type: {h.get('type')} | gesture: {gesture} | mp_label: {mp_label} | finger_states: {fs}")
             cv2.imshow('Debug Hand Test', proc)
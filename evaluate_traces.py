@@ -0,0 +1,287 @@
+"""带标注的关键点轨迹批量评估：准确率、混淆矩阵与吞吐
+
+对每条轨迹的每一帧运行四个判定函数，与逐帧标注比较：
+  map_left_hand_to_string                 左手 -> 弦，对比 label_string
+  determine_fret_from_right_hand          右手 -> 品，对比 label_fret
+  recognize_chord_by_count_and_position   任一只手 -> 和弦，对比 label_chord
+  detect_right_hand_fret (hand.py)        右手 -> 品，对比 label_fret
+标注帧缺少对应的手时预测记为 'none'。判定基于单帧（不经过 RecognitionPipeline 的跨帧去抖），
+finger_states 按当前 finger_geometry 阈值重新计算，便于比较阈值修改前后的准确率与速度。
+
+  python evaluate_traces.py label trace.npz labels.csv     # 写入标注（CSV: start,end,string,fret,chord）
+  python evaluate_traces.py eval traces/ --workers 4 --json report.json
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+import utils
+from finger_geometry import finger_states_batch
+from gesture_analyzer import GestureAnalyzer
+from landmark_trace import LABEL_KEYS, LandmarkTrace, label_arrays
+from parallel_jobs import run_jobs
+
+# 判定函数 -> 对比的标注
+EVALUATORS = {
+    'map_left_hand_to_string': 'label_string',
+    'determine_fret_from_right_hand': 'label_fret',
+    'recognize_chord_by_count_and_position': 'label_chord',
+    'detect_right_hand_fret': 'label_fret',
+}
+MISSING = 'none'
+
+
+class _Landmark:
+    """FingerGeometry 需要带 .x/.y/.z 属性的关键点"""
+
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x: float, y: float, z: float):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+def _landmark_list(coords: np.ndarray) -> List[_Landmark]:
+    return [_Landmark(x, y, z) for x, y, z in coords.tolist()]
+
+
+def _label(value) -> Optional[str]:
+    """标注值统一为字符串，未标注（-1 / ''）返回 None"""
+    if isinstance(value, (np.integer, int)):
+        return None if value < 0 else str(int(value))
+    value = str(value)
+    return value or None
+
+
+def evaluate_file(path: str, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """评估一条轨迹，返回每个判定函数的 (标注, 预测) 计数、调用次数与累计耗时"""
+    from hand import AirGuitarGestureRecognizer
+
+    config = config or utils.load_config()
+    trace = LandmarkTrace.load(path)
+    labels = trace.labels
+    analyzer = GestureAnalyzer(config)
+    recognizer = AirGuitarGestureRecognizer()
+
+    pairs = {name: Counter() for name in EVALUATORS}
+    calls = Counter()
+    seconds = Counter()
+    clock = time.perf_counter
+
+    t_start = clock()
+    states = finger_states_batch(trace.coords) if trace.num_hands else np.zeros((0, 5), dtype=bool)
+    seconds['finger_states'] += clock() - t_start
+
+    for i in range(len(trace)):
+        truth = {name: _label(labels[key][i]) if key in labels else None for name, key in EVALUATORS.items()}
+        if not any(truth.values()):
+            continue
+        hands = trace.hands(i, states)
+        by_type = {}
+        for hand in hands:
+            by_type.setdefault(hand.handedness.lower(), hand)
+
+        t0 = clock()
+        features = [analyzer.calculate_hand_features(analyzer.get_finger_tips(h.coords), h.coords, h.finger_states)
+                    for h in hands]
+        seconds['features'] += clock() - t0
+        feats = {h.handedness.lower(): f for h, f in reversed(list(zip(hands, features)))}
+
+        def run(name, fn, *args):
+            t = clock()
+            result = fn(*args)
+            seconds[name] += clock() - t
+            calls[name] += 1
+            return result
+
+        left, right = by_type.get('left'), by_type.get('right')
+        if truth['map_left_hand_to_string']:
+            pred = (run('map_left_hand_to_string', analyzer.map_left_hand_to_string, feats['left'])
+                    if left is not None else MISSING)
+            pairs['map_left_hand_to_string'][(truth['map_left_hand_to_string'], str(pred))] += 1
+        if truth['determine_fret_from_right_hand']:
+            pred = (run('determine_fret_from_right_hand', analyzer.determine_fret_from_right_hand,
+                        feats['right'], right) if right is not None else MISSING)
+            pairs['determine_fret_from_right_hand'][(truth['determine_fret_from_right_hand'], str(pred))] += 1
+        if truth['detect_right_hand_fret']:
+            pred = (run('detect_right_hand_fret', recognizer.detect_right_hand_fret, _landmark_list(right.coords))
+                    if right is not None else MISSING)
+            pairs['detect_right_hand_fret'][(truth['detect_right_hand_fret'], str(pred))] += 1
+        if truth['recognize_chord_by_count_and_position']:
+            # 与 analyze_hand_position 一致对每只手识别，取第一个识别出的和弦
+            pred = MISSING if not hands else 'unknown'
+            for hand, feat in zip(hands, features):
+                chord = run('recognize_chord_by_count_and_position',
+                            analyzer.recognize_chord_by_count_and_position, feat, hand.bounding_box())
+                if chord != 'unknown':
+                    pred = chord
+                    break
+            pairs['recognize_chord_by_count_and_position'][(truth['recognize_chord_by_count_and_position'], pred)] += 1
+
+    return {
+        'file': path,
+        'frames': len(trace),
+        'elapsed_s': clock() - t_start,
+        'pairs': pairs,
+        'calls': calls,
+        'seconds': seconds,
+    }
+
+
+def merge_results(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """合并多条轨迹的评估结果"""
+    merged = {'files': len(results), 'frames': 0, 'elapsed_s': 0.0,
+              'pairs': {name: Counter() for name in EVALUATORS}, 'calls': Counter(), 'seconds': Counter()}
+    for r in results:
+        merged['frames'] += r['frames']
+        merged['elapsed_s'] += r['elapsed_s']
+        for name in EVALUATORS:
+            merged['pairs'][name].update(r['pairs'][name])
+        merged['calls'].update(r['calls'])
+        merged['seconds'].update(r['seconds'])
+    return merged
+
+
+def _sort_key(label: str):
+    return (0, int(label), '') if label.lstrip('-').isdigit() else (1, 0, label)
+
+
+def confusion_matrix(pairs: Counter) -> Dict[str, Any]:
+    """(标注, 预测) 计数 -> {'labels', 'predicted', 'matrix'}，行为标注，列为预测"""
+    truths = sorted({t for t, _ in pairs}, key=_sort_key)
+    preds = sorted({p for _, p in pairs} | set(truths), key=_sort_key)
+    matrix = [[pairs.get((t, p), 0) for p in preds] for t in truths]
+    return {'labels': truths, 'predicted': preds, 'matrix': matrix}
+
+
+def build_report(merged: Dict[str, Any]) -> Dict[str, Any]:
+    """每个判定函数的总体准确率、逐类准确率、混淆矩阵与每秒调用次数"""
+    report = {'files': merged['files'], 'frames': merged['frames'],
+              'fps': merged['frames'] / merged['elapsed_s'] if merged['elapsed_s'] > 0 else 0.0,
+              'evaluators': {}}
+    for name, pairs in merged['pairs'].items():
+        total = sum(pairs.values())
+        if not total:
+            continue
+        correct = sum(n for (t, p), n in pairs.items() if t == p)
+        per_label = Counter()
+        per_label_correct = Counter()
+        for (t, p), n in pairs.items():
+            per_label[t] += n
+            if t == p:
+                per_label_correct[t] += n
+        spent = merged['seconds'].get(name, 0.0)
+        report['evaluators'][name] = {
+            'samples': total,
+            'accuracy': correct / total,
+            'per_label_accuracy': {t: per_label_correct[t] / per_label[t] for t in sorted(per_label, key=_sort_key)},
+            'calls_per_s': merged['calls'][name] / spent if spent > 0 else 0.0,
+            'confusion': confusion_matrix(pairs),
+        }
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"轨迹 {report['files']} 条，{report['frames']} 帧，单进程评估吞吐 {report['fps']:.0f} 帧/秒"]
+    if report.get('wall_s'):
+        lines[0] += f"，总耗时 {report['wall_s']:.2f}s"
+    for name, r in report['evaluators'].items():
+        lines.append("")
+        lines.append(f"== {name}: 准确率 {r['accuracy'] * 100:.1f}% ({r['samples']} 帧), "
+                     f"{r['calls_per_s']:.0f} 次/秒")
+        lines.append("  逐类准确率: " + ", ".join(f"{t}={acc * 100:.0f}%"
+                                                  for t, acc in r['per_label_accuracy'].items()))
+        cm = r['confusion']
+        width = max(6, max(len(p) for p in cm['predicted']) + 1)
+        lines.append("  " + "标注\\预测".ljust(width) + "".join(p.rjust(width) for p in cm['predicted']))
+        for t, row in zip(cm['labels'], cm['matrix']):
+            lines.append("  " + t.ljust(width) + "".join(str(n).rjust(width) for n in row))
+    return "\n".join(lines)
+
+
+def collect_traces(paths: Sequence[str]) -> List[str]:
+    """展开目录（按文件名排序的 .npz），保留直接给出的文件"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, n) for n in sorted(os.listdir(path)) if n.endswith('.npz'))
+        else:
+            files.append(path)
+    return files
+
+
+def evaluate(paths: Sequence[str], workers: Optional[int] = None,
+             config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """用进程池逐文件评估并汇总为报告"""
+    files = collect_traces(paths)
+    t0 = time.perf_counter()
+    results = run_jobs(evaluate_file, [(os.path.basename(f), (f, config)) for f in files], workers)
+    report = build_report(merge_results(results))
+    report['wall_s'] = time.perf_counter() - t0
+    return report
+
+
+def read_label_csv(path: str, frames: int) -> Dict[str, np.ndarray]:
+    """读取区间标注 CSV（列 start,end,string,fret,chord，end 含在内，空值为未标注）"""
+    strings: List[Optional[int]] = [None] * frames
+    frets: List[Optional[int]] = [None] * frames
+    chords: List[Optional[str]] = [None] * frames
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            start = int(row['start'])
+            end = min(int(row.get('end') or start), frames - 1)
+            for i in range(start, end + 1):
+                if row.get('string'):
+                    strings[i] = int(row['string'])
+                if row.get('fret'):
+                    frets[i] = int(row['fret'])
+                if row.get('chord'):
+                    chords[i] = row['chord']
+    return label_arrays(strings, frets, chords)
+
+
+def attach_labels(trace_path: str, csv_path: str, out_path: Optional[str] = None) -> str:
+    """把 CSV 标注写入轨迹（覆盖已有标注），默认原地更新"""
+    with np.load(trace_path) as data:
+        arrays = {k: data[k] for k in data.files if k not in LABEL_KEYS}
+    arrays.update(read_label_csv(csv_path, len(arrays['frame_ts'])))
+    out_path = out_path or trace_path
+    np.savez_compressed(out_path, **arrays)
+    return out_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="带标注关键点轨迹的批量评估")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_eval = sub.add_parser('eval', help="评估轨迹文件或目录")
+    p_eval.add_argument('paths', nargs='+', help=".npz 轨迹文件或目录")
+    p_eval.add_argument('--workers', type=int, help="进程数（默认全部 CPU 核心，1 为顺序执行）")
+    p_eval.add_argument('--json', help="把完整报告写为 JSON")
+    p_label = sub.add_parser('label', help="把 CSV 区间标注写入轨迹")
+    p_label.add_argument('trace')
+    p_label.add_argument('csv')
+    p_label.add_argument('--out', help="输出路径（默认原地更新）")
+    args = parser.parse_args(argv)
+
+    if args.command == 'label':
+        print(f"✅ 标注已写入 {attach_labels(args.trace, args.csv, args.out)}")
+        return 0
+
+    report = evaluate(args.paths, args.workers)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
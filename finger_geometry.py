@@ -0,0 +1,271 @@
+import numpy as np
+
+
+FINGER_NAMES = ('thumb', 'index', 'middle', 'ring', 'pinky')
+
+# 每根手指的 (tip, pip, mcp) 索引，与 get_finger_state 的调用参数一致
+_FINGER_JOINTS = np.array([
+    [4, 3, 2],
+    [8, 7, 6],
+    [12, 11, 10],
+    [16, 15, 14],
+    [20, 19, 18],
+])
+# 距离比阈值：拇指走专用判定，无名指放宽到 0.75
+_DIST_THRESH = np.array([0.0, 0.85, 0.85, 0.75, 0.85])
+
+
+def landmarks_to_array(landmarks) -> np.ndarray:
+    """将 MediaPipe Landmark 列表转换为 (21, 3) float64 数组"""
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float64)
+
+
+def finger_states_batch(landmarks) -> np.ndarray:
+    """批量计算所有手、所有手指的伸直状态
+
+    landmarks: (21, 3) 或 (N, 21, 3) 数组（归一化坐标，只使用 x/y）。
+    返回: (5,) 或 (N, 5) 的 bool 数组，列顺序为 FINGER_NAMES。
+    判定规则与 FingerGeometry.get_finger_state 完全一致（含拇指专用判定与无名指放宽阈值）。
+    """
+    arr = np.asarray(landmarks, dtype=np.float64)
+    single = arr.ndim == 2
+    if single:
+        arr = arr[None]
+    xy = arr[:, :, :2]                                  # (N, 21, 2)
+
+    wrist = xy[:, 0:1, :]                               # (N, 1, 2)
+    joints = xy[:, _FINGER_JOINTS, :]                   # (N, 5, 3, 2)
+    tip, pip, mcp = joints[:, :, 0], joints[:, :, 1], joints[:, :, 2]
+
+    tip_to_wrist = np.linalg.norm(tip - wrist, axis=-1)  # (N, 5)
+    pip_to_wrist = np.linalg.norm(pip - wrist, axis=-1)
+    is_extended_by_y = tip[..., 1] < pip[..., 1] - 0.02
+
+    v1 = pip - mcp
+    v2 = tip - pip
+    n1 = np.linalg.norm(v1, axis=-1)
+    n2 = np.linalg.norm(v2, axis=-1)
+    valid = (n1 != 0) & (n2 != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos_angle = (v1 * v2).sum(axis=-1) / (n1 * n2)
+    angle = np.degrees(np.arccos(np.clip(np.nan_to_num(cos_angle), -1.0, 1.0)))
+    is_extended_by_angle = angle > 155
+
+    dist_ratio = tip_to_wrist / (pip_to_wrist + 1e-6)
+
+    # 四指：角度或高度成立，同时满足距离比
+    states = (is_extended_by_angle | is_extended_by_y) & (dist_ratio > _DIST_THRESH)
+
+    # 拇指：沿掌宽方向的投影
+    palm_width_vec = xy[:, 17] - xy[:, 5]               # (N, 2)
+    pw_norm = np.linalg.norm(palm_width_vec, axis=-1)
+    palm_width_unit = np.where(
+        (pw_norm > 1e-6)[:, None],
+        palm_width_vec / np.where(pw_norm > 1e-6, pw_norm, 1.0)[:, None],
+        np.array([1.0, 0.0])
+    )
+    proj_tip = ((tip[:, 0] - wrist[:, 0]) * palm_width_unit).sum(axis=-1)
+    proj_ip = ((pip[:, 0] - wrist[:, 0]) * palm_width_unit).sum(axis=-1)
+    mcp_to_wrist = np.linalg.norm(mcp[:, 0] - wrist[:, 0], axis=-1)
+    proj_diff = np.abs(proj_tip) - np.abs(proj_ip)
+    ratio_t = dist_ratio[:, 0]
+    cond_proj = (proj_diff > 0.03) & (ratio_t > 0.8) & (tip_to_wrist[:, 0] > mcp_to_wrist * 0.9)
+    cond_angle = is_extended_by_angle[:, 0] & (ratio_t > 0.75)
+    states[:, 0] = cond_proj | cond_angle
+
+    # 关节重合（零向量）时一律判为弯曲
+    states &= valid
+
+    return states[0] if single else states
+
+
+def finger_states_dict(states) -> dict:
+    """将 (5,) bool 数组转换为 {'thumb': bool, ...} 字典"""
+    return {name: bool(v) for name, v in zip(FINGER_NAMES, states)}
+
+
+class FingerGeometry:
+    """纯几何的手指/手掌判定（不持有任何 MediaPipe 模型）
+
+    landmarks 为 MediaPipe Landmark 列表（具有 .x/.y 属性）。
+    """
+
+    def get_finger_state(self, landmarks, finger_tip_idx, finger_pip_idx, finger_mcp_idx, wrist_idx):
+        """判断单个手指是否伸直"""
+        tip = landmarks[finger_tip_idx]
+        pip = landmarks[finger_pip_idx]
+        mcp = landmarks[finger_mcp_idx]
+        wrist = landmarks[wrist_idx]
+
+        # 方法1: 计算指尖与指关节的距离比
+        tip_to_wrist = np.linalg.norm(np.array([tip.x, tip.y]) - np.array([wrist.x, wrist.y]))
+        pip_to_wrist = np.linalg.norm(np.array([pip.x, pip.y]) - np.array([wrist.x, wrist.y]))
+
+        # 方法2: 检查指尖是否在指关节之上（针对竖向手势）
+        # 图像坐标y轴向下，所以y值越小表示越高
+        is_extended_by_y = tip.y < pip.y - 0.02
+
+        # 方法3: 计算角度（更准确）
+        # 使用三个点计算角度：MCP -> PIP -> TIP
+        vector1 = np.array([pip.x - mcp.x, pip.y - mcp.y])
+        vector2 = np.array([tip.x - pip.x, tip.y - pip.y])
+
+        if np.linalg.norm(vector1) == 0 or np.linalg.norm(vector2) == 0:
+            return False
+
+        # 计算余弦值
+        cos_angle = np.dot(vector1, vector2) / (np.linalg.norm(vector1) * np.linalg.norm(vector2))
+        angle = np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
+
+        # 角度小于160度通常表示弯曲
+        is_extended_by_angle = angle > 155
+
+        # 距离比约束：指尖到腕的距离应明显大于 pip 到腕的距离（避免近景误判）
+        dist_ratio = tip_to_wrist / (pip_to_wrist + 1e-6)
+
+        # 对拇指采用专用判定：拇指的伸展通常沿掌宽方向
+        if finger_tip_idx == 4:
+            try:
+                index_mcp = landmarks[5]
+                pinky_mcp = landmarks[17]
+                palm_width_vec = np.array([pinky_mcp.x - index_mcp.x, pinky_mcp.y - index_mcp.y])
+                pw_norm = np.linalg.norm(palm_width_vec)
+                if pw_norm > 1e-6:
+                    palm_width_unit = palm_width_vec / pw_norm
+                else:
+                    palm_width_unit = np.array([1.0, 0.0])
+
+                tip_vec = np.array([tip.x - wrist.x, tip.y - wrist.y])
+                ip_vec = np.array([pip.x - wrist.x, pip.y - wrist.y])
+                proj_tip = np.dot(tip_vec, palm_width_unit)
+                proj_ip = np.dot(ip_vec, palm_width_unit)
+                # MCP 到腕的距离用于辅助判断，避免近景或噪声导致的误判
+                mcp_to_wrist = np.linalg.norm(np.array([mcp.x - wrist.x, mcp.y - wrist.y]))
+                # 更严格的组合条件：要求投影差显著且指尖比 MCP 更远，或角度与距离比同时满足
+                proj_diff = abs(proj_tip) - abs(proj_ip)
+                cond_proj = proj_diff > 0.03 and dist_ratio > 0.8 and (tip_to_wrist > mcp_to_wrist * 0.9)
+                cond_angle = is_extended_by_angle and dist_ratio > 0.75
+                thumb_ok = bool(cond_proj or cond_angle)
+            except Exception:
+                thumb_ok = (is_extended_by_angle or is_extended_by_y) and (dist_ratio > 0.7)
+
+            return bool(thumb_ok)
+
+        # 对无名指放宽距离比阈值，提升在某些角度下的识别率
+        if finger_tip_idx == 16:
+            dist_thresh = 0.75
+        else:
+            dist_thresh = 0.85
+
+        # 综合判断：允许角度或高度成立，同时满足一定的距离比
+        is_extended = (is_extended_by_angle or is_extended_by_y) and (dist_ratio > dist_thresh)
+
+        return bool(is_extended)
+
+    def detect_left_hand_strings(self, landmarks):
+        """检测左手手势，返回选择的弦列表"""
+        strings = []
+
+        # MediaPipe手部关键点索引
+        # 拇指: 4(指尖), 3(第二关节), 2(第一关节), 1(根部)
+        # 食指: 8(指尖), 7(第三关节), 6(第二关节), 5(根部)
+        # 中指: 12(指尖), 11(第三关节), 10(第二关节), 9(根部)
+        # 无名指: 16(指尖), 15(第三关节), 14(第二关节), 13(根部)
+        # 小指: 20(指尖), 19(第三关节), 18(第二关节), 17(根部)
+
+        # 检查每个手指是否伸直
+        thumb_extended = self.get_finger_state(landmarks, 4, 3, 2, 0)
+        index_extended = self.get_finger_state(landmarks, 8, 7, 6, 0)
+        middle_extended = self.get_finger_state(landmarks, 12, 11, 10, 0)
+        ring_extended = self.get_finger_state(landmarks, 16, 15, 14, 0)
+        pinky_extended = self.get_finger_state(landmarks, 20, 19, 18, 0)
+
+        # 判断是否是握拳（第6弦）
+        # 握拳：所有手指都不伸直
+        if not (thumb_extended or index_extended or middle_extended or ring_extended or pinky_extended):
+            strings.append(6)
+        else:
+            # 添加伸直手指对应的弦
+            if thumb_extended:
+                strings.append(1)
+            if index_extended:
+                strings.append(2)
+            if middle_extended:
+                strings.append(3)
+            if ring_extended:
+                strings.append(4)
+            if pinky_extended:
+                strings.append(5)
+
+        return strings
+
+    def get_palm_orientation(self, landmarks):
+        """判断手掌朝向：竖向或横向"""
+        # 获取关键点
+        index_mcp = landmarks[5]  # 食指根部
+        pinky_mcp = landmarks[17] # 小指根部
+
+        # 计算手掌宽度向量
+        palm_vector = np.array([pinky_mcp.x - index_mcp.x, pinky_mcp.y - index_mcp.y])
+
+        # 计算与水平线的夹角
+        angle = np.degrees(np.arctan2(abs(palm_vector[1]), abs(palm_vector[0])))
+
+        # 如果夹角大于45度，认为是竖向；否则是横向
+        if angle > 45:
+            return "vertical"
+        else:
+            return "horizontal"
+
+    def detect_right_hand_fret(self, landmarks):
+        """检测右手手势，返回选择的品"""
+        # 先检查是否是握拳（开始手势）
+        thumb_extended = self.get_finger_state(landmarks, 4, 3, 2, 0)
+        index_extended = self.get_finger_state(landmarks, 8, 7, 6, 0)
+        middle_extended = self.get_finger_state(landmarks, 12, 11, 10, 0)
+        ring_extended = self.get_finger_state(landmarks, 16, 15, 14, 0)
+        pinky_extended = self.get_finger_state(landmarks, 20, 19, 18, 0)
+
+        # 获取手掌朝向
+        orientation = self.get_palm_orientation(landmarks)
+
+        # 计算伸直的手指数
+        extended_fingers = []
+        if thumb_extended:
+            extended_fingers.append("thumb")
+        if index_extended:
+            extended_fingers.append("index")
+        if middle_extended:
+            extended_fingers.append("middle")
+        if ring_extended:
+            extended_fingers.append("ring")
+        if pinky_extended:
+            extended_fingers.append("pinky")
+
+        finger_count = len(extended_fingers)
+
+        # 根据你的设计规则确定品
+        if orientation == "vertical":
+            if finger_count == 1:
+                # 单个手指：1-5品
+                return finger_count
+            elif finger_count == 2:
+                # 特殊组合
+                if "thumb" in extended_fingers and "index" in extended_fingers:
+                    return 11  # 拇指+食指
+                elif "thumb" in extended_fingers and "pinky" in extended_fingers:
+                    return 12  # 拇指+小指
+                elif "index" in extended_fingers and "middle" in extended_fingers:
+                    return 13  # 食指+中指
+                elif "index" in extended_fingers and "pinky" in extended_fingers:
+                    return 14  # 食指+小指
+                else:
+                    return finger_count  # 默认按手指数
+            elif 2 <= finger_count <= 5:
+                return finger_count
+        elif orientation == "horizontal":
+            if 1 <= finger_count <= 5:
+                return finger_count + 5  # 6-10品
+
+        # 如果没有匹配，返回0品
+        return 0
@@ -5,6 +5,8 @@ import os
 from math import pi
 import matplotlib.pyplot as plt
 
+from parallel_jobs import parse_workers_arg, run_jobs
+
 class GuitarSoundGenerator:
     def __init__(self, sample_rate=44100):
         self.sample_rate = sample_rate
@@ -242,53 +244,49 @@ class GuitarSoundGenerator:
         plt.tight_layout()
         plt.show()
 
-    def generate_complete_library(self):
-        """生成完整的吉他音源库"""
-        # 创建目录结构
-        os.makedirs("guitar_samples/single_notes", exist_ok=True)
-        os.makedirs("guitar_samples/chords", exist_ok=True)
-        os.makedirs("guitar_samples/effects", exist_ok=True)
-        
-        print("🎸 开始生成吉他音源库...")
-        
-        # 生成单音
-        print("\n🎵 生成单音采样...")
+    def library_jobs(self):
+        """列出音源库的全部生成任务：(任务名, (生成器, 方法名, 参数, 输出路径))"""
+        jobs = []
         for note_name, freq in self.string_frequencies.items():
-            print(f"   生成 {note_name} 弦 ({freq}Hz)...")
-            try:
-                sound = self.create_guitar_string_sound(freq)
-                self.save_audio(sound, f"guitar_samples/single_notes/{note_name}.wav")
-            except Exception as e:
-                print(f"❌ 生成 {note_name} 失败: {e}")
-        
-        # 生成和弦
-        print("\n🎶 生成和弦采样...")
+            jobs.append((f"single_notes/{note_name}",
+                         (self, "create_guitar_string_sound", (freq,), f"guitar_samples/single_notes/{note_name}.wav")))
         for chord_name, frequencies in self.chord_frequencies.items():
-            print(f"   生成 {chord_name} 和弦...")
-            try:
-                chord_sound = self.create_chord_sound(frequencies, chord_name)
-                self.save_audio(chord_sound, f"guitar_samples/chords/{chord_name}.wav")
-            except Exception as e:
-                print(f"❌ 生成 {chord_name} 失败: {e}")
-        
-        # 生成特效音
-        print("\n✨ 生成特效音...")
+            jobs.append((f"chords/{chord_name}",
+                         (self, "create_chord_sound", (frequencies, chord_name), f"guitar_samples/chords/{chord_name}.wav")))
         effects = [
-            ("拨片噪音", self.create_pick_noise, "pick_noise.wav"),
-            ("滑弦效果", self.create_string_slide, "string_slide.wav"),
-            ("泛音效果", self.create_harmonic, "harmonic.wav")
+            ("create_pick_noise", "pick_noise.wav"),
+            ("create_string_slide", "string_slide.wav"),
+            ("create_harmonic", "harmonic.wav")
         ]
+        for method, filename in effects:
+            jobs.append((f"effects/{filename[:-4]}", (self, method, (), f"guitar_samples/effects/{filename}")))
+        return jobs
+
+    def generate_complete_library(self, workers=None):
+        """生成完整的吉他音源库
+
+        单音、和弦、特效音作为独立任务分发到进程池（workers=None 使用全部 CPU 核心，1 为顺序生成），
+        每个任务按名称固定随机种子，结果可复现。
+        """
+        # 创建目录结构
+        os.makedirs("guitar_samples/single_notes", exist_ok=True)
+        os.makedirs("guitar_samples/chords", exist_ok=True)
+        os.makedirs("guitar_samples/effects", exist_ok=True)
         
-        for effect_name, effect_func, filename in effects:
-            print(f"   生成{effect_name}...")
-            try:
-                effect_sound = effect_func()
-                self.save_audio(effect_sound, f"guitar_samples/effects/{filename}")
-            except Exception as e:
-                print(f"❌ 生成{effect_name}失败: {e}")
-        
+        print("🎸 开始生成吉他音源库（单音 / 和弦 / 特效音）...")
+        run_jobs(render_library_job, self.library_jobs(), workers)
         print("\n🎉 吉他音源库生成完成！")
 
+
+def render_library_job(generator, method, args, filename):
+    """进程池任务：调用生成器的指定方法渲染一个音源并保存"""
+    try:
+        audio = getattr(generator, method)(*args)
+        generator.save_audio(audio, filename)
+    except Exception as e:
+        print(f"❌ 生成 {filename} 失败: {e}")
+    return filename
+
 # 使用示例
 if __name__ == "__main__":
     try:
@@ -296,7 +294,7 @@ if __name__ == "__main__":
         generator = GuitarSoundGenerator(sample_rate=44100)
         
         # 生成完整音源库
-        generator.generate_complete_library()
+        generator.generate_complete_library(workers=parse_workers_arg())
         
         # 可选：分析和可视化示例音频（简化版）
         print("\n📊 生成示例分析...")
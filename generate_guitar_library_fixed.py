@@ -5,6 +5,8 @@ import os
 from math import pi, sin, cos
 import matplotlib.pyplot as plt
 
+from parallel_jobs import parse_workers_arg, run_jobs
+
 # 设置matplotlib使用英文字体，避免中文字体问题
 plt.rcParams['font.family'] = 'DejaVu Sans'
 plt.rcParams['axes.unicode_minus'] = False
@@ -202,43 +204,37 @@ class GuitarSoundGenerator:
         except Exception as e:
             print(f"Save failed {filename}: {e}")
 
-    def generate_complete_library(self):
-        """Generate complete guitar sound library"""
+    def library_jobs(self):
+        """List all library jobs: (job name, (generator, method name, args, output path))"""
+        jobs = []
+        for note_name, freq in self.string_frequencies.items():
+            jobs.append((f"single_notes/{note_name}",
+                         (self, "create_guitar_string_sound", (freq,), f"guitar_samples/single_notes/{note_name}.wav")))
+        for chord_name, frequencies in self.chord_frequencies.items():
+            jobs.append((f"chords/{chord_name}",
+                         (self, "create_chord_sound", (frequencies, chord_name), f"guitar_samples/chords/{chord_name}.wav")))
+        effects = [
+            ("create_pick_noise", "pick_noise.wav"),
+            ("create_string_slide", "string_slide.wav"),
+            ("create_harmonic", "harmonic.wav")
+        ]
+        for method, filename in effects:
+            jobs.append((f"effects/{filename[:-4]}", (self, method, (), f"guitar_samples/effects/{filename}")))
+        return jobs
+
+    def generate_complete_library(self, workers=None):
+        """Generate complete guitar sound library
+
+        Notes, chords and effects run as separate jobs on a process pool
+        (workers=None uses all CPU cores, 1 runs sequentially); each job is seeded from its name.
+        """
         # 创建目录结构
         os.makedirs("guitar_samples/single_notes", exist_ok=True)
         os.makedirs("guitar_samples/chords", exist_ok=True)
         os.makedirs("guitar_samples/effects", exist_ok=True)
         
-        print("Generating guitar sound library...")
-        
-        # 生成单音
-        print("\nGenerating single notes...")
-        for note_name, freq in self.string_frequencies.items():
-            print(f"   Generating {note_name} string ({freq}Hz)...")
-            sound = self.create_guitar_string_sound(freq)
-            self.save_audio(sound, f"guitar_samples/single_notes/{note_name}.wav")
-        
-        # 生成和弦
-        print("\nGenerating chords...")
-        for chord_name, frequencies in self.chord_frequencies.items():
-            print(f"   Generating {chord_name} chord...")
-            chord_sound = self.create_chord_sound(frequencies, chord_name)
-            self.save_audio(chord_sound, f"guitar_samples/chords/{chord_name}.wav")
-        
-        # 生成特效音
-        print("\nGenerating effects...")
-        print("   Generating pick noise...")
-        pick_sound = self.create_pick_noise()
-        self.save_audio(pick_sound, "guitar_samples/effects/pick_noise.wav")
-        
-        print("   Generating string slide...")
-        slide_sound = self.create_string_slide()
-        self.save_audio(slide_sound, "guitar_samples/effects/string_slide.wav")
-        
-        print("   Generating harmonic...")
-        harmonic_sound = self.create_harmonic()
-        self.save_audio(harmonic_sound, "guitar_samples/effects/harmonic.wav")
-        
+        print("Generating guitar sound library (notes / chords / effects)...")
+        run_jobs(render_library_job, self.library_jobs(), workers)
         print("\nGuitar sound library generation completed!")
 
     def analyze_and_visualize(self, audio, title):
@@ -268,6 +264,12 @@ class GuitarSoundGenerator:
         plt.tight_layout()
         plt.show()
 
+def render_library_job(generator, method, args, filename):
+    """Process pool job: render one sound with the given generator method and save it"""
+    audio = getattr(generator, method)(*args)
+    generator.save_audio(audio, filename)
+    return filename
+
 # 使用示例
 if __name__ == "__main__":
     try:
@@ -275,7 +277,7 @@ if __name__ == "__main__":
         generator = GuitarSoundGenerator(sample_rate=44100)
         
         # 生成完整音源库
-        generator.generate_complete_library()
+        generator.generate_complete_library(workers=parse_workers_arg())
         
         # 可选：分析和可视化示例音频
         print("\nGenerating example analysis...")
@@ -3,6 +3,10 @@ import wave
 import numpy as np
 import time
 import platform
+import sys
+
+from parallel_jobs import parse_workers_arg, run_jobs
+import sample_manifest
 
 # 尝试导入 scipy（必需），若缺失给出提示
 try:
@@ -26,6 +30,8 @@ else:
         _playback_method = None
 
 # 生成设置
+# 合成算法版本：修改 improved_karplus_strong / add_string_noise 的输出时递增，使 manifest 中的旧样本失效
+GENERATOR_VERSION = 2
 SAMPLE_RATE = 44100
 DURATION = 2.5  # 秒
 OUTPUT_DIR = os.path.join('assets', 'guitar_samples', 'single_notes')
@@ -45,6 +51,64 @@ STRING_PARAMS = [
 ]
 
 
+def karplus_strong_delay_line(excitation, output_length, base_decay):
+    """
+    Karplus-Strong 延迟线（按周期分块的向量化实现）。
+    每次 NumPy 运算处理一整个延迟线周期（N 个样本），结果与逐样本循环
+    karplus_strong_delay_line_reference 一致（仅衰减系数的幂运算存在舍入级差异，
+    对 [-1,1] 幅度的输出最大绝对误差 < 1e-9）。
+    """
+    y = np.asarray(excitation, dtype=np.float64).copy()
+    N = len(y)
+    periods = -(-output_length // N)
+
+    # 时间相关衰减（使高频更快衰减），预先按样本计算
+    decay = np.ones(periods * N, dtype=np.float64)
+    time_factor = 1.0 - 0.3 * (np.arange(output_length) / output_length)
+    decay[:output_length] = base_decay ** np.maximum(0.1, time_factor)
+
+    output = np.empty(periods * N, dtype=np.float64)
+    for p in range(periods):
+        start = p * N
+        output[start:start + N] = y
+        d = decay[start:start + N]
+
+        # 加权平均以模拟色散和弦的刚度：同一周期内前 N-1 个位置只依赖上一周期的数据
+        nxt = np.empty(N, dtype=np.float64)
+        nxt[:N - 2] = y[:N - 2] * 0.6 + y[1:N - 1] * 0.3 + y[2:] * 0.1
+        nxt[N - 2] = 0.5 * (y[N - 2] + y[N - 1])
+        nxt[:N - 1] *= d[:N - 1]
+        # 最后一个位置与本周期已更新的首个样本做平均
+        nxt[N - 1] = 0.5 * (y[N - 1] + nxt[0]) * d[N - 1]
+        y = nxt
+
+    return output[:output_length]
+
+
+def karplus_strong_delay_line_reference(excitation, output_length, base_decay):
+    """逐样本循环的原始延迟线实现，仅用于校验与基准对比"""
+    buffer = np.asarray(excitation, dtype=np.float64).copy()
+    N = len(buffer)
+    output = np.zeros(output_length, dtype=np.float64)
+
+    for i in range(output_length):
+        pos = i % N
+        output[i] = buffer[pos]
+
+        # 加权平均以模拟色散和弦的刚度
+        if pos < N - 2:
+            avg = buffer[pos] * 0.6 + buffer[(pos + 1) % N] * 0.3 + buffer[(pos + 2) % N] * 0.1
+        else:
+            avg = 0.5 * (buffer[pos] + buffer[(pos + 1) % N])
+
+        # 时间相关衰减（使高频更快衰减）
+        time_factor = 1.0 - (0.3 * (i / output_length))
+        current_decay = base_decay ** max(0.1, time_factor)
+        buffer[pos] = avg * current_decay
+
+    return output
+
+
 def improved_karplus_strong(frequency, string_index, fret, duration=DURATION, sample_rate=SAMPLE_RATE):
     """
     改进的 Karplus-Strong 算法，考虑拨弦激励、频率相关衰减、琴体共振与包络。
@@ -83,28 +147,12 @@ def improved_karplus_strong(frequency, string_index, fret, duration=DURATION, sa
     pluck_noise *= pluck_env
     excitation = pluck_noise[:N].astype(np.float64)
 
-    # 初始化循环缓冲区
-    buffer = excitation.copy()
     output_length = int(sample_rate * duration)
-    output = np.zeros(output_length, dtype=np.float64)
 
     # 衰减基准（张力影响）
     base_decay = 0.998 - 0.002 * float(np.clip(tension, 0.0, 1.5))
 
-    for i in range(output_length):
-        pos = i % N
-        output[i] = buffer[pos]
-
-        # 加权平均以模拟色散和弦的刚度
-        if pos < N - 2:
-            avg = buffer[pos] * 0.6 + buffer[(pos + 1) % N] * 0.3 + buffer[(pos + 2) % N] * 0.1
-        else:
-            avg = 0.5 * (buffer[pos] + buffer[(pos + 1) % N])
-
-        # 时间相关衰减（使高频更快衰减）
-        time_factor = 1.0 - (0.3 * (i / output_length))
-        current_decay = base_decay ** max(0.1, time_factor)
-        buffer[pos] = avg * current_decay
+    output = karplus_strong_delay_line(excitation, output_length, base_decay)
 
     # 琴体共振（多个峰）
     out = output
@@ -155,8 +203,9 @@ def improved_karplus_strong(frequency, string_index, fret, duration=DURATION, sa
     ir = np.exp(-np.linspace(0, 10, reverb_len)) * (np.random.randn(reverb_len) * 0.2)
     ir /= (np.max(np.abs(ir)) + 1e-9)
 
-    left = np.convolve(left, ir, mode='same')
-    right = np.convolve(right, ir, mode='same')
+    # 重叠相加 FFT 卷积，与 np.convolve(mode='same') 结果一致（误差在浮点舍入级）
+    left = signal.oaconvolve(left, ir, mode='same')
+    right = signal.oaconvolve(right, ir, mode='same')
 
     stereo = np.column_stack((left, right))
     maxv = np.max(np.abs(stereo))
@@ -189,26 +238,66 @@ def add_string_noise(sig, freq, sample_rate=SAMPLE_RATE):
     return sig + hf
 
 
-def generate_all():
+def render_note(s_idx, fret):
+    """渲染并保存单个弦/品格音色，返回输出路径；合成失败改写正弦占位时返回 None（进程池任务，需保持模块级）"""
+    freq = BASE_FREQS[s_idx - 1] * (2 ** (fret / 12.0))
+    out_path = os.path.join(OUTPUT_DIR, f'string{s_idx}_fret{fret}.wav')
+    try:
+        samples = improved_karplus_strong(freq, s_idx, fret, duration=DURATION, sample_rate=SAMPLE_RATE)
+        samples = add_string_noise(samples, freq, SAMPLE_RATE)
+        write_stereo_wav(out_path, samples, SAMPLE_RATE)
+    except Exception as e:
+        print(f"生成失败 {out_path}: {e}")
+        # 退回到简单正弦做占位
+        t = np.linspace(0, DURATION, int(SAMPLE_RATE * DURATION), False)
+        wave_signal = 0.5 * np.sin(2 * np.pi * freq * t)
+        env = np.exp(-2.0 * t)
+        stereo = np.column_stack((wave_signal * env, wave_signal * env))
+        write_stereo_wav(out_path, stereo, SAMPLE_RATE)
+        return None
+    return out_path
+
+
+def note_params_hash(s_idx, fret):
+    """单音的内容哈希：覆盖决定输出的全部参数（算法版本、弦参数、频率、时长、采样率、随机种子名）"""
+    return sample_manifest.params_hash({
+        'generator': f'generate_guitar_samples/{GENERATOR_VERSION}',
+        'string': s_idx,
+        'fret': fret,
+        'base_freq': BASE_FREQS[s_idx - 1],
+        'string_params': STRING_PARAMS[s_idx - 1],
+        'duration': DURATION,
+        'sample_rate': SAMPLE_RATE,
+        'seed': f'string{s_idx}_fret{fret}',
+    })
+
+
+def generate_all(workers=None, force=False):
+    """生成 6 弦 × 0-10 品全部单音
+
+    workers 为进程数：None 使用全部 CPU 核心，1 为当前进程内顺序生成。
+    每个音按文件名设定随机种子，输出与进程数无关、可复现。
+    OUTPUT_DIR/manifest.json 记录每个文件的参数哈希与大小，只重新生成缺失或过期的文件；force=True 时全部重建。
+    """
     print("开始生成吉他音色（improved）...")
-    for s_idx, base in enumerate(BASE_FREQS, start=1):
-        for fret in range(0, 11):  # 0-10 品
-            freq = base * (2 ** (fret / 12.0))
-            fname = f'string{s_idx}_fret{fret}.wav'
-            out_path = os.path.join(OUTPUT_DIR, fname)
-            print(f'生成: {out_path} 频率={freq:.2f}Hz 弦={s_idx} 品格={fret}')
-            try:
-                samples = improved_karplus_strong(freq, s_idx, fret, duration=DURATION, sample_rate=SAMPLE_RATE)
-                samples = add_string_noise(samples, freq, SAMPLE_RATE)
-                write_stereo_wav(out_path, samples, SAMPLE_RATE)
-            except Exception as e:
-                print(f"生成失败 {out_path}: {e}")
-                # 退回到简单正弦做占位
-                t = np.linspace(0, DURATION, int(SAMPLE_RATE * DURATION), False)
-                wave_signal = 0.5 * np.sin(2 * np.pi * freq * t)
-                env = np.exp(-2.0 * t)
-                stereo = np.column_stack((wave_signal * env, wave_signal * env))
-                write_stereo_wav(out_path, stereo, SAMPLE_RATE)
+    wanted = {f'string{s_idx}_fret{fret}.wav': note_params_hash(s_idx, fret)
+              for s_idx in range(1, len(BASE_FREQS) + 1)
+              for fret in range(0, 11)}  # 0-10 品
+    stale = set(wanted) if force else set(sample_manifest.stale_files(OUTPUT_DIR, wanted))
+    if not stale:
+        print(f"全部 {len(wanted)} 个单音均为最新，跳过生成")
+        return []
+    print(f"需要生成 {len(stale)}/{len(wanted)} 个单音")
+
+    jobs = [(f'string{s_idx}_fret{fret}', (s_idx, fret))
+            for s_idx in range(1, len(BASE_FREQS) + 1)
+            for fret in range(0, 11)
+            if f'string{s_idx}_fret{fret}.wav' in stale]
+    paths = run_jobs(render_note, jobs, workers)
+    # 正弦占位不记入 manifest，下次运行会重试
+    written = {name: wanted[name] for name, path in zip((job[0] + '.wav' for job in jobs), paths) if path}
+    sample_manifest.record_files(OUTPUT_DIR, written)
+    return paths
 
 
 def generate_sample_chord():
@@ -268,7 +357,7 @@ def play_wav(path):
 
 if __name__ == '__main__':
     start = time.time()
-    generate_all()
+    generate_all(workers=parse_workers_arg(), force='--force' in sys.argv)
     chord = generate_sample_chord()
     # 播放示例和弦（异步播放）
     play_wav(chord)
@@ -1,6 +1,11 @@
 import numpy as np
 from typing import List, Dict, Tuple, Any
 import utils
+from log_utils import get_logger
+from hand_frame import HandFrame, TIP_INDICES, TIP_NAMES
+
+logger = get_logger("gesture")
+
 
 class GestureAnalyzer:
     """手势分析与和弦识别"""
@@ -12,53 +17,38 @@ class GestureAnalyzer:
         self.guitar_config = config['guitar']
         self.chords_config = config['chords']
         
-    def analyze_hand_position(self, hand_data: Dict, image_shape: Tuple[int, int]) -> Dict[str, Any]:
-        """分析手部位置并映射到吉他指板"""
+    def analyze_hand_position(self, hand_data: HandFrame, image_shape: Tuple[int, int]) -> Dict[str, Any]:
+        """分析手部位置并映射到吉他指板（接受 HandFrame，兼容旧式 dict）"""
         if not hand_data:
             return {'detected': False}
         
-        landmarks = hand_data['landmarks']
-        # 优先使用 hand_data 中预计算的 finger_states（由 HandTracker.detect_fingers_extended 提供）
-        precomputed_states = hand_data.get('finger_states')
-        finger_tips = self.get_finger_tips(landmarks)
+        hand = HandFrame.from_hand_data(hand_data)
+        # 优先使用预计算的 finger_states（由 HandTracker 批量计算提供）
+        precomputed_states = hand.finger_states
+        finger_tips = self.get_finger_tips(hand.coords)
         
-        # 计算手部边界框
-        x_coords = [lm[0] for lm in landmarks]
-        y_coords = [lm[1] for lm in landmarks]
-        
-        hand_bbox = {
-            'x_min': min(x_coords),
-            'x_max': max(x_coords),
-            'y_min': min(y_coords),
-            'y_max': max(y_coords),
-            'width': max(x_coords) - min(x_coords),
-            'height': max(y_coords) - min(y_coords)
-        }
+        # 计算手部边界框（数组切片 min/max）
+        hand_bbox = hand.bounding_box()
         
         # 计算手部特征；若已有预计算的 finger_states 则优先使用
-        hand_features = self.calculate_hand_features(finger_tips, landmarks, precomputed_states)
+        hand_features = self.calculate_hand_features(finger_tips, hand.coords, precomputed_states)
         
         # 识别和弦
         chord = self.recognize_chord_by_count_and_position(hand_features, hand_bbox)
         
         return {
             'detected': True,
-            'hand_type': hand_data['type'],
+            'hand_type': hand.handedness,
             'finger_tips': finger_tips,
             'bounding_box': hand_bbox,
             'hand_features': hand_features,
             'gesture': chord
         }
     
-    def get_finger_tips(self, landmarks: List[Tuple[float, float, float]]) -> Dict[str, Tuple[float, float]]:
-        """获取手指尖端坐标"""
-        return {
-            'thumb': (landmarks[4][0], landmarks[4][1]),
-            'index': (landmarks[8][0], landmarks[8][1]),
-            'middle': (landmarks[12][0], landmarks[12][1]),
-            'ring': (landmarks[16][0], landmarks[16][1]),
-            'pinky': (landmarks[20][0], landmarks[20][1])
-        }
+    def get_finger_tips(self, landmarks) -> Dict[str, np.ndarray]:
+        """获取手指尖端坐标（每项为 (x, y) 数组视图）"""
+        tips = self._coords(landmarks)[TIP_INDICES, :2]
+        return dict(zip(TIP_NAMES, tips))
     
     def calculate_hand_features(self, finger_tips: Dict, landmarks: List, precomputed_states: Dict = None) -> Dict[str, Any]:
         """计算手部特征"""
@@ -89,23 +79,22 @@ class GestureAnalyzer:
         features['extended_fingers'] = extended_fingers
         
         # 调试信息
-        print(f"手指状态: {finger_states}")
-        print(f"伸直手指: {extended_fingers} (共{extended_count}个)")
+        logger.debug("手指状态: %s", finger_states)
+        logger.debug("伸直手指: %s (共%d个)", extended_fingers, extended_count)
         
         return features
 
-    def is_thumb_extended(self, landmarks: List) -> bool:
+    def is_thumb_extended(self, landmarks) -> bool:
         """基于拇指关键点位置的简化伸直判断"""
         # 使用归一化手部跨度判断拇指是否伸直，避免固定阈值在不同距离下失效
         try:
-            tip = landmarks[4]
-            base = landmarks[2]
-            xs = [lm[0] for lm in landmarks]
-            ys = [lm[1] for lm in landmarks]
-            hand_span = max(max(xs) - min(xs), max(ys) - min(ys))
+            coords = self._coords(landmarks)
+            tip = coords[4]
+            base = coords[2]
+            hand_span = float(np.ptp(coords[:, :2], axis=0).max())
             if hand_span <= 0:
                 return False
-            distance = ((tip[0] - base[0])**2 + (tip[1] - base[1])**2) ** 0.5
+            distance = float(np.hypot(tip[0] - base[0], tip[1] - base[1]))
             # 归一化距离比率，经验阈值 0.25
             return (distance / hand_span) > 0.25
         except Exception:
@@ -146,8 +135,8 @@ class GestureAnalyzer:
 
         # 计算手部垂直中心（使用 landmarks 的平均 y，坐标为归一化 [0,1]）
         try:
-            ys = [lm[1] for lm in landmarks]
-            vert_center = sum(ys) / len(ys) if ys else 0.5
+            coords = self._coords(landmarks)
+            vert_center = float(coords[:, 1].mean()) if len(coords) else 0.5
         except Exception:
             vert_center = 0.5
 
@@ -167,14 +156,21 @@ class GestureAnalyzer:
         if vert_center >= 0.5:
             # 下半区 -> 品 1-5
             fret = min(5, extended)
-            print(f"DEBUG_FRET_MAP: vert_center={vert_center:.3f} -> LOWER half -> extended={extended} -> fret={fret}")
+            logger.debug("FRET_MAP: vert_center=%.3f -> LOWER half -> extended=%d -> fret=%d", vert_center, extended, fret)
             return fret
         else:
             # 上半区 -> 品 6-10
             fret = min(10, 5 + extended)
-            print(f"DEBUG_FRET_MAP: vert_center={vert_center:.3f} -> UPPER half -> extended={extended} -> fret={fret}")
+            logger.debug("FRET_MAP: vert_center=%.3f -> UPPER half -> extended=%d -> fret=%d", vert_center, extended, fret)
             return fret
     
+    @staticmethod
+    def _coords(landmarks) -> np.ndarray:
+        """HandFrame / (21, 3) 数组 / (x, y, z) 列表统一为数组"""
+        if isinstance(landmarks, HandFrame):
+            return landmarks.coords
+        return np.asarray(landmarks, dtype=np.float32)
+
     def is_finger_extended_simple(self, finger: str, landmarks: List) -> bool:
         """简化的手指伸直检测"""
         # 手指关键点索引
@@ -215,47 +211,47 @@ class GestureAnalyzer:
         extended_count = features['extended_count']
         hand_position = self.get_hand_position(bbox)
         
-        print(f"调试信息: 伸直手指数={extended_count}, 位置={hand_position}")
+        logger.debug("调试信息: 伸直手指数=%d, 位置=%s", extended_count, hand_position)
         
         # 基于伸直手指数量和位置的识别
         # C大调：两指伸直，手部在较高位置
         if extended_count == 2 and hand_position == 'high':
-            print("✅ 识别为 C大调: 两指伸直 + 手部抬高")
+            logger.debug("✅ 识别为 C大调: 两指伸直 + 手部抬高")
             return 'C_major'
         
         # G大调：两指伸直，手部在较低位置
         elif extended_count == 2 and hand_position == 'low':
-            print("✅ 识别为 G大调: 两指伸直 + 手部放低")
+            logger.debug("✅ 识别为 G大调: 两指伸直 + 手部放低")
             return 'G_major'
         
         # D大调：三指伸直，手部在较高位置
         elif extended_count == 3 and hand_position == 'high':
-            print("✅ 识别为 D大调: 三指伸直 + 手部抬高")
+            logger.debug("✅ 识别为 D大调: 三指伸直 + 手部抬高")
             return 'D_major'
         
         # A小调：三指伸直，手部在较低位置
         elif extended_count == 3 and hand_position == 'low':
-            print("✅ 识别为 A小调: 三指伸直 + 手部放低")
+            logger.debug("✅ 识别为 A小调: 三指伸直 + 手部放低")
             return 'A_minor'
         
         # E小调：四指伸直，手部在较高位置
         elif extended_count == 4 and hand_position == 'high':
-            print("✅ 识别为 E小调: 四指伸直 + 手部抬高")
+            logger.debug("✅ 识别为 E小调: 四指伸直 + 手部抬高")
             return 'E_minor'
         
         # F大调：四指伸直，手部在较低位置
         elif extended_count == 4 and hand_position == 'low':
-            print("✅ 识别为 F大调: 四指伸直 + 手部放低")
+            logger.debug("✅ 识别为 F大调: 四指伸直 + 手部放低")
             return 'F_major'
         
-        print(f"❌ 未识别: 伸直{extended_count}指, 位置{hand_position}")
+        logger.debug("❌ 未识别: 伸直%d指, 位置%s", extended_count, hand_position)
         return "unknown"
     
     def get_hand_position(self, bbox: Dict) -> str:
         """获取手部位置（高/中/低）"""
         vertical_center = (bbox['y_min'] + bbox['y_max']) / 2
         
-        print(f"手部垂直位置: {vertical_center}")
+        logger.debug("手部垂直位置: %s", vertical_center)
         
         # 调整位置阈值，让"高"位置更容易识别
         if vertical_center < 0.5:  # 从0.4调整到0.5
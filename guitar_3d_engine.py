@@ -1,11 +1,23 @@
+import ctypes
 import pygame
 from OpenGL.GL import *
 from OpenGL.GLUT import *
 from OpenGL.GLU import *
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import utils
 
+STRING_COLORS = [
+    [1, 0, 0],    # E2 - 红色
+    [1, 0.5, 0],  # A - 橙色
+    [1, 1, 0],    # D - 黄色
+    [0, 1, 0],    # G - 绿色
+    [0, 0, 1],    # B - 蓝色
+    [0.5, 0, 0.5] # E4 - 紫色
+]
+STRING_POINTS = 21      # 每根弦的折线顶点数
+FRET_COUNT = 20
+
 class Particle:
     """粒子类"""
     def __init__(self, position: List[float], velocity: List[float], 
@@ -29,23 +41,153 @@ class Particle:
         """检查粒子是否存活"""
         return self.lifetime > 0
 
+def build_static_geometry() -> Tuple[np.ndarray, Dict[str, Tuple[int, int]]]:
+    """琴身、琴颈与品丝的顶点（x, y, z, r, g, b，float32 交错存放），与立即模式绘制的几何完全一致
+
+    返回 (顶点数组, {部件: (起始顶点, 顶点数)})；琴颈与品丝已包含 render_guitar_neck 中的 (0, 0.5, 0) 平移。
+    """
+    body = [(-1.5, -0.5, 0), (1.5, -0.5, 0), (1.5, 0.5, 0), (-1.5, 0.5, 0)]
+    neck = [(-0.1, 0.5, 0), (0.1, 0.5, 0), (0.1, 2.5, 0), (-0.1, 2.5, 0)]
+    frets = []
+    for i in range(1, FRET_COUNT + 1):
+        y_pos = 0.5 + i * 0.1
+        frets += [(-0.15, y_pos, 0), (0.15, y_pos, 0)]
+
+    parts = [('body', body, (0.3, 0.2, 0.1)), ('neck', neck, (0.2, 0.15, 0.1)), ('frets', frets, (0.8, 0.8, 0.8))]
+    vertices, ranges = [], {}
+    for name, points, color in parts:
+        ranges[name] = (len(vertices), len(points))
+        vertices += [point + color for point in points]
+    return np.array(vertices, dtype=np.float32), ranges
+
+
+class GuitarMeshBuffers:
+    """保留模式的吉他几何：静态部分一次性上传到 VBO，弦顶点每帧只更新一次
+
+    琴身、琴颈与品丝在构造时以 GL_STATIC_DRAW 上传；6 根弦共 6 × 21 个顶点放在一个 GL_DYNAMIC_DRAW 缓冲里，
+    update_strings() 用 NumPy 一次算出所有弦的 z 偏移，再用一次 glBufferSubData 写回。
+    draw() 共 3 次绘制调用（四边形、品丝线段、glMultiDrawArrays 画全部弦）。需要在有效的 GL 上下文中创建。
+    """
+
+    STRIDE = 6 * 4  # 每个顶点 6 个 float32
+
+    def __init__(self):
+        static, self.ranges = build_static_geometry()
+        self.static_vbo, self.string_vbo = glGenBuffers(2)
+        glBindBuffer(GL_ARRAY_BUFFER, self.static_vbo)
+        glBufferData(GL_ARRAY_BUFFER, static.nbytes, static, GL_STATIC_DRAW)
+
+        # 弦顶点：x 与颜色固定，y 沿弦均匀分布，z 为振动偏移
+        count = len(STRING_COLORS)
+        self.strings = np.zeros((count, STRING_POINTS, 6), dtype=np.float32)
+        self.strings[:, :, 0] = (-0.12 + np.arange(count) * 0.04)[:, None]
+        self.strings[:, :, 1] = np.arange(STRING_POINTS) * 0.1
+        self.strings[:, :, 3:] = np.asarray(STRING_COLORS, dtype=np.float32)[:, None, :]
+        # 振型：弦上每个顶点的 sin(y·π/2)
+        self._mode_shape = np.sin(self.strings[0, :, 1] * np.pi / 2).astype(np.float32)
+        glBindBuffer(GL_ARRAY_BUFFER, self.string_vbo)
+        glBufferData(GL_ARRAY_BUFFER, self.strings.nbytes, self.strings, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        self._firsts = np.arange(count, dtype=np.int32) * STRING_POINTS
+        self._counts = np.full(count, STRING_POINTS, dtype=np.int32)
+
+    def update_strings(self, vibration: np.ndarray):
+        """vibration 为每根弦当前的振幅（z 方向），一次 glBufferSubData 更新全部弦顶点"""
+        self.strings[:, :, 2] = np.asarray(vibration, dtype=np.float32)[:, None] * self._mode_shape[None, :]
+        glBindBuffer(GL_ARRAY_BUFFER, self.string_vbo)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, self.strings.nbytes, self.strings)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def _bind(self, vbo):
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glVertexPointer(3, GL_FLOAT, self.STRIDE, ctypes.c_void_p(0))
+        glColorPointer(3, GL_FLOAT, self.STRIDE, ctypes.c_void_p(12))
+
+    def draw(self):
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+
+        self._bind(self.static_vbo)
+        # 琴身与琴颈在缓冲中相邻，一次画完两组四边形
+        first, body_count = self.ranges['body']
+        glDrawArrays(GL_QUADS, first, body_count + self.ranges['neck'][1])
+        glDrawArrays(GL_LINES, *self.ranges['frets'])
+
+        self._bind(self.string_vbo)
+        glMultiDrawArrays(GL_LINE_STRIP, self._firsts, self._counts, len(self._counts))
+
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def release(self):
+        glDeleteBuffers(2, [self.static_vbo, self.string_vbo])
+
+
+class OffscreenContext:
+    """OSMesa 离屏 GL 上下文，用于无显示器环境下渲染与测帧率
+
+    需要在导入本模块（以及任何 OpenGL 模块）之前设置环境变量 PYOPENGL_PLATFORM=osmesa，并安装 libOSMesa。
+    """
+
+    def __init__(self, width: int, height: int):
+        from OpenGL import arrays, osmesa
+
+        self.width = width
+        self.height = height
+        self.ctx = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        if not self.ctx:
+            raise RuntimeError("OSMesa 上下文创建失败（是否已设置 PYOPENGL_PLATFORM=osmesa？）")
+        self.buffer = arrays.GLubyteArray.zeros((height, width, 4))
+        if not osmesa.OSMesaMakeCurrent(self.ctx, self.buffer, GL_UNSIGNED_BYTE, width, height):
+            raise RuntimeError("OSMesaMakeCurrent 失败")
+        self._osmesa = osmesa
+
+        glViewport(0, 0, width, height)
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluPerspective(45, width / height, 0.1, 50.0)
+        glMatrixMode(GL_MODELVIEW)
+
+    def read_pixels(self) -> np.ndarray:
+        """当前帧的 RGB 图像（行从上到下）"""
+        glFinish()
+        return np.asarray(self.buffer)[::-1, :, :3].copy()
+
+    def release(self):
+        if self.ctx:
+            self._osmesa.OSMesaDestroyContext(self.ctx)
+            self.ctx = None
+
+
 class Guitar3DEngine:
-    """3D吉他引擎"""
+    """3D吉他引擎
+
+    retained=True（默认取 rendering.retained_mode）时琴身、琴颈、品丝与弦走 GuitarMeshBuffers 的 VBO 路径；
+    headless=True 时不初始化 GLUT、不翻转 pygame 窗口，配合 OffscreenContext 使用。
+    """
     
-    def __init__(self, config: Dict = None):
+    def __init__(self, config: Dict = None, retained: Optional[bool] = None, headless: bool = False):
         if config is None:
             config = utils.load_config()['rendering']
             
         self.config = config
+        self.headless = headless
         self.particles = []
         self.guitar_rotation = [0, 0, 0]
         self.guitar_position = [0, -1, -5]
         self.string_vibration = [0] * 6
         
-        # 初始化GLUT（必需）
-        glutInit()
+        # 初始化GLUT（窗口模式必需；离屏渲染时没有显示器，跳过）
+        if not headless:
+            glutInit()
         self.setup_opengl()
         self.load_textures()
+
+        if retained is None:
+            retained = config.get('retained_mode', False)
+        self.mesh = GuitarMeshBuffers() if retained else None
     
     def setup_opengl(self):
         """设置OpenGL"""
@@ -76,16 +218,26 @@ class Guitar3DEngine:
         glRotatef(self.guitar_rotation[1], 0, 1, 0)
         glRotatef(self.guitar_rotation[2], 0, 0, 1)
         
-        # 渲染吉他主体
-        self.render_guitar_body()
-        
-        # 渲染琴颈和指板
-        self.render_guitar_neck()
-        
-        # 渲染弦
-        self.render_strings()
+        if self.mesh is not None:
+            # 保留模式：只更新弦顶点，其余几何已在 VBO 中
+            self.mesh.update_strings(self.string_offsets())
+            self.mesh.draw()
+        else:
+            # 渲染吉他主体
+            self.render_guitar_body()
+            
+            # 渲染琴颈和指板
+            self.render_guitar_neck()
+            
+            # 渲染弦
+            self.render_strings()
         
         glPopMatrix()
+
+    def string_offsets(self) -> np.ndarray:
+        """每根弦当前的振动幅度（z 方向），与 render_strings 中的计算相同"""
+        phase = pygame.time.get_ticks() * 0.01 + np.arange(len(self.string_vibration))
+        return np.sin(phase) * np.asarray(self.string_vibration, dtype=np.float32) * 0.1
     
     def render_guitar_body(self):
         """渲染吉他主体"""
@@ -128,18 +280,9 @@ class Guitar3DEngine:
     
     def render_strings(self):
         """渲染吉他弦"""
-        string_colors = [
-            [1, 0, 0],    # E2 - 红色
-            [1, 0.5, 0],  # A - 橙色
-            [1, 1, 0],    # D - 黄色
-            [0, 1, 0],    # G - 绿色
-            [0, 0, 1],    # B - 蓝色
-            [0.5, 0, 0.5] # E4 - 紫色
-        ]
-        
         for i in range(6):
             x_pos = -0.12 + i * 0.04
-            glColor3f(*string_colors[i])
+            glColor3f(*STRING_COLORS[i])
             
             # 添加弦振动效果
             vibration = np.sin(pygame.time.get_ticks() * 0.01 + i) * self.string_vibration[i] * 0.1
@@ -228,4 +371,11 @@ class Guitar3DEngine:
         self.render_guitar()
         self.render_particles()
         
-        pygame.display.flip()
+        if not self.headless:
+            pygame.display.flip()
+
+    def release(self):
+        """释放 VBO（需在 GL 上下文仍有效时调用）"""
+        if self.mesh is not None:
+            self.mesh.release()
+            self.mesh = None
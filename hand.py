@@ -1,18 +1,17 @@
 import cv2
 import mediapipe as mp
-import numpy as np
-import time
+from finger_geometry import FingerGeometry
+from hands_pool import acquire_hands
 
-class AirGuitarGestureRecognizer:
+class AirGuitarGestureRecognizer(FingerGeometry):
     def __init__(self):
-        """初始化MediaPipe手势识别器"""
+        """初始化MediaPipe手势识别器
+
+        手指几何判定继承自 FingerGeometry，不依赖模型；Hands 模型在首次调用
+        process_frame 时才从 Hands 池获取。
+        """
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,  # 检测两只手
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7
-        )
+        self._hands = None
         self.mp_drawing = mp.solutions.drawing_utils
         
         # 手势状态
@@ -23,188 +22,25 @@ class AirGuitarGestureRecognizer:
         # 控制状态
         self.is_recording = False   # 是否开始录制
         self.hand_positions = {}    # 存储手部位置用于检测上下移动
-        
-    def get_finger_state(self, landmarks, finger_tip_idx, finger_pip_idx, finger_mcp_idx, wrist_idx):
-        """判断单个手指是否伸直"""
-        tip = landmarks[finger_tip_idx]
-        pip = landmarks[finger_pip_idx]
-        mcp = landmarks[finger_mcp_idx]
-        wrist = landmarks[wrist_idx]
-        
-        # 方法1: 计算指尖与指关节的距离比
-        tip_to_wrist = np.linalg.norm(np.array([tip.x, tip.y]) - np.array([wrist.x, wrist.y]))
-        pip_to_wrist = np.linalg.norm(np.array([pip.x, pip.y]) - np.array([wrist.x, wrist.y]))
-        
-        # 方法2: 检查指尖是否在指关节之上（针对竖向手势）
-        # 图像坐标y轴向下，所以y值越小表示越高
-        is_extended_by_y = tip.y < pip.y - 0.02
-        
-        # 方法3: 计算角度（更准确）
-        # 使用三个点计算角度：MCP -> PIP -> TIP
-        vector1 = np.array([pip.x - mcp.x, pip.y - mcp.y])
-        vector2 = np.array([tip.x - pip.x, tip.y - pip.y])
-        
-        if np.linalg.norm(vector1) == 0 or np.linalg.norm(vector2) == 0:
-            return False
-            
-        # 计算余弦值
-        cos_angle = np.dot(vector1, vector2) / (np.linalg.norm(vector1) * np.linalg.norm(vector2))
-        angle = np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
-        
-        # 角度小于160度通常表示弯曲
-        is_extended_by_angle = angle > 155
-
-        # 距离比约束：指尖到腕的距离应明显大于 pip 到腕的距离（避免近景误判）
-        dist_ratio = tip_to_wrist / (pip_to_wrist + 1e-6)
-
-        # 对拇指采用专用判定：拇指的伸展通常沿掌宽方向
-        if finger_tip_idx == 4:
-            try:
-                index_mcp = landmarks[5]
-                pinky_mcp = landmarks[17]
-                palm_width_vec = np.array([pinky_mcp.x - index_mcp.x, pinky_mcp.y - index_mcp.y])
-                pw_norm = np.linalg.norm(palm_width_vec)
-                if pw_norm > 1e-6:
-                    palm_width_unit = palm_width_vec / pw_norm
-                else:
-                    palm_width_unit = np.array([1.0, 0.0])
-
-                tip_vec = np.array([tip.x - wrist.x, tip.y - wrist.y])
-                ip_vec = np.array([pip.x - wrist.x, pip.y - wrist.y])
-                proj_tip = np.dot(tip_vec, palm_width_unit)
-                proj_ip = np.dot(ip_vec, palm_width_unit)
-                # MCP 到腕的距离用于辅助判断，避免近景或噪声导致的误判
-                mcp_to_wrist = np.linalg.norm(np.array([mcp.x - wrist.x, mcp.y - wrist.y]))
-                # 更严格的组合条件：要求投影差显著且指尖比 MCP 更远，或角度与距离比同时满足
-                proj_diff = abs(proj_tip) - abs(proj_ip)
-                cond_proj = proj_diff > 0.03 and dist_ratio > 0.8 and (tip_to_wrist > mcp_to_wrist * 0.9)
-                cond_angle = is_extended_by_angle and dist_ratio > 0.75
-                thumb_ok = bool(cond_proj or cond_angle)
-            except Exception:
-                thumb_ok = (is_extended_by_angle or is_extended_by_y) and (dist_ratio > 0.7)
 
-            return bool(thumb_ok)
+    @property
+    def hands(self):
+        """首次使用时从 Hands 池获取（视频模式，本识别器独占）"""
+        if self._hands is None:
+            self._hands = acquire_hands(
+                static_image_mode=False,
+                max_num_hands=2,  # 检测两只手
+                min_detection_confidence=0.7,
+                min_tracking_confidence=0.7
+            )
+        return self._hands
 
-        # 对无名指放宽距离比阈值，提升在某些角度下的识别率
-        if finger_tip_idx == 16:
-            dist_thresh = 0.75
-        else:
-            dist_thresh = 0.85
+    def release(self):
+        """归还 Hands 实例"""
+        if self._hands is not None:
+            self._hands.close()
+            self._hands = None
 
-        # 综合判断：允许角度或高度成立，同时满足一定的距离比
-        is_extended = (is_extended_by_angle or is_extended_by_y) and (dist_ratio > dist_thresh)
-
-        return bool(is_extended)
-    
-    def detect_left_hand_strings(self, landmarks):
-        """检测左手手势，返回选择的弦列表"""
-        strings = []
-        
-        # MediaPipe手部关键点索引
-        # 拇指: 4(指尖), 3(第二关节), 2(第一关节), 1(根部)
-        # 食指: 8(指尖), 7(第三关节), 6(第二关节), 5(根部)
-        # 中指: 12(指尖), 11(第三关节), 10(第二关节), 9(根部)
-        # 无名指: 16(指尖), 15(第三关节), 14(第二关节), 13(根部)
-        # 小指: 20(指尖), 19(第三关节), 18(第二关节), 17(根部)
-        
-        # 检查每个手指是否伸直
-        thumb_extended = self.get_finger_state(landmarks, 4, 3, 2, 0)
-        index_extended = self.get_finger_state(landmarks, 8, 7, 6, 0)
-        middle_extended = self.get_finger_state(landmarks, 12, 11, 10, 0)
-        ring_extended = self.get_finger_state(landmarks, 16, 15, 14, 0)
-        pinky_extended = self.get_finger_state(landmarks, 20, 19, 18, 0)
-        
-        # 判断是否是握拳（第6弦）
-        # 握拳：所有手指都不伸直
-        if not (thumb_extended or index_extended or middle_extended or ring_extended or pinky_extended):
-            strings.append(6)
-        else:
-            # 添加伸直手指对应的弦
-            if thumb_extended:
-                strings.append(1)
-            if index_extended:
-                strings.append(2)
-            if middle_extended:
-                strings.append(3)
-            if ring_extended:
-                strings.append(4)
-            if pinky_extended:
-                strings.append(5)
-        
-        return strings
-    
-    def get_palm_orientation(self, landmarks):
-        """判断手掌朝向：竖向或横向"""
-        # 获取关键点
-        wrist = landmarks[0]
-        index_mcp = landmarks[5]  # 食指根部
-        pinky_mcp = landmarks[17] # 小指根部
-        
-        # 计算手掌宽度向量
-        palm_vector = np.array([pinky_mcp.x - index_mcp.x, pinky_mcp.y - index_mcp.y])
-        
-        # 计算与水平线的夹角
-        angle = np.degrees(np.arctan2(abs(palm_vector[1]), abs(palm_vector[0])))
-        
-        # 如果夹角大于45度，认为是竖向；否则是横向
-        if angle > 45:
-            return "vertical"
-        else:
-            return "horizontal"
-    
-    def detect_right_hand_fret(self, landmarks):
-        """检测右手手势，返回选择的品"""
-        # 先检查是否是握拳（开始手势）
-        thumb_extended = self.get_finger_state(landmarks, 4, 3, 2, 0)
-        index_extended = self.get_finger_state(landmarks, 8, 7, 6, 0)
-        middle_extended = self.get_finger_state(landmarks, 12, 11, 10, 0)
-        ring_extended = self.get_finger_state(landmarks, 16, 15, 14, 0)
-        pinky_extended = self.get_finger_state(landmarks, 20, 19, 18, 0)
-        
-        # 获取手掌朝向
-        orientation = self.get_palm_orientation(landmarks)
-        
-        # 计算伸直的手指数
-        extended_fingers = []
-        if thumb_extended:
-            extended_fingers.append("thumb")
-        if index_extended:
-            extended_fingers.append("index")
-        if middle_extended:
-            extended_fingers.append("middle")
-        if ring_extended:
-            extended_fingers.append("ring")
-        if pinky_extended:
-            extended_fingers.append("pinky")
-        
-        finger_count = len(extended_fingers)
-        
-        # 根据你的设计规则确定品
-        if orientation == "vertical":
-            if finger_count == 1:
-                # 单个手指：1-5品
-                return finger_count
-            elif finger_count == 2:
-                # 特殊组合
-                if "thumb" in extended_fingers and "index" in extended_fingers:
-                    return 11  # 拇指+食指
-                elif "thumb" in extended_fingers and "pinky" in extended_fingers:
-                    return 12  # 拇指+小指
-                elif "index" in extended_fingers and "middle" in extended_fingers:
-                    return 13  # 食指+中指
-                elif "index" in extended_fingers and "pinky" in extended_fingers:
-                    return 14  # 食指+小指
-                else:
-                    return finger_count  # 默认按手指数
-            elif 2 <= finger_count <= 5:
-                return finger_count
-        elif orientation == "horizontal":
-            if 1 <= finger_count <= 5:
-                return finger_count + 5  # 6-10品
-        
-        # 如果没有匹配，返回0品
-        return 0
-    
     def detect_control_gestures(self, results, frame_shape):
         """检测控制手势"""
         control_action = None
@@ -412,6 +248,7 @@ class AirGuitarGestureRecognizer:
         
         cap.release()
         cv2.destroyAllWindows()
+        self.release()
 
 # 该文件只导出 `AirGuitarGestureRecognizer` 类供主程序调用。
 # 若需要独立运行调试，请使用项目提供的 `debug_hand_test.py` 或直接运行 `main_app.py`。
\ No newline at end of file
@@ -0,0 +1,124 @@
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from finger_geometry import FINGER_NAMES
+
+
+# 指尖关键点索引，顺序与 FINGER_NAMES 一致
+TIP_INDICES = np.array([4, 8, 12, 16, 20])
+TIP_NAMES = FINGER_NAMES
+
+
+class HandFrame:
+    """单只手的一帧检测结果
+
+    关键点保存在一个 (21, 3) float32 数组中（归一化 x, y, z），另带手型、置信度与时间戳。
+    边界框、中心、指尖等都以数组切片形式获取，不再构造逐点元组列表。
+    为兼容旧的 dict 形式 hand_data，支持 get()/[] 访问 'landmarks'、'type'、'finger_states' 等键。
+    measured 为 False 表示关键点由跳帧外推得到，而非本帧模型推理结果。
+    """
+
+    __slots__ = ('coords', 'handedness', 'score', 'timestamp', 'finger_states', 'measured')
+
+    def __init__(self, coords, handedness: str = '', score: float = 0.0,
+                 timestamp: Optional[float] = None, finger_states: Optional[Dict[str, bool]] = None,
+                 measured: bool = True):
+        coords = np.asarray(coords, dtype=np.float32)
+        if coords.shape != (21, 3):
+            raise ValueError(f"HandFrame 需要 (21, 3) 关键点数组，实际为 {coords.shape}")
+        self.coords = coords
+        self.handedness = handedness
+        self.score = float(score)
+        self.timestamp = time.perf_counter() if timestamp is None else timestamp
+        self.finger_states = finger_states
+        self.measured = measured
+
+    @classmethod
+    def from_hand_data(cls, hand_data) -> 'HandFrame':
+        """从 HandFrame 或旧式 dict（含 'landmarks' / 'type'）构造"""
+        if isinstance(hand_data, cls):
+            return hand_data
+        return cls(
+            hand_data['landmarks'],
+            handedness=hand_data.get('type', ''),
+            score=hand_data.get('score', 0.0),
+            timestamp=hand_data.get('timestamp'),
+            finger_states=hand_data.get('finger_states'),
+            measured=hand_data.get('measured', True),
+        )
+
+    # ---------------------- 数组切片访问 ----------------------
+    @property
+    def xs(self) -> np.ndarray:
+        return self.coords[:, 0]
+
+    @property
+    def ys(self) -> np.ndarray:
+        return self.coords[:, 1]
+
+    @property
+    def tips(self) -> np.ndarray:
+        """(5, 2) 指尖 x/y，顺序 thumb/index/middle/ring/pinky"""
+        return self.coords[TIP_INDICES, :2]
+
+    def bounding_box(self) -> Dict[str, float]:
+        """归一化边界框"""
+        lo = self.coords[:, :2].min(axis=0)
+        hi = self.coords[:, :2].max(axis=0)
+        return {
+            'x_min': float(lo[0]),
+            'x_max': float(hi[0]),
+            'y_min': float(lo[1]),
+            'y_max': float(hi[1]),
+            'width': float(hi[0] - lo[0]),
+            'height': float(hi[1] - lo[1]),
+        }
+
+    def center(self) -> np.ndarray:
+        """关键点均值 (x, y)"""
+        return self.coords[:, :2].mean(axis=0)
+
+    def span(self) -> float:
+        """手部跨度：边界框宽高中的较大值"""
+        extent = np.ptp(self.coords[:, :2], axis=0)
+        return float(extent.max())
+
+    # ---------------------- 旧 dict 接口兼容 ----------------------
+    _KEY_MAP = {
+        'landmarks': 'coords',
+        'type': 'handedness',
+        'hand_type': 'handedness',
+        'score': 'score',
+        'timestamp': 'timestamp',
+        'finger_states': 'finger_states',
+        'measured': 'measured',
+    }
+
+    def get(self, key: str, default: Any = None) -> Any:
+        attr = self._KEY_MAP.get(key)
+        if attr is None:
+            return default
+        value = getattr(self, attr)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        attr = self._KEY_MAP.get(key)
+        if attr is None:
+            raise KeyError(key)
+        return getattr(self, attr)
+
+    def __setitem__(self, key: str, value: Any):
+        attr = self._KEY_MAP.get(key)
+        if attr is None:
+            raise KeyError(key)
+        setattr(self, attr, value)
+
+    def __contains__(self, key: str) -> bool:
+        """与 dict 一致：值为 None 的键（如未判定的 finger_states）视为不存在"""
+        return key in self._KEY_MAP and getattr(self, self._KEY_MAP[key]) is not None
+
+    def __repr__(self) -> str:
+        kind = '' if self.measured else ', inferred'
+        return f"HandFrame({self.handedness!r}, score={self.score:.2f}, t={self.timestamp:.3f}{kind})"
@@ -1,9 +1,15 @@
 import cv2
 import mediapipe as mp
 import numpy as np
+from collections import deque
+from mediapipe.framework.formats import landmark_pb2
 from typing import List, Tuple, Dict, Any
 import utils
+from hand_frame import HandFrame
+from hands_pool import acquire_hands
+from load_governor import LoadGovernor
 import os
+import time
 import logging
 
 
@@ -20,12 +26,9 @@ class HandTracker:
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
-        self.hands = self.mp_hands.Hands(
-            model_complexity=config['model_complexity'],
-            min_detection_confidence=config['min_detection_confidence'],
-            min_tracking_confidence=config['min_tracking_confidence'],
-            max_num_hands=config['max_num_hands']
-        )
+        # 从进程级 Hands 池获取；视频模式的 Hands 带帧间跟踪状态，每个追踪器独占自己的实例
+        # （在下方读取 ROI 配置后按模式选定，见 _select_hands）
+        self._hands_by_key: Dict[Tuple[int, bool], Any] = {}
 
         # 可选：MediaPipe Tasks 手势识别器（需在 config 中设置 'use_gesture_recognizer' 和 'gesture_model_path'）
         self.gesture_recognizer = None
@@ -60,43 +63,268 @@ class HandTracker:
                     logging.warning(f"手势识别模型文件未找到: {model_path}")
             except Exception as e:
                 logging.warning(f"MediaPipe Tasks 不可用或加载失败: {e}")
-        # 实例化提供的手势识别实现，用于更精确的指尖/角度检测
+        # 纯几何的手指判定（不持有模型），用于更精确的指尖/角度检测
         try:
-            # 动态导入用户提供的 hand.py，以避免在模块导入时出现循环或依赖导致的问题
+            from finger_geometry import FingerGeometry
+            self.external_recognizer = FingerGeometry()
+        except Exception:
+            self.external_recognizer = None
+        # 批量判定：一次计算所有手、所有手指
+        try:
+            from finger_geometry import finger_states_batch, finger_states_dict
+            self._finger_states_batch = finger_states_batch
+            self._finger_states_dict = finger_states_dict
+        except Exception:
+            self._finger_states_batch = None
+
+        # ROI 跟踪：只在上一次检测到的手部区域（外扩 roi_margin）内推理，
+        # 每 roi_redetect_every 帧、跟丢或手移近区域边缘时回到全帧检测
+        self.roi_tracking = bool(config.get('roi_tracking', False))
+        self.roi_margin = float(config.get('roi_margin', 0.3))
+        self.roi_redetect_every = max(1, int(config.get('roi_redetect_every', 15)))
+        self._roi = None                # 归一化 (x0, y0, x1, y1)
+        self._roi_hands = 0
+        self._frames_since_full = 0
+        self.roi_stats = {'full': 0, 'roi': 0, 'lost': 0, 'pixels': 0, 'frame_pixels': 0}
+        self._crop_hands = None
+        self._select_hands(config['model_complexity'])
+
+        # 负载调节：按实测帧耗时在 model_complexity 与推理宽度组成的档位间切换（见 load_governor）
+        adaptive = config.get('adaptive') or {}
+        self.governor = LoadGovernor.from_config(adaptive) if adaptive.get('enabled') else None
+        self.inference_width = None
+        if self.governor is not None:
+            self._apply_tier()
+
+        # 跳帧推理：每 infer_every 帧运行一次 MediaPipe，其余帧由最近两次检测按匀速外推（HandFrame.measured=False）
+        self.infer_every = max(1, int(config.get('infer_every', 1)))
+        self._frames_since_inference = self.infer_every - 1   # 第一帧总是推理
+        self._measured: Dict[str, deque] = {}
+        self.skip_stats = {'measured': 0, 'inferred': 0}
+
+    # ---------------------- 负载调节 ----------------------
+    def _hands_for(self, model_complexity: int, static: bool = False):
+        """各 model_complexity / 模式的 Hands 句柄获取后一直保留，档位来回切换时不必重新加载模型"""
+        key = (model_complexity, static)
+        hands = self._hands_by_key.get(key)
+        if hands is None:
+            hands = acquire_hands(
+                static_image_mode=static,
+                model_complexity=model_complexity,
+                min_detection_confidence=self.config['min_detection_confidence'],
+                min_tracking_confidence=self.config['min_tracking_confidence'],
+                max_num_hands=self.config['max_num_hands']
+            )
+            self._hands_by_key[key] = hands
+        return hands
+
+    def _select_hands(self, model_complexity: int):
+        """选定当前档位的 Hands
+
+        ROI 跟踪时整帧与裁剪区域的坐标系不同，不能共用一个带跟踪状态的实例：整帧检测用静态图片模式
+        （每次独立做手掌检测），裁剪区域用独立的视频模式实例，每换一次区域清空其跟踪状态（见 _set_roi）。
+        """
+        if self.roi_tracking:
+            self.hands = self._hands_for(model_complexity, static=True)
+            self._crop_hands = self._hands_for(model_complexity)
+        else:
+            self.hands = self._hands_for(model_complexity)
+
+    def _apply_tier(self):
+        self._select_hands(self.governor.model_complexity)
+        self.inference_width = self.governor.inference_width
+        # 换了模型或分辨率，ROI 跟踪下一帧回到全帧检测
+        self._frames_since_full = self.roi_redetect_every
+
+    def report_frame_time(self, seconds: float):
+        """由主循环报告一帧的处理耗时，负载调节开启时据此切换档位"""
+        if self.governor is not None and self.governor.update(seconds):
+            self._apply_tier()
+
+    def get_load_stats(self) -> Dict[str, Any]:
+        """当前推理档位；未开启负载调节时只给出固定的 model_complexity"""
+        if self.governor is None:
+            mc = self.config['model_complexity']
+            return {'tier': None, 'tier_name': f"mc{mc} 全分辨率", 'model_complexity': mc, 'inference_width': None}
+        return self.governor.stats()
+
+    def _run_hands(self, hands, image: np.ndarray, frame_width: int):
+        """按推理宽度（相对整帧宽度）缩小后送入 Hands；关键点为归一化坐标，缩放不影响结果坐标"""
+        if self.inference_width and frame_width > self.inference_width:
+            scale = self.inference_width / frame_width
+            size = (max(1, round(image.shape[1] * scale)), max(1, round(image.shape[0] * scale)))
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        self.roi_stats['pixels'] += image.shape[0] * image.shape[1]
+        return hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+
+    # ---------------------- 推理区域 ----------------------
+    def _process_region(self, image: np.ndarray, roi=None):
+        """在整帧或 roi 区域上运行 Hands，关键点坐标换算回整帧归一化坐标"""
+        h, w = image.shape[:2]
+        if roi is None:
+            return self._run_hands(self.hands, image, w)
+
+        x0, y0 = int(roi[0] * w), int(roi[1] * h)
+        x1, y1 = int(np.ceil(roi[2] * w)), int(np.ceil(roi[3] * h))
+        crop = image[y0:y1, x0:x1]
+        ch, cw = crop.shape[:2]
+        results = self._run_hands(self._crop_hands, crop, w)
+        for hl in results.multi_hand_landmarks or ():
+            for lm in hl.landmark:
+                lm.x = (x0 + lm.x * cw) / w
+                lm.y = (y0 + lm.y * ch) / h
+                lm.z = lm.z * cw / w
+        return results
+
+    @staticmethod
+    def _landmark_box(results) -> Tuple[float, float, float, float]:
+        xs = [lm.x for hl in results.multi_hand_landmarks for lm in hl.landmark]
+        ys = [lm.y for hl in results.multi_hand_landmarks for lm in hl.landmark]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def _inside_roi(self, box) -> bool:
+        """手部框是否仍在 ROI 内侧（距边缘留出一半外扩量），贴边说明手正在移出区域"""
+        x0, y0, x1, y1 = self._roi
+        gx = (x1 - x0) * self.roi_margin / (1 + 2 * self.roi_margin) / 2
+        gy = (y1 - y0) * self.roi_margin / (1 + 2 * self.roi_margin) / 2
+        return (box[0] >= x0 + gx or x0 <= 0) and (box[1] >= y0 + gy or y0 <= 0) and \
+               (box[2] <= x1 - gx or x1 >= 1) and (box[3] <= y1 - gy or y1 >= 1)
+
+    def _set_roi(self, results):
+        if not results.multi_hand_landmarks:
+            self._roi = None
+            self._roi_hands = 0
+            return
+        x0, y0, x1, y1 = self._landmark_box(results)
+        pad = self.roi_margin * max(x1 - x0, y1 - y0)
+        self._roi = (max(0.0, x0 - pad), max(0.0, y0 - pad), min(1.0, x1 + pad), min(1.0, y1 + pad))
+        self._roi_hands = len(results.multi_hand_landmarks)
+        # 裁剪坐标系变了，上一个区域里带过来的手部框已经无效
+        self._crop_hands.reset()
+
+    def _detect(self, image: np.ndarray):
+        """运行 MediaPipe；ROI 跟踪时区域在两次全帧检测之间保持不变，裁剪用的 Hands 只在同一区域内做帧间跟踪"""
+        self.roi_stats['frame_pixels'] += image.shape[0] * image.shape[1]
+        if not self.roi_tracking:
+            return self._process_region(image)
+
+        if self._roi is not None and self._frames_since_full < self.roi_redetect_every:
+            results = self._process_region(image, self._roi)
+            hands = results.multi_hand_landmarks
+            if hands and len(hands) >= self._roi_hands:
+                self._frames_since_full += 1
+                self.roi_stats['roi'] += 1
+                if not self._inside_roi(self._landmark_box(results)):
+                    # 下一帧重新全帧检测以移动区域
+                    self._frames_since_full = self.roi_redetect_every
+                return results
+            self.roi_stats['lost'] += 1
+
+        results = self._process_region(image)
+        self.roi_stats['full'] += 1
+        self._frames_since_full = 0
+        self._set_roi(results)
+        return results
+
+    def get_roi_stats(self) -> Dict[str, Any]:
+        """全帧/ROI 推理次数、跟丢次数以及实际送入模型的像素占整帧像素的比例"""
+        stats = dict(self.roi_stats)
+        stats['pixel_ratio'] = stats['pixels'] / stats['frame_pixels'] if stats['frame_pixels'] else 1.0
+        return stats
+
+    # ---------------------- 跳帧外推 ----------------------
+    def _remember_measured(self, hand_data: List[HandFrame]):
+        """保存每只手最近两次实测关键点；同手型出现多次时按出现顺序区分"""
+        measured = {}
+        for hand in hand_data:
+            n = sum(1 for key in measured if key.startswith(hand.handedness + '#'))
+            key = f"{hand.handedness}#{n}"
+            history = self._measured.get(key) or deque(maxlen=2)
+            history.append((hand.coords, hand.timestamp, hand.score))
+            measured[key] = history
+        self._measured = measured
+
+    def _extrapolate(self, image: np.ndarray) -> List[HandFrame]:
+        """由最近两次实测按匀速外推当前帧关键点（只有一次实测时保持不动），手指状态照常重新判定"""
+        self.skip_stats['inferred'] += 1
+        if not self._measured:
+            return []
+        now = time.perf_counter()
+        keys = list(self._measured)
+        coords = np.empty((len(keys), 21, 3), dtype=np.float32)
+        for i, key in enumerate(keys):
+            history = self._measured[key]
+            c1, t1, _ = history[-1]
+            if len(history) == 2 and t1 > history[0][1]:
+                c0, t0, _ = history[0]
+                coords[i] = c1 + (c1 - c0) * ((now - t1) / (t1 - t0))
+            else:
+                coords[i] = c1
+
+        batch_states = None
+        if self._finger_states_batch is not None:
             try:
-                from hand import AirGuitarGestureRecognizer
+                batch_states = self._finger_states_batch(coords)
             except Exception:
-                AirGuitarGestureRecognizer = None
+                batch_states = None
 
-            if AirGuitarGestureRecognizer is not None:
-                try:
-                    self.external_recognizer = AirGuitarGestureRecognizer()
-                except Exception:
-                    self.external_recognizer = None
+        hand_data = []
+        for i, key in enumerate(keys):
+            hand_type = key.rsplit('#', 1)[0]
+            if batch_states is not None:
+                finger_states = self._finger_states_dict(batch_states[i])
             else:
-                self.external_recognizer = None
-        except Exception:
-            self.external_recognizer = None
-        
-    def process_frame(self, image: np.ndarray) -> Tuple[np.ndarray, List[Dict]]:
-        """处理帧并检测手部关键点"""
-        results = self.hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+                finger_states = self.detect_fingers_extended(coords[i], hand_type)
+            hand_data.append(HandFrame(coords[i], handedness=hand_type, score=self._measured[key][-1][2],
+                                       timestamp=now, finger_states=finger_states, measured=False))
+            landmarks = landmark_pb2.NormalizedLandmarkList(
+                landmark=[landmark_pb2.NormalizedLandmark(x=x, y=y, z=z) for x, y, z in coords[i].tolist()])
+            self.mp_drawing.draw_landmarks(image, landmarks, self.mp_hands.HAND_CONNECTIONS)
+        return hand_data
+
+    def get_skip_stats(self) -> Dict[str, Any]:
+        """实测帧与外推帧的数量"""
+        stats = dict(self.skip_stats)
+        total = stats['measured'] + stats['inferred']
+        stats['measured_ratio'] = stats['measured'] / total if total else 1.0
+        return stats
+
+    def process_frame(self, image: np.ndarray) -> Tuple[np.ndarray, List[HandFrame]]:
+        """处理帧并检测手部关键点，返回 HandFrame 列表"""
+        if self.infer_every > 1:
+            if self._frames_since_inference < self.infer_every - 1:
+                self._frames_since_inference += 1
+                return image, self._extrapolate(image)
+            self._frames_since_inference = 0
+
+        results = self._detect(image)
+        timestamp = time.perf_counter()
         hand_data = []
         
         if results.multi_hand_landmarks:
-            for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
-                # 提取关键点坐标
-                landmarks = []
-                for landmark in hand_landmarks.landmark:
-                    landmarks.append((landmark.x, landmark.y, landmark.z))
-                
-                # 获取手型（左手/右手）
-                hand_type = handedness.classification[0].label
+            # 所有手的关键点一次性写入 (N, 21, 3) float32 数组，每只手的 HandFrame 持有其中一片视图
+            coords = np.array([[(lm.x, lm.y, lm.z) for lm in hl.landmark]
+                               for hl in results.multi_hand_landmarks], dtype=np.float32)
+
+            # 批量计算所有手的手指状态
+            batch_states = None
+            if self._finger_states_batch is not None:
+                try:
+                    batch_states = self._finger_states_batch(coords)
+                except Exception:
+                    batch_states = None
+
+            for i, (hand_landmarks, handedness) in enumerate(zip(results.multi_hand_landmarks, results.multi_handedness)):
+                # 获取手型（左手/右手）与置信度
+                classification = handedness.classification[0]
+                hand_type = classification.label
                 
-                # 生成基于 world_landmarks 的更稳健的 finger_states（使用外部实现）
+                # 生成更稳健的 finger_states（使用外部实现）
                 finger_states = {}
                 try:
-                    if self.external_recognizer is not None:
+                    if batch_states is not None:
+                        finger_states = self._finger_states_dict(batch_states[i])
+                    elif self.external_recognizer is not None:
                         lm = hand_landmarks.landmark
                         # 使用外部实现的 get_finger_state，传入 Landmark 列表
                         thumb = self.external_recognizer.get_finger_state(lm, 4, 3, 2, 0)
@@ -112,14 +340,15 @@ class HandTracker:
                             'pinky': bool(pinky)
                         }
                 except Exception:
-                    finger_states = self.detect_fingers_extended(landmarks, hand_type)
-
-                hand_data.append({
-                    'landmarks': landmarks,
-                    'type': hand_type,
-                    'world_landmarks': hand_landmarks.landmark,
-                    'finger_states': finger_states
-                })
+                    finger_states = self.detect_fingers_extended(coords[i], hand_type)
+
+                hand_data.append(HandFrame(
+                    coords[i],
+                    handedness=hand_type,
+                    score=classification.score,
+                    timestamp=timestamp,
+                    finger_states=finger_states
+                ))
                 
                 # 绘制关键点
                 self.mp_drawing.draw_landmarks(
@@ -129,7 +358,10 @@ class HandTracker:
                     self.mp_drawing_styles.get_default_hand_landmarks_style(),
                     self.mp_drawing_styles.get_default_hand_connections_style()
                 )
-        
+
+        self.skip_stats['measured'] += 1
+        if self.infer_every > 1:
+            self._remember_measured(hand_data)
         return image, hand_data
     
     def get_finger_positions(self, hand_data: Dict) -> Dict[str, Tuple[float, float]]:
@@ -166,11 +398,11 @@ class HandTracker:
     def detect_fingers_extended(self, landmarks: List[Tuple[float, float, float]], hand_type: str) -> Dict[str, bool]:
         """更稳健的手指伸展检测：基于沿掌方向的投影（对食指/中指/无名指/小指）和沿掌宽度的投影（对拇指）。
 
-        landmarks: 列表，每项 (x,y,z)（归一化坐标）
+        landmarks: (21, 3) 数组或 (x,y,z) 列表（归一化坐标）
         hand_type: 'Left' 或 'Right'
         返回: 字典，键为手指名，值为是否伸出
         """
-        if not landmarks:
+        if landmarks is None or len(landmarks) == 0:
             return {}
 
         # 索引点
@@ -298,4 +530,6 @@ class HandTracker:
     
     def release(self):
         """释放资源"""
-        self.hands.close()
+        for hands in self._hands_by_key.values():
+            hands.close()
+        self._hands_by_key.clear()
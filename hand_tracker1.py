@@ -3,6 +3,7 @@ import mediapipe as mp
 import numpy as np
 from typing import List, Tuple, Dict, Any
 import utils
+from hands_pool import acquire_hands
 
 class HandTracker:
     """手部关键点检测器"""
@@ -16,7 +17,8 @@ class HandTracker:
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
-        self.hands = self.mp_hands.Hands(
+        # 从进程级 Hands 池获取；视频模式的 Hands 带帧间跟踪状态，每个追踪器独占自己的实例
+        self.hands = acquire_hands(
             model_complexity=config['model_complexity'],
             min_detection_confidence=config['min_detection_confidence'],
             min_tracking_confidence=config['min_tracking_confidence'],
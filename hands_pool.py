@@ -0,0 +1,139 @@
+import threading
+from typing import Any, Dict, Tuple
+
+import mediapipe as mp
+
+
+# Hands 构造参数及其默认值（与 mp.solutions.hands.Hands 一致）
+_DEFAULT_PARAMS = {
+    'static_image_mode': False,
+    'max_num_hands': 2,
+    'model_complexity': 1,
+    'min_detection_confidence': 0.5,
+    'min_tracking_confidence': 0.5,
+}
+
+
+class SharedHands:
+    """Hands 池中实例的句柄
+
+    与 mp.solutions.hands.Hands 接口兼容（process / close），process 调用在同一实例上串行执行；
+    close() 只归还引用，最后一个句柄关闭时才真正释放模型。
+    """
+
+    def __init__(self, pool: 'HandsPool', key: Tuple):
+        self._pool = pool
+        self._key = key
+        self._closed = False
+
+    def process(self, image):
+        if self._closed:
+            raise RuntimeError("SharedHands 已关闭")
+        hands, lock = self._pool._get(self._key)
+        with lock:
+            return hands.process(image)
+
+    def reset(self):
+        """清空视频模式的帧间跟踪状态，下一次 process 重新做手掌检测"""
+        hands, lock = self._pool._get(self._key)
+        with lock:
+            hands.reset()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._pool.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HandsPool:
+    """进程级、引用计数的 MediaPipe Hands 池
+
+    static_image_mode=True 的 Hands 每次调用独立检测、不带状态，参数相同的请求共用同一个 Hands 图；
+    视频模式的 Hands 会把上一帧的手部区域带到下一帧，不同调用方处理的是不同的视频流，
+    共用会互相污染跟踪状态，因此每次获取都新建独占实例（仍由池统一计数与释放）。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> {'hands': Hands, 'lock': Lock, 'refs': int}
+        self._entries: Dict[Tuple, Dict[str, Any]] = {}
+        self._owners = 0
+        self.created = 0
+
+    @staticmethod
+    def make_key(**params) -> Tuple:
+        merged = dict(_DEFAULT_PARAMS)
+        merged.update({k: v for k, v in params.items() if v is not None})
+        unknown = set(merged) - set(_DEFAULT_PARAMS)
+        if unknown:
+            raise TypeError(f"未知的 Hands 参数: {sorted(unknown)}")
+        return tuple(sorted(merged.items()))
+
+    def acquire(self, **params) -> SharedHands:
+        """获取 Hands 句柄并增加引用计数：静态图片模式按参数共用，视频模式每次新建独占实例"""
+        key = self.make_key(**params)
+        hands_params = dict(key)
+        with self._lock:
+            if not hands_params['static_image_mode']:
+                self._owners += 1
+                key += (('_owner', self._owners),)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {
+                    'hands': mp.solutions.hands.Hands(**hands_params),
+                    'lock': threading.Lock(),
+                    'refs': 0,
+                }
+                self._entries[key] = entry
+                self.created += 1
+            entry['refs'] += 1
+        return SharedHands(self, key)
+
+    def release(self, handle: SharedHands):
+        """归还引用；引用归零时关闭底层 Hands"""
+        with self._lock:
+            entry = self._entries.get(handle._key)
+            if entry is None:
+                return
+            entry['refs'] -= 1
+            if entry['refs'] > 0:
+                return
+            del self._entries[handle._key]
+        try:
+            with entry['lock']:
+                entry['hands'].close()
+        except Exception:
+            pass
+
+    def _get(self, key: Tuple):
+        entry = self._entries.get(key)
+        if entry is None:
+            raise RuntimeError("共享 Hands 已被释放")
+        return entry['hands'], entry['lock']
+
+    def stats(self) -> Dict[str, int]:
+        """返回当前活跃实例数、总引用数与累计创建次数"""
+        with self._lock:
+            return {
+                'instances': len(self._entries),
+                'refs': sum(e['refs'] for e in self._entries.values()),
+                'created': self.created,
+            }
+
+
+_POOL = HandsPool()
+
+
+def acquire_hands(**params) -> SharedHands:
+    """从进程级 Hands 池获取句柄"""
+    return _POOL.acquire(**params)
+
+
+def pool_stats() -> Dict[str, int]:
+    return _POOL.stats()
@@ -0,0 +1,234 @@
+"""无界面离线回放：用视频文件或图片目录代替摄像头，跑完整识别流水线
+
+  python headless_runner.py input.mp4 --out results.jsonl
+  python headless_runner.py frames_dir/ --out results.jsonl --max-frames 500
+  python headless_runner.py input.mp4 --audio real      # 使用真实 AudioSystem 发声
+  python headless_runner.py input.mp4 --record trace.npz # 同时录制关键点轨迹，供 landmark_trace.py 回放
+
+不使用 Streamlit，不 sleep，逐帧尽快调用 RecognitionPipeline.process_frame（HandTracker → GestureAnalyzer → 弦/品映射），
+每帧结果写一行 JSON，结束时报告吞吐（帧/秒）。默认音频为 RecordingAudio 录音桩，只记录触发事件。
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+import utils
+from gesture_analyzer import GestureAnalyzer
+from hand_tracker import HandTracker
+from landmark_trace import TraceRecorder
+from vision_worker import VisionWorkerTracker
+from latency_tracer import configure_tracing, get_tracer
+from log_utils import configure_logging, get_logger
+from recognition_pipeline import RecognitionPipeline
+
+logger = get_logger("headless")
+
+IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class _AnySample:
+    """对任意样本名都回答“存在”的 samples 容器"""
+
+    def __contains__(self, key) -> bool:
+        return True
+
+
+class RecordingAudio:
+    """录音桩：代替 AudioSystem，只按帧记录触发事件，不初始化任何音频设备"""
+
+    def __init__(self, volume: float = 0.7):
+        self.events: List[Dict[str, Any]] = []
+        self.frame_id: Optional[int] = None
+        self.samples = _AnySample()
+        self._volume = volume
+
+    def _record(self, kind: str, **args):
+        self.events.append({'frame_id': self.frame_id, 'kind': kind, **args})
+
+    def play_string_fret(self, string_number: int, fret: int, volume: float = None):
+        key = f"string{string_number}_fret{fret}"
+        self._record('string_fret', key=key, volume=self._volume if volume is None else volume)
+        get_tracer().audio_trigger(key)
+
+    def play_note(self, note: str, volume: float = None):
+        self._record('note', note=note)
+
+    def play_chord(self, chord: str, volume: float = None):
+        self._record('chord', chord=chord)
+
+    def play_effect(self, effect: str, volume: float = 0.5):
+        self._record('effect', effect=effect)
+
+    def stop_all(self):
+        self._record('stop_all')
+
+    def set_volume(self, volume: float):
+        self._volume = volume
+
+    def get_volume(self) -> float:
+        return self._volume
+
+
+def iter_frames(source: str) -> Iterator[Tuple[int, np.ndarray, float]]:
+    """逐帧读取视频文件或图片目录（按文件名排序），产出 (frame_id, BGR 帧, 源时间戳秒)"""
+    if os.path.isdir(source):
+        names = sorted(n for n in os.listdir(source) if n.lower().endswith(IMAGE_EXTS))
+        for i, name in enumerate(names):
+            frame = cv2.imread(os.path.join(source, name))
+            if frame is None:
+                logger.warning("无法读取图片 %s", name)
+                continue
+            yield i, frame, float(i)
+        return
+
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise IOError(f"无法打开视频: {source}")
+    try:
+        frame_id = 0
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            yield frame_id, frame, cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            frame_id += 1
+    finally:
+        cap.release()
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def frame_record(frame_id: int, timestamp: float, pipeline: RecognitionPipeline,
+                 results: Dict[str, Any], events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """一帧的 JSONL 记录：每只手的映射结果、当前弦/品与本帧触发的音频事件"""
+    hands = []
+    for h in results.get('hand_data', []):
+        features = h.get('hand_features', {}) or {}
+        hands.append({
+            'hand_type': h.get('hand_type'),
+            'detected': h.get('detected'),
+            'measured': h.get('measured', True),
+            'string': h.get('string'),
+            'fret': h.get('fret'),
+            'hand_gesture': h.get('hand_gesture'),
+            'extended_count': features.get('extended_count'),
+            'finger_states': features.get('finger_states'),
+        })
+    return {
+        'frame_id': frame_id,
+        'timestamp': timestamp,
+        'hands': hands,
+        'current_string': pipeline.current_string,
+        'current_fret': pipeline.current_fret,
+        'audio': events,
+    }
+
+
+def run_headless(source: str, output: Optional[str] = None, config: Optional[Dict[str, Any]] = None,
+                 audio=None, max_frames: Optional[int] = None, record: Optional[str] = None,
+                 worker: bool = False) -> Dict[str, Any]:
+    """离线跑完整流水线，返回 frames / elapsed_s / fps / pipeline_fps / audio_events 等统计
+
+    audio 为 None 时使用 RecordingAudio；传入真实 AudioSystem 即可边回放边发声。
+    record 非空时把手部追踪输出录制为 .npz 关键点轨迹；worker 为 True 时手部追踪在独立进程中运行。
+    """
+    config = config or utils.load_config()
+    audio = audio if audio is not None else RecordingAudio(config.get('audio', {}).get('volume', 0.7))
+    tracker = (VisionWorkerTracker if worker else HandTracker)(config['hand_tracking'])
+    pipeline = RecognitionPipeline(config, tracker, GestureAnalyzer(config), audio)
+    tracer = pipeline.tracer
+    if record:
+        pipeline.recorder = TraceRecorder()
+    events = getattr(audio, 'events', None)
+
+    frames = 0
+    pipeline_time = 0.0
+    out = open(output, 'w', encoding='utf-8') if output else None
+    t_start = time.perf_counter()
+    try:
+        for frame_id, frame, timestamp in iter_frames(source):
+            if max_frames is not None and frames >= max_frames:
+                break
+            if hasattr(audio, 'frame_id'):
+                audio.frame_id = frame_id
+            n_events = len(events) if events is not None else 0
+
+            t0 = time.perf_counter()
+            tracer.begin_frame(frame_id)
+            results = pipeline.process_frame(frame)
+            tracer.end_frame()
+            pipeline_time += time.perf_counter() - t0
+            frames += 1
+
+            if out is not None:
+                new_events = events[n_events:] if events is not None else []
+                row = frame_record(frame_id, timestamp, pipeline, results, new_events)
+                out.write(json.dumps(row, ensure_ascii=False, default=_json_default) + "\n")
+    finally:
+        if out is not None:
+            out.close()
+        tracker.release()
+        if pipeline.recorder is not None:
+            pipeline.recorder.save(record)
+
+    elapsed = time.perf_counter() - t_start
+    return {
+        'frames': frames,
+        'elapsed_s': elapsed,
+        'fps': frames / elapsed if elapsed > 0 else 0.0,
+        'pipeline_fps': frames / pipeline_time if pipeline_time > 0 else 0.0,
+        'audio_events': len(events) if events is not None else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="离线回放视频/图片目录，输出逐帧识别结果 (JSONL)")
+    parser.add_argument('source', help="视频文件或图片目录")
+    parser.add_argument('--out', help="逐帧结果 JSONL 输出路径")
+    parser.add_argument('--max-frames', type=int, help="最多处理的帧数")
+    parser.add_argument('--audio', choices=('stub', 'real'), default='stub',
+                        help="stub: 录音桩（默认）；real: 使用 AudioSystem 发声")
+    parser.add_argument('--worker', action='store_true', help="在独立视觉进程中运行手部追踪")
+    parser.add_argument('--record', help="把关键点轨迹录制到该 .npz 路径")
+    parser.add_argument('--trace', help="启用延迟追踪并把 Chrome trace 写到该路径")
+    args = parser.parse_args(argv)
+
+    config = utils.load_config()
+    configure_logging(config.get('logging'))
+    tracer = configure_tracing(config.get('tracing'))
+    if args.trace:
+        tracer.enabled = True
+
+    audio = None
+    if args.audio == 'real':
+        from audio_system import AudioSystem
+        audio = AudioSystem(config['audio'])
+
+    try:
+        stats = run_headless(args.source, args.out, config, audio, args.max_frames, args.record, args.worker)
+    finally:
+        if audio is not None:
+            audio.close()
+    print(f"frames={stats['frames']}  elapsed={stats['elapsed_s']:.2f}s  "
+          f"fps={stats['fps']:.1f}  pipeline_fps={stats['pipeline_fps']:.1f}  audio_events={stats['audio_events']}")
+    if tracer.enabled and tracer.frames():
+        print(tracer.format_summary())
+        if args.trace:
+            tracer.export_chrome_trace(args.trace)
+    return 0 if stats['frames'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""手部关键点轨迹的录制与纯关键点回放
+
+录制：RecognitionPipeline.recorder 设为 TraceRecorder 后，每帧 HandTracker 的输出（关键点、手型、置信度、时间戳）
+按列追加，save() 写成一个 .npz：
+  coords (H, 21, 3) float32   所有手按帧顺序拼接
+  handedness (H,) uint8        HANDEDNESS 中的下标
+  score (H,) float32
+  frame_offsets (F+1,) int64   第 i 帧的手为 coords[frame_offsets[i]:frame_offsets[i+1]]
+  frame_ts (F,) float64        每帧时间戳（秒，time.perf_counter）
+  frame_shape (3,) int32       原始画面尺寸，供 analyze_hand_position 使用
+  label_string / label_fret (F,) int16, label_chord (F,) str   可选的逐帧标注（-1 / '' 表示未标注），见 evaluate_traces.py
+
+回放：ReplayTracker 代替 HandTracker，不加载 MediaPipe 模型，直接把轨迹送入 GestureAnalyzer 与平滑/映射逻辑，
+finger_states 在回放时按当前的 finger_geometry 阈值重新批量计算，因此调整阈值后无需重新拍摄即可对比结果。
+
+  python landmark_trace.py trace.npz                 # 回放并报告吞吐与弦/品分布
+  python landmark_trace.py trace.npz --out replay.jsonl --repeat 10
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+import utils
+from finger_geometry import finger_states_batch, finger_states_dict
+from gesture_analyzer import GestureAnalyzer
+from hand_frame import HandFrame
+from hand_tracker import HandTracker
+from log_utils import get_logger
+from recognition_pipeline import RecognitionPipeline
+
+logger = get_logger("trace")
+
+TRACE_VERSION = 1
+HANDEDNESS = ('Left', 'Right', '')
+LABEL_KEYS = ('label_string', 'label_fret', 'label_chord')
+DEFAULT_FRAME_SHAPE = (480, 640, 3)
+
+
+def _handedness_code(label: str) -> int:
+    try:
+        return HANDEDNESS.index(label)
+    except ValueError:
+        return len(HANDEDNESS) - 1
+
+
+class TraceRecorder:
+    """按列追加每帧的 HandFrame，save() 时一次性拼接为数组写出"""
+
+    def __init__(self):
+        self._coords: List[np.ndarray] = []
+        self._handedness: List[int] = []
+        self._score: List[float] = []
+        self._counts: List[int] = []
+        self._frame_ts: List[float] = []
+        self._labels: List[Optional[Dict[str, Any]]] = []
+        self.frame_shape: Optional[Sequence[int]] = None
+
+    def add_frame(self, hands, frame_shape: Optional[Sequence[int]] = None, timestamp: Optional[float] = None,
+                  label: Optional[Dict[str, Any]] = None):
+        """记录一帧（hands 为 HandFrame 或旧式 dict 列表，可为空）；label 可含 string / fret / chord 标注"""
+        if frame_shape is not None and self.frame_shape is None:
+            self.frame_shape = tuple(int(v) for v in frame_shape)
+        for hand in hands:
+            hand = HandFrame.from_hand_data(hand)
+            self._coords.append(hand.coords)
+            self._handedness.append(_handedness_code(hand.handedness))
+            self._score.append(hand.score)
+        self._counts.append(len(hands))
+        self._frame_ts.append(time.perf_counter() if timestamp is None else timestamp)
+        self._labels.append(label)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        coords = np.stack(self._coords) if self._coords else np.zeros((0, 21, 3), dtype=np.float32)
+        offsets = np.zeros(len(self._counts) + 1, dtype=np.int64)
+        np.cumsum(self._counts, out=offsets[1:])
+        arrays = {
+            'version': np.int32(TRACE_VERSION),
+            'coords': coords.astype(np.float32, copy=False),
+            'handedness': np.asarray(self._handedness, dtype=np.uint8),
+            'score': np.asarray(self._score, dtype=np.float32),
+            'frame_offsets': offsets,
+            'frame_ts': np.asarray(self._frame_ts, dtype=np.float64),
+            'frame_shape': np.asarray(self.frame_shape or DEFAULT_FRAME_SHAPE, dtype=np.int32),
+        }
+        if any(self._labels):
+            labels = [lb or {} for lb in self._labels]
+            arrays.update(label_arrays([lb.get('string') for lb in labels], [lb.get('fret') for lb in labels],
+                                       [lb.get('chord') for lb in labels]))
+        return arrays
+
+    def save(self, path: str) -> str:
+        np.savez_compressed(path, **self.arrays())
+        logger.info("已保存关键点轨迹 %s（%d 帧）", path, len(self))
+        return path
+
+
+def label_arrays(strings: Sequence[Optional[int]], frets: Sequence[Optional[int]],
+                 chords: Sequence[Optional[str]]) -> Dict[str, np.ndarray]:
+    """由逐帧标注（None 表示未标注）构造 label_* 数组"""
+    return {
+        'label_string': np.asarray([-1 if v is None else int(v) for v in strings], dtype=np.int16),
+        'label_fret': np.asarray([-1 if v is None else int(v) for v in frets], dtype=np.int16),
+        'label_chord': np.asarray(['' if v is None else str(v) for v in chords], dtype=np.str_),
+    }
+
+
+class LandmarkTrace:
+    """从 .npz 读取的关键点轨迹"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        version = int(arrays.get('version', TRACE_VERSION))
+        if version > TRACE_VERSION:
+            raise ValueError(f"不支持的轨迹版本: {version}")
+        self.coords = np.asarray(arrays['coords'], dtype=np.float32)
+        self.handedness = np.asarray(arrays['handedness'], dtype=np.uint8)
+        self.score = np.asarray(arrays['score'], dtype=np.float32)
+        self.frame_offsets = np.asarray(arrays['frame_offsets'], dtype=np.int64)
+        self.frame_ts = np.asarray(arrays['frame_ts'], dtype=np.float64)
+        self.frame_shape = tuple(int(v) for v in arrays['frame_shape'])
+        # 其余数组（如标注）原样保留
+        self.extra = {k: v for k, v in arrays.items() if k not in (
+            'version', 'coords', 'handedness', 'score', 'frame_offsets', 'frame_ts', 'frame_shape')}
+
+    @classmethod
+    def load(cls, path: str) -> 'LandmarkTrace':
+        with np.load(path) as data:
+            return cls({k: data[k] for k in data.files})
+
+    def __len__(self) -> int:
+        return len(self.frame_ts)
+
+    @property
+    def num_hands(self) -> int:
+        return len(self.coords)
+
+    @property
+    def labels(self) -> Dict[str, np.ndarray]:
+        """逐帧标注数组（没有标注时为空 dict）"""
+        return {k: self.extra[k] for k in LABEL_KEYS if k in self.extra}
+
+    def hands(self, index: int, finger_states: Optional[np.ndarray] = None) -> List[HandFrame]:
+        """第 index 帧的 HandFrame 列表；finger_states 为 (H, 5) 时附上对应的手指状态"""
+        lo, hi = self.frame_offsets[index], self.frame_offsets[index + 1]
+        ts = self.frame_ts[index]
+        return [HandFrame(self.coords[i], handedness=HANDEDNESS[self.handedness[i]], score=self.score[i],
+                          timestamp=ts,
+                          finger_states=None if finger_states is None else finger_states_dict(finger_states[i]))
+                for i in range(lo, hi)]
+
+
+class ReplayTracker(HandTracker):
+    """按顺序吐出轨迹中各帧的 HandTracker 替身，不加载模型也不绘制，get_hand_gesture 等沿用 HandTracker"""
+
+    def __init__(self, trace: LandmarkTrace):
+        self.trace = trace
+        self.cursor = 0
+        self.external_recognizer = None
+        self.governor = None   # 回放不做推理，没有负载调节
+        # 与 HandTracker.process_frame 相同的批量判定，只是对整条轨迹一次完成
+        self.finger_states = (finger_states_batch(trace.coords) if trace.num_hands
+                              else np.zeros((0, 5), dtype=bool))
+
+    def process_frame(self, image: np.ndarray):
+        if self.cursor >= len(self.trace):
+            return image, []
+        hands = self.trace.hands(self.cursor, self.finger_states)
+        self.cursor += 1
+        return image, hands
+
+    def rewind(self):
+        self.cursor = 0
+
+    def release(self):
+        pass
+
+
+def replay(trace: LandmarkTrace, config: Optional[Dict[str, Any]] = None, audio=None,
+           collect: bool = True) -> Dict[str, Any]:
+    """把整条轨迹送入 RecognitionPipeline，返回 frames / elapsed_s / fps / results
+
+    results 为每帧的 (current_string, current_fret, [(hand_type, string, fret, hand_gesture), ...])。
+    audio 为 None 时使用 headless_runner.RecordingAudio。
+    """
+    if audio is None:
+        from headless_runner import RecordingAudio
+        audio = RecordingAudio()
+    config = config or utils.load_config()
+    tracker = ReplayTracker(trace)
+    pipeline = RecognitionPipeline(config, tracker, GestureAnalyzer(config), audio)
+    # analyze_hand_position 只读取画面尺寸，用零步长的占位数组代替真实帧
+    placeholder = np.broadcast_to(np.zeros(1, dtype=np.uint8), trace.frame_shape)
+
+    results = []
+    t0 = time.perf_counter()
+    for _ in range(len(trace)):
+        out = pipeline.process_frame(placeholder)
+        if collect:
+            results.append((pipeline.current_string, pipeline.current_fret,
+                            [(h.get('hand_type'), h.get('string'), h.get('fret'), h.get('hand_gesture'))
+                             for h in out.get('hand_data', [])]))
+    elapsed = time.perf_counter() - t0
+    return {
+        'frames': len(trace),
+        'elapsed_s': elapsed,
+        'fps': len(trace) / elapsed if elapsed > 0 else 0.0,
+        'results': results,
+        'audio_events': len(getattr(audio, 'events', ())),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="回放 .npz 关键点轨迹（不运行 MediaPipe）")
+    parser.add_argument('trace', help="TraceRecorder 保存的 .npz 文件")
+    parser.add_argument('--out', help="逐帧回放结果 JSONL 输出路径")
+    parser.add_argument('--repeat', type=int, default=1, help="重复回放次数，用于测量吞吐")
+    args = parser.parse_args(argv)
+
+    trace = LandmarkTrace.load(args.trace)
+    config = utils.load_config()
+    print(f"轨迹: {len(trace)} 帧, {trace.num_hands} 只手, 画面 {trace.frame_shape}")
+
+    best = None
+    for _ in range(max(1, args.repeat)):
+        stats = replay(trace, config)
+        if best is None or stats['elapsed_s'] < best['elapsed_s']:
+            best = stats
+    print(f"回放: {best['frames']} 帧, 最佳 {best['elapsed_s'] * 1000:.1f} ms, {best['fps']:.0f} 帧/秒, "
+          f"音频触发 {best['audio_events']} 次")
+
+    mappings = Counter((s, f) for s, f, _ in best['results'])
+    print("弦/品分布（帧数）:")
+    for (s, f), n in mappings.most_common(10):
+        print(f"  弦 {s} 品 {f}: {n}")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as out:
+            for i, (s, f, hands) in enumerate(best['results']):
+                out.write(json.dumps({'frame': i, 'current_string': s, 'current_fret': f,
+                                      'hands': hands}, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,255 @@
+import collections
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 流水线阶段，顺序即数据流向
+STAGES = ('capture', 'hand_tracking', 'gesture_analysis', 'smoothing', 'mapping', 'audio_trigger')
+# 汇总里额外给出的两个端到端指标
+END_TO_END = 'end_to_end'      # 相机采集时刻 -> 音频触发
+FRAME_TOTAL = 'frame_total'    # 相机采集时刻 -> 本帧处理结束
+
+# 直方图桶边界（毫秒）
+HISTOGRAM_EDGES_MS = [0, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 133, 250, 500, 1000, float('inf')]
+
+
+class FrameTrace:
+    """一帧的时间戳记录：各阶段区间 (stage, t0, t1) 与音频触发 (key, t)，时间均为 time.perf_counter()"""
+
+    __slots__ = ('frame_id', 'capture_ts', 'start', 'end', 'spans', 'triggers')
+
+    def __init__(self, frame_id: int, capture_ts: Optional[float], start: float):
+        self.frame_id = frame_id
+        self.capture_ts = capture_ts
+        self.start = start
+        self.end: Optional[float] = None
+        self.spans: List[Tuple[str, float, float]] = []
+        self.triggers: List[Tuple[str, float]] = []
+
+    @property
+    def origin(self) -> float:
+        return self.capture_ts if self.capture_ts is not None else self.start
+
+
+class _Span:
+    __slots__ = ('trace', 'stage', 't0')
+
+    def __init__(self, trace: FrameTrace, stage: str):
+        self.trace = trace
+        self.stage = stage
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.spans.append((self.stage, self.t0, time.perf_counter()))
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class LatencyTracer:
+    """手势到发声的延迟追踪器
+
+    主循环对每一帧调用 begin_frame(frame_id, capture_ts) / end_frame()，各阶段用 `with tracer.span(stage)` 计时，
+    AudioSystem 在发声时调用 audio_trigger(key)，触发会标记为当前线程正在处理的那一帧。
+    关闭时 span() 返回共享的空上下文，开销只有一次属性判断。
+    """
+
+    def __init__(self, enabled: bool = False, max_frames: int = 3000):
+        self.enabled = enabled
+        self._frames: collections.deque = collections.deque(maxlen=max(1, int(max_frames)))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    # ---------------------- 记录 ----------------------
+    @property
+    def current(self) -> Optional[FrameTrace]:
+        return getattr(self._local, 'trace', None)
+
+    def begin_frame(self, frame_id: int, capture_ts: Optional[float] = None):
+        if not self.enabled:
+            return
+        start = time.perf_counter()
+        trace = FrameTrace(frame_id, capture_ts, start)
+        if capture_ts is not None:
+            # 采集阶段：相机帧到达到被主循环取走之间的等待
+            trace.spans.append(('capture', capture_ts, start))
+        self._local.trace = trace
+
+    def end_frame(self):
+        trace = self.current
+        if trace is None:
+            return
+        trace.end = time.perf_counter()
+        self._local.trace = None
+        with self._lock:
+            self._frames.append(trace)
+
+    def span(self, stage: str):
+        trace = self.current if self.enabled else None
+        if trace is None:
+            return _NULL_SPAN
+        return _Span(trace, stage)
+
+    def audio_trigger(self, key: str) -> Optional[int]:
+        """记录一次音频触发，返回其来源帧 id（不在帧处理中时返回 None）"""
+        trace = self.current if self.enabled else None
+        if trace is None:
+            return None
+        trace.triggers.append((key, time.perf_counter()))
+        return trace.frame_id
+
+    def reset(self):
+        with self._lock:
+            self._frames.clear()
+
+    def frames(self) -> List[FrameTrace]:
+        with self._lock:
+            return list(self._frames)
+
+    # ---------------------- 统计 ----------------------
+    def stage_latencies(self) -> Dict[str, np.ndarray]:
+        """每个阶段每帧的耗时（毫秒，同一帧内多次出现的阶段求和，如每只手一次的 gesture_analysis）"""
+        per_stage: Dict[str, List[float]] = {name: [] for name in STAGES + (END_TO_END, FRAME_TOTAL)}
+        for trace in self.frames():
+            totals: Dict[str, float] = {}
+            for stage, t0, t1 in trace.spans:
+                totals[stage] = totals.get(stage, 0.0) + (t1 - t0)
+            for stage, total in totals.items():
+                per_stage.setdefault(stage, []).append(total * 1000.0)
+            if trace.triggers:
+                per_stage[END_TO_END].append((trace.triggers[0][1] - trace.origin) * 1000.0)
+            if trace.end is not None:
+                per_stage[FRAME_TOTAL].append((trace.end - trace.origin) * 1000.0)
+        return {stage: np.asarray(values) for stage, values in per_stage.items()}
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """各阶段 count / mean / p50 / p95 / p99 / max（毫秒）"""
+        result = {}
+        for stage, values in self.stage_latencies().items():
+            if values.size == 0:
+                result[stage] = {'count': 0}
+                continue
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            result[stage] = {
+                'count': int(values.size),
+                'mean_ms': float(values.mean()),
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99),
+                'max_ms': float(values.max()),
+            }
+        return result
+
+    def histograms(self) -> Dict[str, Dict[str, list]]:
+        """各阶段在固定毫秒桶（HISTOGRAM_EDGES_MS）上的计数"""
+        edges = np.asarray(HISTOGRAM_EDGES_MS)
+        return {stage: {'edges_ms': HISTOGRAM_EDGES_MS[:-1] + ['inf'],
+                        'counts': np.histogram(values, bins=edges)[0].tolist()}
+                for stage, values in self.stage_latencies().items()}
+
+    def format_summary(self) -> str:
+        lines = [f"{'stage':<18}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)"]
+        for stage, s in self.summary().items():
+            if not s['count']:
+                continue
+            lines.append(f"{stage:<18}{s['count']:>7}{s['p50_ms']:>9.2f}{s['p95_ms']:>9.2f}"
+                         f"{s['p99_ms']:>9.2f}{s['max_ms']:>9.2f}")
+        return "\n".join(lines)
+
+    # ---------------------- 导出 ----------------------
+    def export_json(self, path: str):
+        """导出汇总、直方图与逐帧原始时间戳（相对第一帧，毫秒）"""
+        frames = self.frames()
+        t0 = frames[0].origin if frames else 0.0
+        data = {
+            'summary': self.summary(),
+            'histograms': self.histograms(),
+            'frames': [{
+                'frame_id': t.frame_id,
+                'capture_ms': None if t.capture_ts is None else (t.capture_ts - t0) * 1000.0,
+                'spans': [[stage, (a - t0) * 1000.0, (b - t0) * 1000.0] for stage, a, b in t.spans],
+                'triggers': [[key, (ts - t0) * 1000.0] for key, ts in t.triggers],
+            } for t in frames],
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+
+    def export_chrome_trace(self, path: str):
+        """导出 Chrome trace event 格式（chrome://tracing 或 Perfetto 打开）
+
+        阶段为完整事件（ph=X），音频触发为瞬时事件（ph=i），args 中带来源 frame_id。
+        采集等待画在单独的一行（tid=2），其余阶段在主循环一行（tid=1）。
+        """
+        frames = self.frames()
+        t0 = frames[0].origin if frames else 0.0
+        events: List[Dict[str, Any]] = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': 'pipeline'}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 2, 'args': {'name': 'capture'}},
+        ]
+        for t in frames:
+            for stage, a, b in t.spans:
+                events.append({'name': stage, 'cat': 'pipeline', 'ph': 'X', 'pid': 1,
+                               'tid': 2 if stage == 'capture' else 1,
+                               'ts': (a - t0) * 1e6, 'dur': (b - a) * 1e6, 'args': {'frame_id': t.frame_id}})
+            for key, ts in t.triggers:
+                events.append({'name': f'audio_trigger {key}', 'cat': 'audio', 'ph': 'i', 's': 'p', 'pid': 1,
+                               'tid': 1, 'ts': (ts - t0) * 1e6,
+                               'args': {'frame_id': t.frame_id, 'key': key,
+                                        'latency_ms': (ts - t.origin) * 1000.0}})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def export(self, config: Optional[Dict[str, Any]] = None) -> List[str]:
+        """按 tracing 配置中的 export_json / export_chrome 路径导出，返回写出的文件"""
+        config = config or {}
+        written = []
+        if config.get('export_json'):
+            self.export_json(config['export_json'])
+            written.append(config['export_json'])
+        if config.get('export_chrome'):
+            self.export_chrome_trace(config['export_chrome'])
+            written.append(config['export_chrome'])
+        return written
+
+
+_tracer = LatencyTracer()
+
+
+def get_tracer() -> LatencyTracer:
+    """全局追踪器（默认关闭）"""
+    return _tracer
+
+
+def configure_tracing(config: Optional[Dict[str, Any]] = None) -> LatencyTracer:
+    """根据 config.yaml 的 tracing 段配置全局追踪器
+
+    可用键：enabled（默认 false，可被环境变量 AIRGUITAR_TRACE=1 覆盖）、max_frames（保留最近多少帧，默认 3000）。
+    """
+    config = config or {}
+    env = os.environ.get("AIRGUITAR_TRACE")
+    if env is not None:
+        _tracer.enabled = env not in ('', '0')
+    else:
+        _tracer.enabled = bool(config.get('enabled', False))
+    max_frames = int(config.get('max_frames', 3000))
+    if _tracer._frames.maxlen != max_frames:
+        _tracer._frames = collections.deque(_tracer.frames(), maxlen=max(1, max_frames))
+    return _tracer
@@ -0,0 +1,97 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from log_utils import get_logger
+
+logger = get_logger("governor")
+
+# (model_complexity, 推理宽度像素)，从高画质到低负载排列
+DEFAULT_TIERS: List[Tuple[int, int]] = [(1, 640), (0, 640), (0, 480), (0, 320)]
+
+
+class LoadGovernor:
+    """按实测每帧处理时间在推理档位之间切换
+
+    每帧以 update(frame_seconds) 报告处理耗时，内部取指数滑动平均与帧预算 1/target_fps 比较：
+    连续 downgrade_frames 帧高于预算 × downgrade_ratio 时降一档，连续 upgrade_frames 帧低于预算 × upgrade_ratio 时升一档。
+    两个阈值之间为死区，升档所需帧数远多于降档，切换后平均值与计数清零，避免在两档之间来回跳。
+    """
+
+    def __init__(self, tiers: Sequence[Sequence[int]] = DEFAULT_TIERS, target_fps: float = 30.0,
+                 downgrade_ratio: float = 1.0, upgrade_ratio: float = 0.6,
+                 downgrade_frames: int = 15, upgrade_frames: int = 90,
+                 start_tier: int = 0, smoothing: float = 0.1):
+        if not tiers:
+            raise ValueError("LoadGovernor 至少需要一个档位")
+        self.tiers = [(int(c), int(w)) for c, w in tiers]
+        self.budget = 1.0 / float(target_fps)
+        self.downgrade_ratio = float(downgrade_ratio)
+        self.upgrade_ratio = float(upgrade_ratio)
+        self.downgrade_frames = max(1, int(downgrade_frames))
+        self.upgrade_frames = max(1, int(upgrade_frames))
+        self.smoothing = float(smoothing)
+        self.tier = min(max(0, int(start_tier)), len(self.tiers) - 1)
+        self.average: Optional[float] = None
+        self._over = 0
+        self._under = 0
+        self.changes = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'LoadGovernor':
+        """由 hand_tracking.adaptive 配置段构造"""
+        keys = ('target_fps', 'downgrade_ratio', 'upgrade_ratio', 'downgrade_frames', 'upgrade_frames',
+                'start_tier', 'smoothing')
+        return cls(tiers=config.get('tiers') or DEFAULT_TIERS, **{k: config[k] for k in keys if k in config})
+
+    @property
+    def model_complexity(self) -> int:
+        return self.tiers[self.tier][0]
+
+    @property
+    def inference_width(self) -> int:
+        return self.tiers[self.tier][1]
+
+    @property
+    def tier_name(self) -> str:
+        return f"T{self.tier} mc{self.model_complexity} {self.inference_width}px"
+
+    def update(self, frame_seconds: float) -> bool:
+        """报告一帧的处理耗时，档位改变时返回 True"""
+        if self.average is None:
+            self.average = frame_seconds
+        else:
+            self.average += self.smoothing * (frame_seconds - self.average)
+
+        if self.average > self.budget * self.downgrade_ratio:
+            self._over += 1
+            self._under = 0
+        elif self.average < self.budget * self.upgrade_ratio:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= self.downgrade_frames and self.tier < len(self.tiers) - 1:
+            return self._switch(self.tier + 1)
+        if self._under >= self.upgrade_frames and self.tier > 0:
+            return self._switch(self.tier - 1)
+        return False
+
+    def _switch(self, tier: int) -> bool:
+        logger.info("推理档位 %d -> %d (平均帧耗时 %.1f ms, 预算 %.1f ms)",
+                    self.tier, tier, self.average * 1000.0, self.budget * 1000.0)
+        self.tier = tier
+        self.average = None
+        self._over = self._under = 0
+        self.changes += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'tier': self.tier,
+            'tier_name': self.tier_name,
+            'model_complexity': self.model_complexity,
+            'inference_width': self.inference_width,
+            'average_ms': None if self.average is None else self.average * 1000.0,
+            'budget_ms': self.budget * 1000.0,
+            'changes': self.changes,
+        }
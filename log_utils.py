@@ -0,0 +1,139 @@
+import collections
+import logging
+import os
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+ROOT_LOGGER = "airguitar"
+
+_configured_handler: Optional[logging.Handler] = None
+_sample_every = 1
+
+
+class SampledLogger(logging.LoggerAdapter):
+    """按消息模板采样的日志器
+
+    同一消息模板的 DEBUG/INFO 每 sample_every 条只生成 1 条记录，被跳过的调用不创建 LogRecord；
+    WARNING 及以上始终输出。日志级别关闭时只做一次级别判断，不做字符串格式化。
+    """
+
+    def __init__(self, logger: logging.Logger):
+        super().__init__(logger, {})
+        self._counts: Dict[Any, int] = collections.defaultdict(int)
+
+    def log(self, level, msg, *args, **kwargs):
+        if not self.logger.isEnabledFor(level):
+            return
+        if _sample_every > 1 and level < logging.WARNING:
+            n = self._counts[msg]
+            self._counts[msg] = n + 1
+            if n % _sample_every:
+                return
+        kwargs.setdefault('stacklevel', 3)
+        self.logger.log(level, msg, *args, **kwargs)
+
+
+def get_logger(name: str) -> SampledLogger:
+    """获取项目日志器（位于 airguitar 命名空间下，默认级别 WARNING）
+
+    热路径中使用 logger.debug("...%s", x) 形式，参数只在真正输出时才格式化。
+    """
+    return SampledLogger(logging.getLogger(f"{ROOT_LOGGER}.{name}"))
+
+
+class RingBufferHandler(logging.Handler):
+    """异步环形缓冲日志处理器
+
+    emit() 只解析参数并放入定长 deque（满时丢弃最旧记录），由后台线程写入 target，
+    热路径不会因为 stdout 管道或 Streamlit 日志阻塞。
+    """
+
+    def __init__(self, target: logging.Handler, capacity: int = 1024):
+        super().__init__()
+        self.target = target
+        self.capacity = max(1, int(capacity))
+        self._buffer: collections.deque = collections.deque(maxlen=self.capacity)
+        self._cond = threading.Condition()
+        self._stopped = False
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._drain, name="log-ring-buffer", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            # 与 QueueHandler.prepare 相同：先合并参数，避免对象在写出前被修改
+            record.msg = record.getMessage()
+            record.args = None
+            record.exc_info = None
+            with self._cond:
+                if len(self._buffer) == self.capacity:
+                    self.dropped += 1
+                self._buffer.append(record)
+                self._cond.notify()
+        except Exception:
+            self.handleError(record)
+
+    def _drain(self):
+        while True:
+            with self._cond:
+                while not self._buffer and not self._stopped:
+                    self._cond.wait()
+                if not self._buffer and self._stopped:
+                    return
+                batch = list(self._buffer)
+                self._buffer.clear()
+            for record in batch:
+                self.target.handle(record)
+
+    def flush(self):
+        with self._cond:
+            batch = list(self._buffer)
+            self._buffer.clear()
+        for record in batch:
+            self.target.handle(record)
+        self.target.flush()
+
+    def close(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
+        self.flush()
+        self.target.close()
+        super().close()
+
+
+def configure_logging(config: Optional[Dict[str, Any]] = None, stream=None) -> logging.Logger:
+    """根据 config.yaml 的 logging 段配置项目日志
+
+    可用键：level（默认 WARNING，可被环境变量 AIRGUITAR_LOG_LEVEL 覆盖）、
+    sample_every（DEBUG/INFO 采样间隔，默认 1）、ring_buffer（>0 时启用异步环形缓冲，默认 1024）。
+    重复调用会替换上一次安装的处理器。
+    """
+    global _configured_handler, _sample_every
+    config = config or {}
+    level_name = os.environ.get("AIRGUITAR_LOG_LEVEL") or config.get('level', 'WARNING')
+    level = logging.getLevelName(str(level_name).upper())
+    if not isinstance(level, int):
+        level = logging.WARNING
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.propagate = False
+
+    if _configured_handler is not None:
+        root.removeHandler(_configured_handler)
+        _configured_handler.close()
+        _configured_handler = None
+
+    target = logging.StreamHandler(stream or sys.stderr)
+    target.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    capacity = int(config.get('ring_buffer', 1024) or 0)
+    handler = RingBufferHandler(target, capacity) if capacity > 0 else target
+    _sample_every = max(1, int(config.get('sample_every', 1) or 1))
+
+    root.addHandler(handler)
+    _configured_handler = handler
+    return root
@@ -1,22 +1,26 @@
 
 import streamlit as st
 import streamlit.components.v1 as components
-import cv2
-import numpy as np
 import time
 import sys
 import os
-from typing import Dict, Any
-from collections import deque
 
 
 # 添加当前目录到Python路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from hand_tracker import HandTracker
+from vision_worker import VisionWorkerTracker
 from gesture_analyzer import GestureAnalyzer
 from audio_system import AudioSystem
+from camera_capture import ThreadedCapture
+from landmark_trace import TraceRecorder
+from latency_tracer import configure_tracing
+from recognition_pipeline import RecognitionPipeline
+from log_utils import configure_logging, get_logger
 import utils
 
+logger = get_logger("app")
+
 # 在 imports 区加入（在现有 import 之后）
 try:
     from generate_guitar_samples import OUTPUT_DIR, generate_all, generate_sample_chord
@@ -30,37 +34,28 @@ except Exception:
         pass
 
 
-class AirGuitarApp:
-    """空气吉他主应用程序"""
+class AirGuitarApp(RecognitionPipeline):
+    """空气吉他主应用程序（逐帧识别逻辑见 RecognitionPipeline）"""
 
     def __init__(self):
         self.config = utils.load_config()
+        configure_logging(self.config.get('logging'))
+        self.tracer = configure_tracing(self.config.get('tracing'))
         self.setup_components()
 
-        # 状态变量
+        # 状态变量（识别流水线的跨帧状态在 reset_pipeline_state 中）
+        self.reset_pipeline_state()
+        if self.config['hand_tracking'].get('record_trace'):
+            self.recorder = TraceRecorder()
         self.is_running = False
-        self.is_playing = False
-        self.recognition_enabled = True
-        self.current_chord = "none"
-        self.prev_hand_data = None
         self.frame_count = 0
         self.fps = 0
         self.last_fps_time = time.time()
         self.button_counter = 0
         self.chord_history = []
-        self.debug_info = ""
-        self.current_string = None
-        self.current_fret = None
-        self.last_played_mapping = (None, None)
         self.should_navigate = False
         self.target_page = None
 
-        # 历史平滑缓存：每只手保留最近 N 帧的 finger_states 用于去抖
-        self._finger_history = {
-            'left': deque(maxlen=5),
-            'right': deque(maxlen=5)
-        }
-
     def navigate_to(self, target_page):
         """导航到其他页面"""
         self.should_navigate = True
@@ -76,13 +71,17 @@ class AirGuitarApp:
             self.hand_tracker.release()
             print("✅ 手部追踪器已释放")
         if hasattr(self, 'audio_system'):
-            self.audio_system.stop_all()
-            print("✅ 音频系统已停止")
+            self.audio_system.close()
+            print("✅ 音频系统已关闭")
 
     def setup_components(self):
         """设置各个组件"""
         try:
-            self.hand_tracker = HandTracker(self.config['hand_tracking'])
+            if self.config['hand_tracking'].get('worker_process'):
+                # 推理放到独立进程，帧经共享内存传递
+                self.hand_tracker = VisionWorkerTracker(self.config['hand_tracking'])
+            else:
+                self.hand_tracker = HandTracker(self.config['hand_tracking'])
             self.gesture_analyzer = GestureAnalyzer(self.config)
             self.audio_system = AudioSystem(self.config['audio'])
             # 注释掉或移除对 guitar_3d 的引用
@@ -325,162 +324,6 @@ class AirGuitarApp:
             st.markdown("---")
             st.caption("若需在不同界面间切换，请使用统一入口 unified_app.py（侧边栏选择）。")
 
-    def process_frame(self, frame: np.ndarray) -> Dict[str, Any]:
-        """处理单帧图像（增加手型规范化、帧级手指去抖与左右手去重）"""
-        # 手部追踪
-        processed_frame, hand_data = self.hand_tracker.process_frame(frame)
-
-        analyzed_data = []
-        current_chord = "none"
-
-        for hand in hand_data:
-            # 确保手型字段规范化为 'left' / 'right'
-            hand_type_norm = self._normalize_hand_type(hand)
-            try:
-                analysis = self.gesture_analyzer.analyze_hand_position(hand, frame.shape)
-            except Exception:
-                analysis = {}
-            # 手势（张开/握拳）
-            hand_gesture = self.hand_tracker.get_hand_gesture(hand)
-            analysis['hand_gesture'] = hand_gesture
-
-            # 标注并统一 hand_type 字段（分析结果中）
-            analysis['hand_type'] = hand_type_norm
-
-            # 获取并平滑 finger_states（若有），并更新 extended_count
-            features = analysis.get('hand_features', {}) or {}
-            raw_states = features.get('finger_states', {}) or {}
-            smoothed = self._smooth_finger_states(hand_type_norm, raw_states)
-            features['finger_states'] = smoothed
-            features['extended_count'] = sum(1 for v in smoothed.values() if v)
-            features['extended_count_no_thumb'] = features.get('extended_count_no_thumb', features['extended_count'] - (1 if smoothed.get('thumb') else 0))
-            analysis['hand_features'] = features
-
-            # 额外映射：根据左右手确定弦或品，并记录详细调试信息
-            try:
-                if hand_type_norm == 'left':
-                    s = self.gesture_analyzer.map_left_hand_to_string(analysis.get('hand_features', {}))
-                    analysis['string'] = s
-                    print(f"DEBUG: 左手检测 -> string={s}, features={analysis.get('hand_features', {})}")
-                elif hand_type_norm == 'right':
-                    f = self.gesture_analyzer.determine_fret_from_right_hand(analysis.get('hand_features', {}), hand.get('landmarks', []))
-                    analysis['fret'] = f
-                    try:
-                        print(f"DEBUG_RIGHT_MAP: fret={f} extended_count={analysis.get('hand_features', {}).get('extended_count')} features={analysis.get('hand_features', {})}")
-                    except Exception:
-                        print(f"DEBUG: 右手检测 -> fret={f}, features={analysis.get('hand_features', {})}")
-                else:
-                    print(f"DEBUG: 未知手型字段，原始手信息: {hand}")
-            except Exception as e:
-                print(f"DEBUG: 映射错误: {e}")
-
-            # 保证 detected 字段存在
-            if 'detected' not in analysis:
-                analysis['detected'] = bool(analysis.get('hand_features'))
-
-            analyzed_data.append(analysis)
-
-            # 当识别被启用时进行和弦识别并更新调试信息（保留原有逻辑）
-            if self.recognition_enabled and analysis.get('detected'):
-                s = analysis.get('string', None)
-                f = analysis.get('fret', None)
-                extended_count = analysis.get('hand_features', {}).get('extended_count', 0)
-                if s is not None or f is not None:
-                    s_disp = s if s is not None else '-'
-                    f_disp = f if f is not None else '-'
-                    self.debug_info = f"映射检测: 弦 {s_disp} | 品 {f_disp} | 伸直手指: {extended_count}个"
-                else:
-                    if analysis.get('gesture', 'unknown') != 'unknown':
-                        self.debug_info = f"(旧)识别成功: {analysis.get('gesture')} | 伸直手指: {extended_count}个"
-            else:
-                if analysis.get('detected') and hand_gesture == 'fist':
-                    if getattr(self, 'is_playing', False):
-                        try:
-                            self.audio_system.stop_all()
-                        except Exception:
-                            pass
-                        self.is_playing = False
-                        self.debug_info = "手势: 握拳 - 停止播放，和弦识别已禁用"
-                    else:
-                        self.debug_info = "手势: 握拳 - 和弦识别已禁用"
-
-        # 去重：同一侧可能出现多条记录（来自 Tracker 抖动），保留伸直手指数更多的一条
-        deduped = {}
-        for a in analyzed_data:
-            ht = (a.get('hand_type') or '').lower()
-            if not ht:
-                continue
-            cur_count = a.get('hand_features', {}).get('extended_count', 0)
-            if ht not in deduped or cur_count > deduped[ht].get('hand_features', {}).get('extended_count', 0):
-                deduped[ht] = a
-        # 保留顺序：left then right if存在
-        final_list = []
-        if 'left' in deduped:
-            final_list.append(deduped['left'])
-        if 'right' in deduped:
-            final_list.append(deduped['right'])
-
-        analyzed_data = final_list
-
-        # 以下逻辑保持：更新 prev_hand_data、current_string/current_fret、扫弦触发等
-        try:
-            if self.prev_hand_data and analyzed_data:
-                prev_map = {h.get('hand_type', '').lower(): h for h in self.prev_hand_data}
-                cur_map = {h.get('hand_type', '').lower(): h for h in analyzed_data}
-                target = None
-                if 'right' in prev_map and 'right' in cur_map:
-                    target = ('right', prev_map['right'], cur_map['right'])
-                elif 'left' in prev_map and 'left' in cur_map:
-                    target = ('left', prev_map['left'], cur_map['left'])
-                if target is not None:
-                    _, prev_h, cur_h = target
-                    strum_direction = self.gesture_analyzer.calculate_strumming_direction(prev_h, cur_h)
-                    if strum_direction != "none":
-                        self.on_strum_detected(strum_direction)
-        except Exception as e:
-            print(f"DEBUG: strum detection error: {e}")
-
-        self.prev_hand_data = analyzed_data
-        self.current_chord = current_chord
-
-        # 更新当前弦/品（仅在检测到新映射时更新）
-        for h in analyzed_data:
-            htype = str(h.get('hand_type', '')).lower()
-            if htype.startswith('l'):
-                if 'string' in h:
-                    self.current_string = h['string']
-            elif htype.startswith('r'):
-                if 'fret' in h:
-                    self.current_fret = h['fret']
-                else:
-                    self.current_fret = 0
-
-        found_right = any(str(h.get('hand_type', '')).lower().startswith('r') for h in analyzed_data)
-        if not found_right:
-            self.current_fret = 0
-        found_left = any(str(h.get('hand_type', '')).lower().startswith('l') for h in analyzed_data)
-        if not found_left:
-            self.current_string = 0
-
-        # 变化时播放一次预览
-        try:
-            mapping = (self.current_string, self.current_fret)
-            if mapping != self.last_played_mapping and mapping[0] and mapping[1] is not None:
-                if mapping[0] != 0 and mapping[1] >= 0:
-                    try:
-                        self.audio_system.play_string_fret(mapping[0], mapping[1], volume=self.audio_system.get_volume())
-                    except Exception:
-                        pass
-                self.last_played_mapping = mapping
-        except Exception:
-            pass
-
-        return {
-            'processed_frame': processed_frame,
-            'hand_data': analyzed_data,
-            'current_chord': current_chord
-        }
-
     def on_chord_change(self, new_chord: str):
         """处理和弦变化"""
         print(f"🎵 检测到和弦变化: {new_chord}")
@@ -498,27 +341,6 @@ class AirGuitarApp:
         if new_chord != "none" and new_chord != "unknown":
             self.chord_history.append({'chord': new_chord, 'time': time.time()})
 
-    def on_strum_detected(self, direction: str):
-        """处理扫弦检测"""
-        print(f"🎸 检测到扫弦: {direction}")
-        self.audio_system.play_effect("pick_noise", 0.3)
-        # 若同时有当前弦与品的信息，则播放对应单音样本
-        try:
-            s = getattr(self, 'current_string', None)
-            f = getattr(self, 'current_fret', None)
-            print(f"DEBUG: on_strum_detected current_string={s}, current_fret={f}")
-            if s is not None and f is not None:
-                # 打印样本是否存在
-                key = f"string{s}_fret{f}"
-                exists = key in self.audio_system.samples
-                print(f"DEBUG: sample {key} exists={exists}")
-                if exists:
-                    self.audio_system.play_string_fret(s, f, volume=self.audio_system.get_volume())
-                else:
-                    print(f"DEBUG: 样本未找到: {key}")
-        except Exception:
-            pass
-
     def update_fps(self):
         """更新FPS计算"""
         self.frame_count += 1
@@ -733,8 +555,9 @@ class AirGuitarApp:
         # 渲染原有侧边栏内容
         settings = self.render_sidebar()
 
-        # 初始化摄像头
-        cap = cv2.VideoCapture(0)
+        # 初始化摄像头（后台线程采集，推理循环始终取最新帧）
+        cap = ThreadedCapture(0)
+        self.cap = cap
 
         if not cap.isOpened():
             st.error("❌ 无法访问摄像头，请检查摄像头连接")
@@ -750,6 +573,7 @@ class AirGuitarApp:
             """, unsafe_allow_html=True)
             return
 
+        cap.start()
         st.success("✅ 摄像头初始化成功")
 
         # 创建占位符
@@ -807,10 +631,14 @@ class AirGuitarApp:
                     st.info("⏹️ 应用正在停止...")
                     break
 
-                ret, frame = cap.read()
+                ret, frame, frame_id, capture_ts = cap.read_latest()
                 if not ret:
+                    # 单纯超时（如摄像头首帧较慢）继续等待，只有采集线程结束才退出
+                    if not cap.ended:
+                        continue
                     st.error("❌ 无法读取摄像头帧")
                     break
+                self.tracer.begin_frame(frame_id, capture_ts)
 
                 # 处理帧
                 results = self.process_frame(frame)
@@ -873,6 +701,8 @@ class AirGuitarApp:
                             pass
                 except Exception:
                     pass
+                # 延迟追踪只覆盖采集到发声，不计入下方的 UI 渲染
+                self.tracer.end_frame()
 
                 # 更新FPS
                 self.update_fps()
@@ -1045,9 +875,14 @@ class AirGuitarApp:
 
                 # 更新状态信息（简洁：仅保留指标）
                 with status_placeholder.container():
-                    col1, col2, col3, col4 = st.columns(4)
+                    col1, col_tier, col2, col3, col4, col5 = st.columns(6)
                     with col1:
                         st.metric("📊 FPS", f"{self.fps:.1f}")
+                    with col_tier:
+                        load = self.hand_tracker.get_load_stats()
+                        st.metric("⚙️ 推理档位", load['tier_name'],
+                                  help=None if load.get('average_ms') is None else
+                                  f"平均帧耗时 {load['average_ms']:.1f} ms / 预算 {load['budget_ms']:.1f} ms")
                     with col2:
                         st.metric("👋 检测手部", len(results['hand_data']))
                     with col3:
@@ -1067,6 +902,10 @@ class AirGuitarApp:
                         except Exception:
                             vol_display = self.config['audio'].get('volume', 0.7)
                         st.metric("🔊 音量", f"{vol_display:.2f}")
+                    with col5:
+                        cap_stats = cap.get_stats()
+                        st.metric("⏱️ 帧龄", f"{cap_stats['last_age_ms']:.0f} ms",
+                                  help=f"平均 {cap_stats['mean_age_ms']:.1f} ms | 丢帧 {cap_stats['dropped_frames']}")
 
                 # 更新和弦显示
                 with chord_placeholder.container():
@@ -1090,8 +929,7 @@ class AirGuitarApp:
                             extended_count = features.get('extended_count', 0)
                             st.info(f"**检测状态**: 检测到手部，伸直{extended_count}个手指")
                 # 若有两个或更多手，则此处不再重复显示手部详情（左侧面板已有显示）
-                # 添加小延迟以控制帧率
-                time.sleep(0.03)
+                # 帧率由采集线程决定：read_latest 会阻塞到下一帧到达，无需固定延迟
 
         except Exception as e:
             st.error(f"❌ 发生错误: {str(e)}")
@@ -1100,14 +938,23 @@ class AirGuitarApp:
         finally:
             # 清理资源
             if cap.isOpened():
+                stats = cap.get_stats()
                 cap.release()
-                print("✅ 摄像头已释放")
+                print(f"✅ 摄像头已释放 (采集 {stats['captured_frames']} 帧, 丢弃 {stats['dropped_frames']} 帧, "
+                      f"平均帧龄 {stats['mean_age_ms']:.1f} ms)")
             if hasattr(self, 'hand_tracker'):
                 self.hand_tracker.release()
                 print("✅ 手部追踪器已释放")
             if hasattr(self, 'audio_system'):
-                self.audio_system.stop_all()
-                print("✅ 音频系统已停止")
+                self.audio_system.close()
+                print("✅ 音频系统已关闭")
+            if self.tracer.enabled and self.tracer.frames():
+                print("⏱️ 手势到发声延迟统计:\n" + self.tracer.format_summary())
+                for path in self.tracer.export(self.config.get('tracing')):
+                    print(f"✅ 延迟追踪已导出: {path}")
+            if self.recorder is not None and len(self.recorder):
+                path = self.recorder.save(self.config['hand_tracking']['record_trace'])
+                print(f"✅ 关键点轨迹已保存: {path} ({len(self.recorder)} 帧)")
 
             st.success("✅ 应用已安全停止")
             st.info("🔄 如需重新启动，请刷新页面")
@@ -1132,67 +979,6 @@ class AirGuitarApp:
         c2 = f"hsl({(base_h + 40) % 360} 75% {light2}%)"
         return c1, c2
 
-    def _normalize_hand_type(self, hand: dict) -> str:
-        """从 hand（来自 HandTracker）中提取并规范化手型字符串为 'left' 或 'right' 或 ''"""
-        keys = ['hand_type', 'handness', 'type', 'label']
-        val = ''
-        for k in keys:
-            v = hand.get(k)
-            if isinstance(v, str) and v.strip():
-                val = v.strip().lower()
-                break
-        if 'left' in val or val.startswith('l'):
-            return 'left'
-        if 'right' in val or val.startswith('r'):
-            return 'right'
-        return ''
-
-    def _smooth_finger_states(self, hand_type: str, raw_states: dict) -> dict:
-        """
-        基于最近几帧做多数投票平滑，返回标准顺序的 finger_states 字典。
-        raw_states 期望像 {'thumb': True, 'index': False, ...} 这样的映射（键大小写不敏感）。
-        """
-        if hand_type not in ('left', 'right'):
-            # 无法归类则直接返回原始（但确保键名规范化）
-            normalized = {k.lower(): bool(v) for k, v in (raw_states or {}).items()}
-            # 保持完整键集合
-            for k in ['thumb', 'index', 'middle', 'ring', 'pinky']:
-                normalized.setdefault(k, False)
-            return normalized
-
-        # 规范化 raw_states 键名并补全
-        normalized = {k.lower(): bool(v) for k, v in (raw_states or {}).items()}
-        for k in ['thumb', 'index', 'middle', 'ring', 'pinky']:
-            normalized.setdefault(k, False)
-
-        # push 到历史缓冲并计算多数投票
-        hist = self._finger_history.get(hand_type)
-        if hist is None:
-            hist = deque(maxlen=5)
-            self._finger_history[hand_type] = hist
-        hist.append(normalized.copy())
-
-        # 如果历史为空（首次），直接返回 normalized
-        if not hist:
-            return normalized
-
-        # 多数票（True 出现次数 > len(hist)/2）
-        counts = {k: 0 for k in ['thumb', 'index', 'middle', 'ring', 'pinky']}
-        for frame_states in hist:
-            for k, v in frame_states.items():
-                if v:
-                    counts[k] += 1
-        majority = {}
-        half = len(hist) / 2.0
-        for k in counts:
-            majority[k] = counts[k] > half
-
-        # 额外容错：如果所有手指都被判为 False（完全丢失），退回到最近一帧的 normalized（避免全部抹掉）
-        if not any(majority.values()):
-            majority = normalized
-
-        return majority
-
 
 def main():
     """主函数"""
@@ -5,9 +5,7 @@ import numpy as np
 import time
 import sys
 import os
-import random
 from typing import Dict, Any
-from PIL import Image, ImageDraw, ImageFont
 
 # 删除对 OpenGL 的尝试导入，直接设置为不可用
 HAS_OPENGL = False
@@ -19,6 +17,9 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from hand_tracker1 import HandTracker
 from gesture_analyzer1 import GestureAnalyzer
 from audio_system import AudioSystem
+from particle_engine import ParticleSystem
+from particle_sprites import ParticleRenderer
+from strings_view import StringsRenderer, WaveHistory
 import utils
 
 class AirGuitarApp:
@@ -40,7 +41,8 @@ class AirGuitarApp:
         self.debug_info = ""
         
         # 粒子特效系统
-        self.particles = []
+        self.particles = ParticleSystem(capacity=500)
+        self.particle_renderer = ParticleRenderer()
         self.last_particle_time = time.time()
         
         # 吉他弦数据
@@ -53,6 +55,10 @@ class AirGuitarApp:
             'E_high': {'wave': [], 'color': (200, 150, 255), 'note': 'E4', 'active': False}
         }
         
+        self.strings_renderer = StringsRenderer()
+        self.wave_history = WaveHistory(list(self.strings_data),
+                                        self.config.get('rendering', {}).get('wave_history', 100))
+        
         # 和弦到弦激活的映射
         self.chord_string_mapping = {
             'C_major': ['E_low', 'C', 'E_high'],
@@ -294,113 +300,8 @@ class AirGuitarApp:
             print(f"❌ 组件初始化失败: {e}")
     
     def create_particle(self, x, y, particle_type):
-        """创建粒子特效 - 增强版"""
-        particle_types = {
-            'C_major': {  # 红色气球特效 🎈
-                'color': (255, 50, 50),
-                'size_range': (15, 30),  # 增大尺寸范围
-                'life_range': (40, 80),  # 增加生命周期
-                'speed_x_range': (-3, 3),  # 增加速度范围
-                'speed_y_range': (-4, -2),  # 向上漂浮
-                'type': 'balloon',
-                'count': 8,  # 每次创建的数量
-                'alpha_range': (0.6, 1.0)  # 透明度范围
-            },
-            'G_major': {  # 青色雪花特效 ❄️
-                'color': (100, 255, 255),
-                'size_range': (8, 20),
-                'life_range': (50, 100),
-                'speed_x_range': (-2, 2),
-                'speed_y_range': (1.5, 4),
-                'type': 'snow',
-                'count': 10,
-                'alpha_range': (0.7, 1.0)
-            },
-            'D_major': {  # 蓝色泡泡特效 🫧
-                'color': (100, 150, 255),
-                'size_range': (12, 25),
-                'life_range': (60, 120),
-                'speed_x_range': (-2.5, 2.5),
-                'speed_y_range': (-1, 1),
-                'type': 'bubble',
-                'count': 12,
-                'alpha_range': (0.5, 0.9)
-            },
-            'A_minor': {  # 绿色闪烁特效 ✨
-                'color': (100, 255, 100),
-                'size_range': (5, 15),
-                'life_range': (30, 60),
-                'speed_x_range': (-4, 4),
-                'speed_y_range': (-4, 4),
-                'type': 'sparkle',
-                'count': 15,
-                'alpha_range': (0.8, 1.0)
-            },
-            'E_minor': {  # 黄色萤火虫特效 🪰
-                'color': (255, 255, 100),
-                'size_range': (6, 12),
-                'life_range': (80, 160),
-                'speed_x_range': (-1.5, 1.5),
-                'speed_y_range': (-1, 1),
-                'type': 'firefly',
-                'count': 10,
-                'alpha_range': (0.6, 1.0)
-            },
-            'F_major': {  # 紫色魔法特效 🔮
-                'color': (200, 100, 255),
-                'size_range': (15, 35),
-                'life_range': (90, 180),
-                'speed_x_range': (-1, 1),
-                'speed_y_range': (-2.5, -1),
-                'type': 'magic',
-                'count': 8,
-                'alpha_range': (0.7, 1.0)
-            }
-        }
-        
-        if particle_type in particle_types:
-            config = particle_types[particle_type]
-            
-            # 创建多个粒子
-            particles_to_create = config['count']
-            for _ in range(particles_to_create):
-                # 在周围随机位置创建粒子
-                offset_x = random.randint(-60, 60)
-                offset_y = random.randint(-60, 60)
-                particle_x = x + offset_x
-                particle_y = y + offset_y
-                
-                # 生成随机属性
-                size = random.randint(config['size_range'][0], config['size_range'][1])
-                life = random.randint(config['life_range'][0], config['life_range'][1])
-                speed_x = random.uniform(config['speed_x_range'][0], config['speed_x_range'][1])
-                speed_y = random.uniform(config['speed_y_range'][0], config['speed_y_range'][1])
-                alpha = random.uniform(config['alpha_range'][0], config['alpha_range'][1])
-                
-                # 添加一些颜色变化
-                color_variation = random.randint(-30, 30)
-                color = (
-                    max(0, min(255, config['color'][0] + color_variation)),
-                    max(0, min(255, config['color'][1] + color_variation)),
-                    max(0, min(255, config['color'][2] + color_variation))
-                )
-                
-                self.particles.append({
-                    'x': particle_x,
-                    'y': particle_y,
-                    'color': color,
-                    'size': size,
-                    'life': life,
-                    'max_life': life,
-                    'speed_x': speed_x,
-                    'speed_y': speed_y,
-                    'type': config['type'],
-                    'particle_type': particle_type,
-                    'alpha': alpha,
-                    'rotation': random.uniform(0, 360),  # 旋转角度
-                    'rotation_speed': random.uniform(-5, 5),  # 旋转速度
-                    'glow_intensity': random.uniform(0.5, 1.0)  # 发光强度
-                })
+        """创建粒子特效 - 增强版（参数见 particle_engine.PARTICLE_PRESETS）"""
+        self.particles.spawn(x, y, particle_type)
     
     def update_particles(self):
         """更新粒子特效 - 增强版"""
@@ -419,153 +320,12 @@ class AirGuitarApp:
             
             self.last_particle_time = current_time
         
-        # 更新现有粒子
-        for particle in self.particles[:]:
-            particle['x'] += particle['speed_x']
-            particle['y'] += particle['speed_y']
-            particle['life'] -= 1
-            
-            # 更新旋转
-            particle['rotation'] += particle['rotation_speed']
-            
-            # 根据粒子类型添加特殊效果
-            if particle['type'] == 'bubble':
-                particle['size'] += 0.15  # 泡泡更快变大
-                particle['speed_y'] -= 0.02  # 泡泡向上加速
-            elif particle['type'] == 'sparkle':
-                particle['speed_x'] *= 0.97  # 闪烁粒子更慢减速
-                particle['speed_y'] *= 0.97
-                # 闪烁效果
-                particle['alpha'] = particle['alpha'] * (0.7 + 0.3 * np.sin(current_time * 15))
-            elif particle['type'] == 'firefly':
-                # 萤火虫更明显的闪烁效果
-                particle['size'] = particle['size'] * (0.6 + 0.5 * np.sin(current_time * 12))
-                # 随机方向变化
-                if random.random() < 0.05:
-                    particle['speed_x'] += random.uniform(-0.3, 0.3)
-                    particle['speed_y'] += random.uniform(-0.3, 0.3)
-            elif particle['type'] == 'magic':
-                # 魔法粒子旋转和缩放
-                particle['size'] = particle['size'] * (0.9 + 0.2 * np.sin(current_time * 8))
-            
-            # 限制粒子数量，防止过多
-            if len(self.particles) > 500:  # 最多500个粒子
-                # 移除最老的粒子
-                if particle['life'] < particle['max_life'] * 0.3:
-                    self.particles.remove(particle)
-                    continue
-            
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
+        # 向量化更新所有粒子（最多 500 个，满时回收老粒子）
+        self.particles.update(current_time)
     
     def draw_particles(self, frame):
-        """在帧上绘制粒子特效 - 增强版"""
-        frame_height, frame_width = frame.shape[:2]
-        
-        for particle in self.particles:
-            if particle['life'] > 0:
-                x, y = int(particle['x']), int(particle['y'])
-                size = int(particle['size'])
-                color = particle['color']
-                alpha = particle['life'] / particle['max_life']
-                alpha *= particle['alpha']  # 应用随机alpha
-                
-                # 确保粒子在画面内
-                if x < 0 or x >= frame_width or y < 0 or y >= frame_height:
-                    continue
-                
-                # 根据粒子类型绘制不同形状
-                if particle['type'] == 'balloon':
-                    # 绘制圆形气球，带阴影效果
-                    radius = max(1, int(size * alpha))
-                    glow_radius = int(radius * 1.5)
-                    
-                    # 绘制发光效果
-                    for r in range(glow_radius, 0, -1):
-                        alpha_layer = alpha * (r / glow_radius) * 0.2
-                        color_with_alpha = tuple(int(c * alpha_layer) for c in color)
-                        cv2.circle(frame, (x, y), r, color_with_alpha, -1)
-                    
-                    # 绘制主气球
-                    cv2.circle(frame, (x, y), radius, color, -1)
-                    # 气球线
-                    line_length = size // 2
-                    cv2.line(frame, (x, y+radius), (x, y+radius+line_length), color, 2)
-                    
-                elif particle['type'] == 'snow':
-                    # 绘制雪花（多个交叉的线）
-                    angle = particle['rotation']
-                    for i in range(6):
-                        rad = np.radians(angle + i * 60)
-                        x1 = int(x + np.cos(rad) * size)
-                        y1 = int(y + np.sin(rad) * size)
-                        cv2.line(frame, (x, y), (x1, y1), color, 2)
-                    
-                    # 中心点
-                    cv2.circle(frame, (x, y), 2, color, -1)
-                    
-                elif particle['type'] == 'bubble':
-                    # 绘制泡泡（圆形加高光）
-                    cv2.circle(frame, (x, y), size, color, 2)
-                    # 高光
-                    highlight_x = x - size//3
-                    highlight_y = y - size//3
-                    highlight_size = size//4
-                    cv2.circle(frame, (highlight_x, highlight_y), highlight_size, (255, 255, 255), -1)
-                    
-                elif particle['type'] == 'sparkle':
-                    # 绘制闪烁星星
-                    angle = particle['rotation']
-                    for i in range(4):
-                        rad = np.radians(angle + i * 90)
-                        x1 = int(x + np.cos(rad) * size)
-                        y1 = int(y + np.sin(rad) * size)
-                        cv2.line(frame, (x, y), (x1, y1), color, 2)
-                    
-                    # 绘制对角线
-                    for i in range(4):
-                        rad = np.radians(angle + i * 90 + 45)
-                        x1 = int(x + np.cos(rad) * size * 0.7)
-                        y1 = int(y + np.sin(rad) * size * 0.7)
-                        cv2.line(frame, (x, y), (x1, y1), color, 1)
-                    
-                elif particle['type'] == 'firefly':
-                    # 绘制萤火虫（发光点）
-                    glow_size = int(size * particle['glow_intensity'] * 2.5)
-                    for r in range(glow_size, 0, -1):
-                        alpha_layer = alpha * (r / glow_size) * 0.4
-                        color_with_alpha = tuple(int(c * alpha_layer) for c in color)
-                        cv2.circle(frame, (x, y), r, color_with_alpha, -1)
-                    
-                    # 中心亮点
-                    cv2.circle(frame, (x, y), size, color, -1)
-                    
-                elif particle['type'] == 'magic':
-                    # 绘制魔法星形
-                    angle = particle['rotation']
-                    points = []
-                    for i in range(5):
-                        outer_angle = np.radians(angle + i * 72)
-                        outer_x = int(x + np.cos(outer_angle) * size)
-                        outer_y = int(y + np.sin(outer_angle) * size)
-                        points.append((outer_x, outer_y))
-                        
-                        inner_angle = np.radians(angle + i * 72 + 36)
-                        inner_x = int(x + np.cos(inner_angle) * (size/2))
-                        inner_y = int(y + np.sin(inner_angle) * (size/2))
-                        points.append((inner_x, inner_y))
-                    
-                    # 绘制五角星
-                    for i in range(len(points)):
-                        cv2.line(frame, points[i], points[(i+1)%len(points)], color, 3)
-                    
-                    # 中心光晕
-                    for r in range(size*2, 0, -2):
-                        alpha_layer = alpha * (r / (size*2)) * 0.3
-                        color_with_alpha = tuple(int(c * alpha_layer) for c in color)
-                        cv2.circle(frame, (x, y), r, color_with_alpha, 1)
-        
-        return frame
+        """在帧上合成粒子特效（预渲染精灵 + 逐粒子 alpha 混合，见 particle_sprites.ParticleRenderer）"""
+        return self.particle_renderer.draw(frame, self.particles)
     
     def update_strings_wave(self, chord):
         """更新吉他弦波形数据"""
@@ -580,188 +340,15 @@ class AirGuitarApp:
                 if string_name in self.strings_data:
                     self.strings_data[string_name]['active'] = True
         
-        # 为所有弦更新波形数据
-        current_time = time.time()
-        for string_name, string_data in self.strings_data.items():
-            wave = string_data['wave']
-            
-            # 限制波形长度
-            if len(wave) > 100:
-                wave = wave[-100:]
-            
-            # 生成新的波形点
-            if string_data['active']:
-                # 激活的弦有更大的振幅
-                amplitude = 25 + 15 * np.sin(current_time * 6 + hash(string_name) % 10)
-                frequency = 2.5 + 1.5 * np.sin(current_time * 2.5)
-            else:
-                # 未激活的弦有较小的背景波动
-                amplitude = 5 + 2 * np.sin(current_time * 2 + hash(string_name) % 10)
-                frequency = 0.5
-            
-            new_value = amplitude * np.sin(current_time * frequency)
-            wave.append(new_value)
-            
-            # 保持波形数据
-            string_data['wave'] = wave[-100:]  # 只保留最近100个点
+        # 为所有弦追加一个波形点（环形缓冲，一次向量化更新），'wave' 指向按时间排序的视图
+        active = [string_data['active'] for string_data in self.strings_data.values()]
+        waves = self.wave_history.push(time.time(), active)
+        for string_data, wave in zip(self.strings_data.values(), waves):
+            string_data['wave'] = wave
     
     def draw_guitar_strings(self, frame_height=400, frame_width=300):
-        """绘制吉他弦曲线谱 - 修复中文显示问题"""
-        # 使用PIL创建图像以支持中文显示
-        img = Image.new('RGB', (frame_width, frame_height), color=(20, 20, 30))
-        draw = ImageDraw.Draw(img)
-        
-        try:
-            # 尝试加载中文字体
-            font_path = None
-            # 常见中文字体路径
-            possible_fonts = [
-                '/System/Library/Fonts/PingFang.ttc',  # macOS
-                '/usr/share/fonts/truetype/wqy/wqy-microhei.ttc',  # Linux
-                'C:/Windows/Fonts/msyh.ttc',  # Windows
-                'C:/Windows/Fonts/simhei.ttf',  # Windows
-                './fonts/wqy-microhei.ttc'  # 当前目录
-            ]
-            
-            for path in possible_fonts:
-                if os.path.exists(path):
-                    font_path = path
-                    break
-            
-            if font_path:
-                font = ImageFont.truetype(font_path, 14)
-                small_font = ImageFont.truetype(font_path, 12)
-                title_font = ImageFont.truetype(font_path, 18)
-            else:
-                # 如果找不到中文字体，使用默认字体（显示英文）
-                font = ImageFont.load_default()
-                small_font = ImageFont.load_default()
-                title_font = ImageFont.load_default()
-                print("⚠️ 未找到中文字体，将使用默认字体")
-        except Exception as e:
-            print(f"⚠️ 字体加载失败: {e}")
-            font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
-            title_font = ImageFont.load_default()
-        
-        # 弦的数量和间距
-        num_strings = 6
-        margin_top = 50
-        margin_bottom = 50
-        available_height = frame_height - margin_top - margin_bottom
-        string_spacing = available_height / (num_strings - 1)
-        
-        # 弦名映射
-        string_names = {
-            'E_low': 'E低音弦',
-            'A': 'A弦',
-            'D': 'D弦', 
-            'G': 'G弦',
-            'B': 'B弦',
-            'E_high': 'E高音弦'
-        }
-        
-        # 绘制每根弦
-        string_keys = list(self.strings_data.keys())
-        for i, string_key in enumerate(string_keys):
-            y_pos = int(margin_top + i * string_spacing)
-            string_data = self.strings_data[string_key]
-            color = string_data['color']
-            
-            # 绘制弦名（左侧）
-            string_name = string_names.get(string_key, string_key)
-            
-            # 绘制文本背景
-            text_bbox = draw.textbbox((0, 0), string_name, font=font)
-            text_width = text_bbox[2] - text_bbox[0]
-            text_height = text_bbox[3] - text_bbox[1]
-            
-            # 绘制背景矩形
-            draw.rectangle(
-                [(5, y_pos - text_height//2), 
-                 (5 + text_width + 10, y_pos + text_height//2)],
-                fill=(40, 40, 60)
-            )
-            
-            # 绘制弦名
-            draw.text(
-                (10, y_pos - text_height//2),
-                string_name,
-                font=font,
-                fill=(255, 255, 255)
-            )
-            
-            # 绘制基准线（弦的位置）
-            line_thickness = 2 if string_data['active'] else 1
-            line_color = color if string_data['active'] else (color[0]//3, color[1]//3, color[2]//3)
-            draw.line(
-                [(80, y_pos), (frame_width - 20, y_pos)],
-                fill=line_color,
-                width=line_thickness
-            )
-            
-            # 绘制波形
-            wave = string_data['wave']
-            if len(wave) > 1:
-                points = []
-                for j, value in enumerate(wave):
-                    x = frame_width - 20 - (len(wave) - j) * 2
-                    if x < 80:
-                        continue
-                    y = y_pos + int(value * 0.5)  # 缩放波形
-                    points.append((x, y))
-                
-                if len(points) > 1:
-                    # 绘制波形线
-                    for j in range(len(points) - 1):
-                        draw.line(
-                            [points[j], points[j+1]],
-                            fill=color,
-                            width=1
-                        )
-                    
-                    # 绘制波形点（仅激活的弦）
-                    if string_data['active']:
-                        for point in points[-10:]:  # 只绘制最近的点
-                            draw.ellipse(
-                                [point[0]-2, point[1]-2, point[0]+2, point[1]+2],
-                                fill=color,
-                                outline=color
-                            )
-            
-            # 绘制弦头（右侧）
-            draw.ellipse(
-                [(frame_width - 25, y_pos - 5), (frame_width - 15, y_pos + 5)],
-                fill=color,
-                outline=color
-            )
-        
-        # 添加标题
-        title = "吉他弦曲线谱"
-        title_bbox = draw.textbbox((0, 0), title, font=title_font)
-        title_width = title_bbox[2] - title_bbox[0]
-        draw.text(
-            ((frame_width - title_width) // 2, 20),
-            title,
-            font=title_font,
-            fill=(255, 255, 255)
-        )
-        
-        # 添加图例说明
-        legend_text = "● 激活 | ○ 静音"
-        legend_bbox = draw.textbbox((0, 0), legend_text, font=small_font)
-        legend_width = legend_bbox[2] - legend_bbox[0]
-        draw.text(
-            ((frame_width - legend_width) // 2, frame_height - 30),
-            legend_text,
-            font=small_font,
-            fill=(200, 200, 200)
-        )
-        
-        # 转换回numpy数组
-        strings_canvas = np.array(img)
-        
-        return strings_canvas
+        """绘制吉他弦曲线谱（静态图层与字体已缓存，见 strings_view.StringsRenderer），返回 RGB 数组"""
+        return self.strings_renderer.render(self.strings_data, frame_width, frame_height)
     
     def get_unique_key(self, base_name: str) -> str:
         """生成唯一的元素key"""
@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def job_seed(name: str) -> int:
+    """由任务名得到稳定的随机种子（crc32，跨进程、跨运行一致）"""
+    return zlib.crc32(name.encode('utf-8'))
+
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """None / 0 表示使用全部 CPU 核心，1 表示在当前进程内顺序执行"""
+    if not workers or workers < 1:
+        return os.cpu_count() or 1
+    return int(workers)
+
+
+def parse_workers_arg(argv: Optional[Sequence[str]] = None) -> Optional[int]:
+    """从命令行读取 --workers N（未指定时返回 None）"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    for i, arg in enumerate(argv):
+        if arg.startswith('--workers='):
+            return int(arg.split('=', 1)[1])
+        if arg == '--workers' and i + 1 < len(argv):
+            return int(argv[i + 1])
+    return None
+
+
+def _timed_call(fn: Callable[..., Any], name: str, args: Tuple) -> Tuple[Any, float]:
+    """在工作进程中执行一个任务：先按任务名重置全局随机种子，再计时调用"""
+    np.random.seed(job_seed(name))
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def run_jobs(fn: Callable[..., Any], jobs: Sequence[Tuple[str, Tuple]],
+             workers: Optional[int] = None) -> List[Any]:
+    """并行执行一组 (任务名, 参数元组) 任务，按提交顺序返回结果
+
+    fn 必须是模块级函数（可被 pickle）。每个任务开始前都用 job_seed(任务名) 设置 np.random，
+    因此顺序模式与任意进程数的并行模式生成的结果完全一致。
+    完成一个任务打印一行进度和该任务耗时，结束时打印总耗时与累计任务耗时。
+    """
+    workers = min(resolve_workers(workers), max(1, len(jobs)))
+    total = len(jobs)
+    results: List[Any] = [None] * total
+    busy = 0.0
+    t0 = time.perf_counter()
+
+    def report(done: int, name: str, elapsed: float):
+        print(f"[{done}/{total}] {name}  {elapsed * 1000:.0f} ms")
+
+    if workers == 1:
+        for i, (name, args) in enumerate(jobs):
+            results[i], elapsed = _timed_call(fn, name, args)
+            busy += elapsed
+            report(i + 1, name, elapsed)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_timed_call, fn, name, args): (i, name)
+                       for i, (name, args) in enumerate(jobs)}
+            for done, future in enumerate(as_completed(futures), start=1):
+                i, name = futures[future]
+                results[i], elapsed = future.result()
+                busy += elapsed
+                report(done, name, elapsed)
+
+    wall = time.perf_counter() - t0
+    print(f"完成 {total} 个任务：进程数 {workers}，总耗时 {wall:.2f}s，累计任务耗时 {busy:.2f}s")
+    return results
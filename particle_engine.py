@@ -0,0 +1,171 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# 粒子类型，数组中以下标存储
+KIND_NAMES = ('balloon', 'snow', 'bubble', 'sparkle', 'firefly', 'magic')
+KIND_IDS = {name: i for i, name in enumerate(KIND_NAMES)}
+BALLOON, SNOW, BUBBLE, SPARKLE, FIREFLY, MAGIC = range(len(KIND_NAMES))
+
+# 和弦 -> 粒子参数（范围均为闭区间，count 为每次生成的数量）
+PARTICLE_PRESETS: Dict[str, Dict] = {
+    'C_major': {  # 红色气球特效 🎈
+        'color': (255, 50, 50), 'size_range': (15, 30), 'life_range': (40, 80),
+        'speed_x_range': (-3, 3), 'speed_y_range': (-4, -2),   # 向上漂浮
+        'type': 'balloon', 'count': 8, 'alpha_range': (0.6, 1.0),
+    },
+    'G_major': {  # 青色雪花特效 ❄️
+        'color': (100, 255, 255), 'size_range': (8, 20), 'life_range': (50, 100),
+        'speed_x_range': (-2, 2), 'speed_y_range': (1.5, 4),
+        'type': 'snow', 'count': 10, 'alpha_range': (0.7, 1.0),
+    },
+    'D_major': {  # 蓝色泡泡特效 🫧
+        'color': (100, 150, 255), 'size_range': (12, 25), 'life_range': (60, 120),
+        'speed_x_range': (-2.5, 2.5), 'speed_y_range': (-1, 1),
+        'type': 'bubble', 'count': 12, 'alpha_range': (0.5, 0.9),
+    },
+    'A_minor': {  # 绿色闪烁特效 ✨
+        'color': (100, 255, 100), 'size_range': (5, 15), 'life_range': (30, 60),
+        'speed_x_range': (-4, 4), 'speed_y_range': (-4, 4),
+        'type': 'sparkle', 'count': 15, 'alpha_range': (0.8, 1.0),
+    },
+    'E_minor': {  # 黄色萤火虫特效 🪰
+        'color': (255, 255, 100), 'size_range': (6, 12), 'life_range': (80, 160),
+        'speed_x_range': (-1.5, 1.5), 'speed_y_range': (-1, 1),
+        'type': 'firefly', 'count': 10, 'alpha_range': (0.6, 1.0),
+    },
+    'F_major': {  # 紫色魔法特效 🔮
+        'color': (200, 100, 255), 'size_range': (15, 35), 'life_range': (90, 180),
+        'speed_x_range': (-1, 1), 'speed_y_range': (-2.5, -1),
+        'type': 'magic', 'count': 8, 'alpha_range': (0.7, 1.0),
+    },
+}
+
+# 每个粒子的字段：名称 -> (dtype, 每粒子分量数)
+_FIELDS: Dict[str, Tuple[type, int]] = {
+    'x': (np.float32, 1), 'y': (np.float32, 1),
+    'vx': (np.float32, 1), 'vy': (np.float32, 1),
+    'life': (np.int32, 1), 'max_life': (np.int32, 1),
+    'size': (np.float32, 1), 'alpha': (np.float32, 1), 'base_alpha': (np.float32, 1),
+    'rotation': (np.float32, 1), 'rotation_speed': (np.float32, 1),
+    'glow': (np.float32, 1), 'kind': (np.int8, 1),
+    'color': (np.uint8, 3),
+}
+
+
+class ParticleSystem:
+    """结构数组（SoA）粒子系统
+
+    位置、速度、生命、大小、透明度、旋转、类型与颜色各存一个预分配的 NumPy 数组，存活粒子始终紧凑地
+    位于前 n 个槽位。update() 对所有粒子做一次向量化更新（各类型的规则用掩码施加），
+    死亡粒子用尾部存活粒子交换填补（swap-remove），每个空位 O(1)。
+    """
+
+    def __init__(self, capacity: int = 500, seed: Optional[int] = None):
+        self.capacity = int(capacity)
+        self.n = 0
+        self.rng = np.random.default_rng(seed)
+        for name, (dtype, width) in _FIELDS.items():
+            shape = (self.capacity,) if width == 1 else (self.capacity, width)
+            setattr(self, '_' + name, np.zeros(shape, dtype=dtype))
+
+    # 只读视图：前 n 个存活粒子
+    def __getattr__(self, name):
+        if name in _FIELDS:
+            return self.__dict__['_' + name][:self.n]
+        raise AttributeError(name)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def clear(self):
+        self.n = 0
+
+    # ---------------------- 生成 ----------------------
+    def spawn(self, x: float, y: float, chord: str, count: Optional[int] = None) -> int:
+        """在 (x, y) 周围 ±60 像素内按和弦预设生成一批粒子，返回实际生成数
+
+        容量不足时先回收已过 70% 生命的老粒子，仍不足则只生成剩余容量的数量。
+        """
+        preset = PARTICLE_PRESETS.get(chord)
+        if preset is None:
+            return 0
+        count = preset['count'] if count is None else int(count)
+        if self.n + count > self.capacity:
+            old = np.flatnonzero(self._life[:self.n] < self._max_life[:self.n] * 0.3)
+            self._remove(old)
+        count = min(count, self.capacity - self.n)
+        if count <= 0:
+            return 0
+
+        rng = self.rng
+        s = slice(self.n, self.n + count)
+        self._x[s] = x + rng.integers(-60, 61, count)
+        self._y[s] = y + rng.integers(-60, 61, count)
+        self._size[s] = rng.integers(preset['size_range'][0], preset['size_range'][1] + 1, count)
+        life = rng.integers(preset['life_range'][0], preset['life_range'][1] + 1, count)
+        self._life[s] = life
+        self._max_life[s] = life
+        self._vx[s] = rng.uniform(*preset['speed_x_range'], count)
+        self._vy[s] = rng.uniform(*preset['speed_y_range'], count)
+        self._alpha[s] = self._base_alpha[s] = rng.uniform(*preset['alpha_range'], count)
+        self._rotation[s] = rng.uniform(0, 360, count)
+        self._rotation_speed[s] = rng.uniform(-5, 5, count)
+        self._glow[s] = rng.uniform(0.5, 1.0, count)
+        self._kind[s] = KIND_IDS[preset['type']]
+        # 颜色整体随机偏移 ±30
+        variation = rng.integers(-30, 31, (count, 1))
+        self._color[s] = np.clip(np.asarray(preset['color']) + variation, 0, 255)
+        self.n += count
+        return count
+
+    # ---------------------- 更新 ----------------------
+    def update(self, now: float):
+        """推进一帧：运动、旋转、生命递减与各类型的特殊规则，然后移除死亡粒子"""
+        n = self.n
+        if n == 0:
+            return
+        x, y, vx, vy = self._x[:n], self._y[:n], self._vx[:n], self._vy[:n]
+        size, alpha, kind = self._size[:n], self._alpha[:n], self._kind[:n]
+
+        x += vx
+        y += vy
+        self._life[:n] -= 1
+        self._rotation[:n] += self._rotation_speed[:n]
+
+        # 泡泡：变大并向上加速
+        m = kind == BUBBLE
+        size[m] += 0.15
+        vy[m] -= 0.02
+        # 闪烁：减速并在初始透明度附近闪烁（不累乘，否则几帧后就衰减到看不见）
+        m = kind == SPARKLE
+        vx[m] *= 0.97
+        vy[m] *= 0.97
+        alpha[m] = self._base_alpha[:n][m] * (0.7 + 0.3 * np.sin(now * 15))
+        # 萤火虫：大小闪烁，偶尔随机改变方向
+        m = kind == FIREFLY
+        size[m] *= 0.6 + 0.5 * np.sin(now * 12)
+        turn = np.flatnonzero(m & (self.rng.random(n) < 0.05))
+        if turn.size:
+            vx[turn] += self.rng.uniform(-0.3, 0.3, turn.size)
+            vy[turn] += self.rng.uniform(-0.3, 0.3, turn.size)
+        # 魔法：缩放脉动
+        m = kind == MAGIC
+        size[m] *= 0.9 + 0.2 * np.sin(now * 8)
+
+        self._remove(np.flatnonzero(self._life[:n] <= 0))
+
+    def _remove(self, idx: np.ndarray):
+        """swap-remove：idx 为升序、互不相同的槽位，用尾部存活粒子填补落在新长度以内的空位"""
+        k = len(idx)
+        if k == 0:
+            return
+        new_n = self.n - k
+        holes = idx[idx < new_n]
+        tail = np.arange(new_n, self.n)
+        tail = tail[~np.isin(tail, idx, assume_unique=True)]
+        if holes.size:
+            for name in _FIELDS:
+                arr = self.__dict__['_' + name]
+                arr[holes] = arr[tail]
+        self.n = new_n
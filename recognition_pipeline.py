@@ -0,0 +1,301 @@
+import time
+from collections import deque
+from typing import Any, Dict
+
+import numpy as np
+
+from hand_frame import HandFrame
+from latency_tracer import get_tracer
+from log_utils import get_logger
+
+logger = get_logger("app")
+
+
+class RecognitionPipeline:
+    """逐帧识别流水线：手部追踪 → 手势分析 → 手指去抖 → 左右手去重 → 弦/品映射 → 触发音频
+
+    不依赖 Streamlit 与摄像头：AirGuitarApp 在此之上提供界面，headless_runner 用它离线回放视频或图片序列。
+    需要 hand_tracker / gesture_analyzer / audio_system 三个组件，audio_system 可替换为任何
+    提供 play_string_fret / play_effect / stop_all / get_volume / samples 的对象。
+    recorder 设为 landmark_trace.TraceRecorder 时，每帧手部追踪的输出会被录制下来供离线回放。
+    """
+
+    recorder = None
+
+    def __init__(self, config: Dict[str, Any], hand_tracker, gesture_analyzer, audio_system):
+        self.config = config
+        self.hand_tracker = hand_tracker
+        self.gesture_analyzer = gesture_analyzer
+        self.audio_system = audio_system
+        self.tracer = get_tracer()
+        self.reset_pipeline_state()
+
+    def reset_pipeline_state(self):
+        """重置跨帧状态（上一帧手部、当前弦/品、手指历史等）"""
+        self.is_playing = False
+        self.recognition_enabled = True
+        self.current_chord = "none"
+        self.prev_hand_data = None
+        self.debug_info = ""
+        self.current_string = None
+        self.current_fret = None
+        self.last_played_mapping = (None, None)
+
+        # 历史平滑缓存：每只手保留最近 N 帧的 finger_states 用于去抖
+        self._finger_history = {
+            'left': deque(maxlen=5),
+            'right': deque(maxlen=5)
+        }
+
+    def process_frame(self, frame: np.ndarray) -> Dict[str, Any]:
+        """处理单帧图像（增加手型规范化、帧级手指去抖与左右手去重）"""
+        tracer = self.tracer
+        t_start = time.perf_counter()
+        # 手部追踪
+        with tracer.span('hand_tracking'):
+            processed_frame, hand_data = self.hand_tracker.process_frame(frame)
+        if self.recorder is not None:
+            self.recorder.add_frame(hand_data, frame.shape)
+
+        analyzed_data = []
+        current_chord = "none"
+
+        for hand in hand_data:
+            # 确保手型字段规范化为 'left' / 'right'
+            hand_type_norm = self._normalize_hand_type(hand)
+            try:
+                with tracer.span('gesture_analysis'):
+                    analysis = self.gesture_analyzer.analyze_hand_position(hand, frame.shape)
+            except Exception:
+                analysis = {}
+            # 手势（张开/握拳）
+            hand_gesture = self.hand_tracker.get_hand_gesture(hand)
+            analysis['hand_gesture'] = hand_gesture
+
+            # 标注并统一 hand_type 字段（分析结果中）
+            analysis['hand_type'] = hand_type_norm
+            # 跳帧推理时区分实测与外推的结果
+            analysis['measured'] = hand.get('measured', True)
+
+            # 获取并平滑 finger_states（若有），并更新 extended_count
+            features = analysis.get('hand_features', {}) or {}
+            raw_states = features.get('finger_states', {}) or {}
+            with tracer.span('smoothing'):
+                smoothed = self._smooth_finger_states(hand_type_norm, raw_states)
+            features['finger_states'] = smoothed
+            features['extended_count'] = sum(1 for v in smoothed.values() if v)
+            features['extended_count_no_thumb'] = features.get('extended_count_no_thumb', features['extended_count'] - (1 if smoothed.get('thumb') else 0))
+            analysis['hand_features'] = features
+
+            # 额外映射：根据左右手确定弦或品，并记录详细调试信息
+            try:
+                if hand_type_norm == 'left':
+                    s = self.gesture_analyzer.map_left_hand_to_string(analysis.get('hand_features', {}))
+                    analysis['string'] = s
+                    logger.debug("左手检测 -> string=%s, features=%s", s, analysis.get('hand_features', {}))
+                elif hand_type_norm == 'right':
+                    f = self.gesture_analyzer.determine_fret_from_right_hand(analysis.get('hand_features', {}), hand)
+                    analysis['fret'] = f
+                    logger.debug("RIGHT_MAP: fret=%s extended_count=%s features=%s", f,
+                                 analysis.get('hand_features', {}).get('extended_count'), analysis.get('hand_features', {}))
+                else:
+                    logger.debug("未知手型字段，原始手信息: %r", hand)
+            except Exception as e:
+                logger.debug("映射错误: %s", e)
+
+            # 保证 detected 字段存在
+            if 'detected' not in analysis:
+                analysis['detected'] = bool(analysis.get('hand_features'))
+
+            analyzed_data.append(analysis)
+
+            # 当识别被启用时进行和弦识别并更新调试信息（保留原有逻辑）
+            if self.recognition_enabled and analysis.get('detected'):
+                s = analysis.get('string', None)
+                f = analysis.get('fret', None)
+                extended_count = analysis.get('hand_features', {}).get('extended_count', 0)
+                if s is not None or f is not None:
+                    s_disp = s if s is not None else '-'
+                    f_disp = f if f is not None else '-'
+                    self.debug_info = f"映射检测: 弦 {s_disp} | 品 {f_disp} | 伸直手指: {extended_count}个"
+                else:
+                    if analysis.get('gesture', 'unknown') != 'unknown':
+                        self.debug_info = f"(旧)识别成功: {analysis.get('gesture')} | 伸直手指: {extended_count}个"
+            else:
+                if analysis.get('detected') and hand_gesture == 'fist':
+                    if getattr(self, 'is_playing', False):
+                        try:
+                            self.audio_system.stop_all()
+                        except Exception:
+                            pass
+                        self.is_playing = False
+                        self.debug_info = "手势: 握拳 - 停止播放，和弦识别已禁用"
+                    else:
+                        self.debug_info = "手势: 握拳 - 和弦识别已禁用"
+
+        # 去重：同一侧可能出现多条记录（来自 Tracker 抖动），保留伸直手指数更多的一条
+        deduped = {}
+        for a in analyzed_data:
+            ht = (a.get('hand_type') or '').lower()
+            if not ht:
+                continue
+            cur_count = a.get('hand_features', {}).get('extended_count', 0)
+            if ht not in deduped or cur_count > deduped[ht].get('hand_features', {}).get('extended_count', 0):
+                deduped[ht] = a
+        # 保留顺序：left then right if存在
+        final_list = []
+        if 'left' in deduped:
+            final_list.append(deduped['left'])
+        if 'right' in deduped:
+            final_list.append(deduped['right'])
+
+        analyzed_data = final_list
+
+        # 以下逻辑保持：更新 prev_hand_data、current_string/current_fret、扫弦触发等
+        try:
+            if self.prev_hand_data and analyzed_data:
+                prev_map = {h.get('hand_type', '').lower(): h for h in self.prev_hand_data}
+                cur_map = {h.get('hand_type', '').lower(): h for h in analyzed_data}
+                target = None
+                if 'right' in prev_map and 'right' in cur_map:
+                    target = ('right', prev_map['right'], cur_map['right'])
+                elif 'left' in prev_map and 'left' in cur_map:
+                    target = ('left', prev_map['left'], cur_map['left'])
+                if target is not None:
+                    _, prev_h, cur_h = target
+                    strum_direction = self.gesture_analyzer.calculate_strumming_direction(prev_h, cur_h)
+                    if strum_direction != "none":
+                        self.on_strum_detected(strum_direction)
+        except Exception as e:
+            logger.debug("strum detection error: %s", e)
+
+        self.prev_hand_data = analyzed_data
+        self.current_chord = current_chord
+
+        # 更新当前弦/品（仅在检测到新映射时更新）
+        with tracer.span('mapping'):
+            for h in analyzed_data:
+                htype = str(h.get('hand_type', '')).lower()
+                if htype.startswith('l'):
+                    if 'string' in h:
+                        self.current_string = h['string']
+                elif htype.startswith('r'):
+                    if 'fret' in h:
+                        self.current_fret = h['fret']
+                    else:
+                        self.current_fret = 0
+
+            found_right = any(str(h.get('hand_type', '')).lower().startswith('r') for h in analyzed_data)
+            if not found_right:
+                self.current_fret = 0
+            found_left = any(str(h.get('hand_type', '')).lower().startswith('l') for h in analyzed_data)
+            if not found_left:
+                self.current_string = 0
+
+        # 变化时播放一次预览
+        try:
+            mapping = (self.current_string, self.current_fret)
+            if mapping != self.last_played_mapping and mapping[0] and mapping[1] is not None:
+                if mapping[0] != 0 and mapping[1] >= 0:
+                    try:
+                        self.audio_system.play_string_fret(mapping[0], mapping[1], volume=self.audio_system.get_volume())
+                    except Exception:
+                        pass
+                self.last_played_mapping = mapping
+        except Exception:
+            pass
+
+        # 把本帧处理耗时交给追踪器的负载调节（未开启时忽略）
+        report_frame_time = getattr(self.hand_tracker, 'report_frame_time', None)
+        if report_frame_time is not None:
+            report_frame_time(time.perf_counter() - t_start)
+
+        return {
+            'processed_frame': processed_frame,
+            'hand_data': analyzed_data,
+            'current_chord': current_chord
+        }
+
+    def on_strum_detected(self, direction: str):
+        """处理扫弦检测"""
+        logger.info("🎸 检测到扫弦: %s", direction)
+        self.audio_system.play_effect("pick_noise", 0.3)
+        # 若同时有当前弦与品的信息，则播放对应单音样本
+        try:
+            s = getattr(self, 'current_string', None)
+            f = getattr(self, 'current_fret', None)
+            logger.debug("on_strum_detected current_string=%s, current_fret=%s", s, f)
+            if s is not None and f is not None:
+                # 打印样本是否存在
+                key = f"string{s}_fret{f}"
+                exists = key in self.audio_system.samples
+                logger.debug("sample %s exists=%s", key, exists)
+                if exists:
+                    self.audio_system.play_string_fret(s, f, volume=self.audio_system.get_volume())
+                else:
+                    logger.debug("样本未找到: %s", key)
+        except Exception:
+            pass
+
+    def _normalize_hand_type(self, hand) -> str:
+        """从 hand（来自 HandTracker 的 HandFrame，或旧式 dict）中提取并规范化手型字符串为 'left' 或 'right' 或 ''"""
+        val = ''
+        if isinstance(hand, HandFrame):
+            val = (hand.handedness or '').strip().lower()
+        else:
+            for k in ['hand_type', 'handness', 'type', 'label']:
+                v = hand.get(k)
+                if isinstance(v, str) and v.strip():
+                    val = v.strip().lower()
+                    break
+        if 'left' in val or val.startswith('l'):
+            return 'left'
+        if 'right' in val or val.startswith('r'):
+            return 'right'
+        return ''
+
+    def _smooth_finger_states(self, hand_type: str, raw_states: dict) -> dict:
+        """
+        基于最近几帧做多数投票平滑，返回标准顺序的 finger_states 字典。
+        raw_states 期望像 {'thumb': True, 'index': False, ...} 这样的映射（键大小写不敏感）。
+        """
+        if hand_type not in ('left', 'right'):
+            # 无法归类则直接返回原始（但确保键名规范化）
+            normalized = {k.lower(): bool(v) for k, v in (raw_states or {}).items()}
+            # 保持完整键集合
+            for k in ['thumb', 'index', 'middle', 'ring', 'pinky']:
+                normalized.setdefault(k, False)
+            return normalized
+
+        # 规范化 raw_states 键名并补全
+        normalized = {k.lower(): bool(v) for k, v in (raw_states or {}).items()}
+        for k in ['thumb', 'index', 'middle', 'ring', 'pinky']:
+            normalized.setdefault(k, False)
+
+        # push 到历史缓冲并计算多数投票
+        hist = self._finger_history.get(hand_type)
+        if hist is None:
+            hist = deque(maxlen=5)
+            self._finger_history[hand_type] = hist
+        hist.append(normalized.copy())
+
+        # 如果历史为空（首次），直接返回 normalized
+        if not hist:
+            return normalized
+
+        # 多数票（True 出现次数 > len(hist)/2）
+        counts = {k: 0 for k in ['thumb', 'index', 'middle', 'ring', 'pinky']}
+        for frame_states in hist:
+            for k, v in frame_states.items():
+                if v:
+                    counts[k] += 1
+        majority = {}
+        half = len(hist) / 2.0
+        for k in counts:
+            majority[k] = counts[k] > half
+
+        # 额外容错：如果所有手指都被判为 False（完全丢失），退回到最近一帧的 normalized（避免全部抹掉）
+        if not any(majority.values()):
+            majority = normalized
+
+        return majority
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import sys
+import wave
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 打包采样库格式（小端）：
+#   8 字节 MAGIC | uint32 索引长度 | JSON 索引 | 填充到 16 字节对齐 | int16 交错 PCM
+# 索引记录 sample_rate、channels、entries {"分组/名称": [起始帧, 帧数]} 以及打包时单音 manifest 的摘要。
+MAGIC = b'AGSBANK1'
+GROUPS = ('single_notes', 'chords', 'effects')
+DEFAULT_BASE_PATH = os.path.join('assets', 'guitar_samples')
+BANK_NAME = 'sample_bank.bin'
+_ALIGN = 16
+
+
+def _data_offset(header_len: int) -> int:
+    end = len(MAGIC) + 4 + header_len
+    return -(-end // _ALIGN) * _ALIGN
+
+
+def manifest_digest(base_path: str = DEFAULT_BASE_PATH) -> str:
+    """单音 manifest.json 的 sha256；用于判断打包文件是否落后于重新生成的 WAV（没有 manifest 时为空串）"""
+    try:
+        with open(os.path.join(base_path, 'single_notes', 'manifest.json'), 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return ''
+
+
+def read_wav_int16(path: str, channels: int = 2) -> Tuple[int, np.ndarray]:
+    """读取 16 位 PCM WAV，返回 (采样率, (帧数, channels) int16)，单声道/立体声按需转换"""
+    with wave.open(path, 'rb') as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"仅支持 16 位 PCM: {path}")
+        rate = wf.getframerate()
+        src_channels = wf.getnchannels()
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype='<i2').reshape(-1, src_channels)
+    if src_channels != channels:
+        if src_channels == 1:
+            pcm = np.repeat(pcm, channels, axis=1)
+        else:
+            mono = pcm.mean(axis=1).astype('<i2')
+            pcm = np.repeat(mono[:, None], channels, axis=1)
+    return rate, np.ascontiguousarray(pcm)
+
+
+def pack_directory(base_path: str = DEFAULT_BASE_PATH, out_path: Optional[str] = None, channels: int = 2) -> Dict:
+    """把 single_notes / chords / effects 下的全部 WAV 打包为一个采样库文件，返回写入的索引"""
+    out_path = out_path or os.path.join(base_path, BANK_NAME)
+    entries: Dict[str, List[int]] = {}
+    chunks = []
+    offset = 0
+    sample_rate = None
+    for group in GROUPS:
+        group_path = os.path.join(base_path, group)
+        if not os.path.isdir(group_path):
+            continue
+        for fname in sorted(os.listdir(group_path)):
+            if not fname.endswith('.wav'):
+                continue
+            path = os.path.join(group_path, fname)
+            try:
+                rate, pcm = read_wav_int16(path, channels)
+            except (OSError, ValueError, wave.Error) as e:
+                print(f"Warning: 跳过 {path}: {e}")
+                continue
+            if sample_rate is None:
+                sample_rate = rate
+            elif rate != sample_rate:
+                print(f"Warning: 跳过 {path}: 采样率 {rate} 与 {sample_rate} 不一致")
+                continue
+            entries[f"{group}/{fname[:-4]}"] = [offset, pcm.shape[0]]
+            chunks.append(pcm)
+            offset += pcm.shape[0]
+    if not chunks:
+        raise ValueError(f"{base_path} 下没有可打包的 WAV 文件")
+
+    header = json.dumps({
+        'sample_rate': sample_rate,
+        'channels': channels,
+        'entries': entries,
+        'manifest': manifest_digest(base_path),
+    }, ensure_ascii=False).encode('utf-8')
+    tmp = out_path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(4, 'little'))
+        f.write(header)
+        f.write(b'\0' * (_data_offset(len(header)) - f.tell()))
+        for pcm in chunks:
+            f.write(pcm.tobytes())
+    os.replace(tmp, out_path)
+    return json.loads(header)
+
+
+class SampleBank:
+    """只读的内存映射采样库
+
+    打开时只读取索引，PCM 数据通过 np.memmap 按需由操作系统换页；
+    array()/buffer() 返回映射区的切片视图，不做解码或拷贝。
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"不是采样库文件: {path}")
+            header_len = int.from_bytes(f.read(4), 'little')
+            header = json.loads(f.read(header_len).decode('utf-8'))
+        self.path = path
+        self.sample_rate: int = header['sample_rate']
+        self.channels: int = header['channels']
+        self.entries: Dict[str, List[int]] = header['entries']
+        self.manifest: str = header.get('manifest', '')
+        self._pcm = np.memmap(path, dtype='<i2', mode='r', offset=_data_offset(header_len))
+
+    def keys(self, group: Optional[str] = None) -> List[str]:
+        """全部条目名（"分组/名称"），可按分组过滤"""
+        if group is None:
+            return list(self.entries)
+        prefix = group + '/'
+        return [k for k in self.entries if k.startswith(prefix)]
+
+    def array(self, key: str) -> np.ndarray:
+        """(帧数, channels) int16 视图"""
+        start, frames = self.entries[key]
+        flat = self._pcm[start * self.channels:(start + frames) * self.channels]
+        return flat.reshape(frames, self.channels)
+
+    def buffer(self, key: str) -> memoryview:
+        """条目 PCM 的字节视图，可直接传给 pygame.mixer.Sound(buffer=...)"""
+        return memoryview(self.array(key)).cast('B')
+
+    def close(self):
+        self._pcm = None
+
+
+def main():
+    base_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BASE_PATH
+    out_path = sys.argv[2] if len(sys.argv) > 2 else None
+    header = pack_directory(base_path, out_path)
+    out_path = out_path or os.path.join(base_path, BANK_NAME)
+    counts = {g: sum(1 for k in header['entries'] if k.startswith(g + '/')) for g in GROUPS}
+    print(f"已写入 {out_path}: {len(header['entries'])} 个采样 {counts}，"
+          f"{os.path.getsize(out_path) / 1e6:.1f} MB，{header['sample_rate']} Hz × {header['channels']} 声道")
+
+
+if __name__ == '__main__':
+    main()
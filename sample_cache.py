@@ -0,0 +1,151 @@
+import collections
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from log_utils import get_logger
+
+logger = get_logger("sample_cache")
+
+
+class SampleCache:
+    """按需解码、按字节数限额的 LRU 采样缓存
+
+    对外表现为只读 dict：`key in cache` 只判断样本是否可用（不触发解码），
+    `cache[key]` 首次访问时同步解码，之后命中缓存；超过 max_bytes 时从最久未用的条目开始淘汰，
+    in_use(sound) 为真（正在播放）的条目不会被淘汰。
+    prefetch() 在后台单线程中预先解码，供相邻品位使用。
+    """
+
+    def __init__(self, loader: Callable[[str], Any], keys: Iterable[str], max_bytes: int,
+                 size_of: Callable[[Any], int], in_use: Optional[Callable[[Any], bool]] = None):
+        self._loader = loader
+        self._keys = set(keys)
+        self.max_bytes = max(0, int(max_bytes))
+        self._size_of = size_of
+        self._in_use = in_use
+        self._cache: 'collections.OrderedDict[str, tuple]' = collections.OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prefetch_loads = 0
+
+    # ---------------------- dict 兼容接口 ----------------------
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(list(self._keys))
+
+    def keys(self):
+        return set(self._keys)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            raise KeyError(key)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            future = self._inflight.get(key)
+            # 正在后台预取的样本等待其完成，计为命中
+            if future is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        sound = future.result() if future is not None else self._load(key)
+        if sound is None:
+            raise KeyError(key)
+        return sound
+
+    # ---------------------- 加载 / 淘汰 ----------------------
+    def _load(self, key: str) -> Any:
+        try:
+            sound = self._loader(key)
+        except Exception as e:
+            logger.warning("解码样本失败 %s: %s", key, e)
+            with self._lock:
+                self._keys.discard(key)
+            return None
+        nbytes = int(self._size_of(sound))
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                return entry[0]
+            self._cache[key] = (sound, nbytes)
+            self.resident_bytes += nbytes
+            self._evict(keep=key)
+        return sound
+
+    def _evict(self, keep: str):
+        """调用方持有锁；跳过 keep 与正在播放的条目"""
+        for key in list(self._cache):
+            if self.resident_bytes <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            sound, nbytes = self._cache[key]
+            if self._in_use is not None and self._in_use(sound):
+                continue
+            del self._cache[key]
+            self.resident_bytes -= nbytes
+            self.evictions += 1
+
+    def prefetch(self, keys: Iterable[str]):
+        """后台解码尚未缓存的样本（不可用或已在预取中的键会被忽略）"""
+        with self._lock:
+            todo = [k for k in keys if k in self._keys and k not in self._cache and k not in self._inflight]
+            if not todo:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sample-prefetch")
+            for key in todo:
+                self._inflight[key] = self._executor.submit(self._prefetch_one, key)
+
+    def _prefetch_one(self, key: str) -> Any:
+        try:
+            sound = self._load(key)
+            if sound is not None:
+                with self._lock:
+                    self.prefetch_loads += 1
+            return sound
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """命中/未命中次数、命中率、淘汰次数、后台预取数与当前常驻量"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'prefetch_loads': self.prefetch_loads,
+                'resident': len(self._cache),
+                'resident_mb': self.resident_bytes / 1e6,
+                'budget_mb': self.max_bytes / 1e6,
+                'available': len(self._keys),
+            }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
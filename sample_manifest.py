@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List
+
+MANIFEST_NAME = "manifest.json"
+
+
+def params_hash(params: Dict[str, Any]) -> str:
+    """合成参数的内容哈希（键排序后的 JSON 做 sha256）"""
+    blob = json.dumps(params, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(blob).hexdigest()
+
+
+def load_manifest(directory: str) -> Dict[str, Dict[str, Any]]:
+    """读取目录下的 manifest.json，返回 {文件名: {'hash', 'size'}}；不存在或损坏时返回空 dict"""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            entries = json.load(f).get('files', {})
+        return entries if isinstance(entries, dict) else {}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def save_manifest(directory: str, entries: Dict[str, Dict[str, Any]]):
+    """原子写入 manifest.json（先写临时文件再替换）"""
+    path = os.path.join(directory, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'files': entries}, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def scan_sizes(directory: str) -> Dict[str, int]:
+    """一次 scandir 列出目录内全部文件及大小，代替逐个 os.path.exists"""
+    try:
+        with os.scandir(directory) as it:
+            return {e.name: e.stat().st_size for e in it if e.is_file()}
+    except OSError:
+        return {}
+
+
+def stale_files(directory: str, wanted: Dict[str, str]) -> List[str]:
+    """返回需要重新生成的文件名：缺失、大小与记录不符，或参数哈希变化"""
+    entries = load_manifest(directory)
+    sizes = scan_sizes(directory)
+    stale = []
+    for name, digest in wanted.items():
+        entry = entries.get(name)
+        if entry is None or entry.get('hash') != digest or sizes.get(name) != entry.get('size'):
+            stale.append(name)
+    return stale
+
+
+def record_files(directory: str, written: Dict[str, str]):
+    """把新生成的文件（文件名 -> 参数哈希）连同当前大小写入 manifest，保留其他条目"""
+    entries = load_manifest(directory)
+    sizes = scan_sizes(directory)
+    for name, digest in written.items():
+        if name in sizes:
+            entries[name] = {'hash': digest, 'size': sizes[name]}
+        else:
+            entries.pop(name, None)
+    save_manifest(directory, entries)
+
+
+def verify_files(directory: str, names: Iterable[str]) -> Dict[str, Any]:
+    """启动时的快速完整性检查（一次 scandir + 一次读取 manifest）
+
+    返回 present（可加载）、missing（缺失）、corrupt（大小与 manifest 记录不符）与 has_manifest。
+    没有 manifest 时只检查文件是否存在。
+    """
+    entries = load_manifest(directory)
+    sizes = scan_sizes(directory)
+    result: Dict[str, Any] = {'present': [], 'missing': [], 'corrupt': [], 'has_manifest': bool(entries)}
+    for name in names:
+        size = sizes.get(name)
+        if size is None:
+            result['missing'].append(name)
+            continue
+        entry = entries.get(name)
+        if entry is not None and entry.get('size') != size:
+            result['corrupt'].append(name)
+            continue
+        result['present'].append(name)
+    return result
@@ -0,0 +1,352 @@
+import itertools
+import threading
+import time
+import wave
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from log_utils import get_logger
+
+logger = get_logger("soft_mixer")
+
+RenderCallback = Callable[[int], np.ndarray]
+
+
+class _Voice:
+    """一个正在播放的样本：读指针、增益（逐块线性过渡）与起音/释音包络"""
+
+    __slots__ = ('pcm', 'pos', 'gain', 'target_gain', 'attack', 'release_at', 'release_len', 'sound')
+
+    def __init__(self, pcm: np.ndarray, gain: float, attack: int, sound=None):
+        self.pcm = pcm
+        self.pos = 0
+        self.gain = gain
+        self.target_gain = gain
+        self.attack = attack
+        self.release_at: Optional[int] = None
+        self.release_len = 0
+        self.sound = sound
+
+
+class SoftMixer:
+    """NumPy 软件混音器
+
+    所有活动声部在一个回调 render(frames) 内以 float32 块求和：每个声部带独立增益（变化时在一个块内线性过渡）、
+    起音/释音包络，最后乘主音量并限幅到 [-1, 1]。输出由可替换的后端（见 create_backend）按 block_size 拉取。
+    play()/stop() 可在任意线程调用，与回调之间用一把锁保护声部表。
+    """
+
+    def __init__(self, sample_rate: int = 44100, channels: int = 2, block_size: int = 128,
+                 attack_ms: float = 2.0, release_ms: float = 30.0):
+        self.sample_rate = int(sample_rate)
+        self.channels = int(channels)
+        self.block_size = max(1, int(block_size))
+        self.default_attack = int(self.sample_rate * attack_ms / 1000.0)
+        self.default_release = int(self.sample_rate * release_ms / 1000.0)
+        self.master_volume = 1.0
+        self._voices: Dict[int, _Voice] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.backend = None
+        self.blocks_rendered = 0
+        self.render_time = 0.0
+
+    # ---------------------- 声部控制 ----------------------
+    def play(self, pcm: np.ndarray, gain: float = 1.0, attack_ms: Optional[float] = None, sound=None) -> int:
+        """开始播放 (帧数, channels) float32 样本，返回声部 id"""
+        attack = self.default_attack if attack_ms is None else int(self.sample_rate * attack_ms / 1000.0)
+        voice = _Voice(pcm, float(gain), attack, sound)
+        with self._lock:
+            voice_id = next(self._ids)
+            self._voices[voice_id] = voice
+        return voice_id
+
+    def stop(self, voice_id: int, release_ms: Optional[float] = None):
+        """以释音包络淡出声部（release_ms=0 立即停止）"""
+        release = self.default_release if release_ms is None else int(self.sample_rate * release_ms / 1000.0)
+        with self._lock:
+            voice = self._voices.get(voice_id)
+            if voice is None:
+                return
+            if release <= 0:
+                del self._voices[voice_id]
+            elif voice.release_at is None:
+                voice.release_at = voice.pos
+                voice.release_len = release
+
+    def stop_sound(self, sound, release_ms: Optional[float] = None):
+        """停止某个 MixerSound 的全部声部"""
+        for voice_id in self.voice_ids(sound):
+            self.stop(voice_id, release_ms)
+
+    def stop_all(self, release_ms: Optional[float] = None):
+        for voice_id in self.voice_ids():
+            self.stop(voice_id, release_ms)
+
+    def set_voice_gain(self, voice_id: int, gain: float):
+        with self._lock:
+            voice = self._voices.get(voice_id)
+            if voice is not None:
+                voice.target_gain = float(gain)
+
+    def set_master_volume(self, volume: float):
+        self.master_volume = float(min(max(volume, 0.0), 1.0))
+
+    def is_active(self, voice_id: int) -> bool:
+        return voice_id in self._voices
+
+    def voice_ids(self, sound=None) -> List[int]:
+        with self._lock:
+            return [vid for vid, v in self._voices.items() if sound is None or v.sound is sound]
+
+    @property
+    def active_voices(self) -> int:
+        return len(self._voices)
+
+    # ---------------------- 音频回调 ----------------------
+    def render(self, frames: int) -> np.ndarray:
+        """混合下一块 frames 帧，返回 (frames, channels) float32；由输出后端在音频线程中调用"""
+        t0 = time.perf_counter()
+        out = np.zeros((frames, self.channels), dtype=np.float32)
+        with self._lock:
+            finished = []
+            for voice_id, v in self._voices.items():
+                n = min(frames, len(v.pcm) - v.pos)
+                if n <= 0:
+                    finished.append(voice_id)
+                    continue
+                if v.gain == v.target_gain:
+                    env = np.full(n, v.gain, dtype=np.float32)
+                else:
+                    env = np.linspace(v.gain, v.target_gain, n, endpoint=False, dtype=np.float32)
+                    v.gain = v.target_gain
+                if v.pos < v.attack:
+                    idx = np.arange(v.pos, v.pos + n, dtype=np.float32)
+                    env *= np.minimum(1.0, (idx + 1.0) / v.attack)
+                if v.release_at is not None:
+                    remaining = v.release_len - (v.pos - v.release_at)
+                    n = min(n, max(remaining, 0))
+                    env = env[:n] * np.linspace(remaining / v.release_len, (remaining - n) / v.release_len,
+                                                n, endpoint=False, dtype=np.float32)
+                    if remaining - n <= 0:
+                        finished.append(voice_id)
+                out[:n] += v.pcm[v.pos:v.pos + n] * env[:, None]
+                v.pos += n
+                if v.pos >= len(v.pcm):
+                    finished.append(voice_id)
+            for voice_id in finished:
+                self._voices.pop(voice_id, None)
+        if self.master_volume != 1.0:
+            out *= self.master_volume
+        np.clip(out, -1.0, 1.0, out=out)
+        self.blocks_rendered += 1
+        self.render_time += time.perf_counter() - t0
+        return out
+
+    # ---------------------- 输出后端 ----------------------
+    def start(self, backend):
+        """把 render 挂到输出后端上开始拉取"""
+        self.backend = backend
+        backend.start(self.render, self.sample_rate, self.channels, self.block_size)
+
+    def close(self):
+        if self.backend is not None:
+            self.backend.stop()
+            self.backend = None
+
+    def get_stats(self) -> Dict[str, float]:
+        blocks = max(1, self.blocks_rendered)
+        return {
+            'active_voices': self.active_voices,
+            'blocks_rendered': self.blocks_rendered,
+            'mean_render_us': self.render_time / blocks * 1e6,
+            'block_ms': self.block_size * 1000.0 / self.sample_rate,
+        }
+
+
+class MixerSound:
+    """与 pygame.mixer.Sound 接口兼容的样本（play / stop / set_volume / get_length / get_num_channels），在 SoftMixer 上播放"""
+
+    __slots__ = ('mixer', 'pcm', '_volume')
+
+    def __init__(self, mixer: SoftMixer, pcm: np.ndarray):
+        self.mixer = mixer
+        self.pcm = pcm
+        self._volume = 1.0
+
+    @classmethod
+    def from_int16(cls, mixer: SoftMixer, data, channels: Optional[int] = None) -> 'MixerSound':
+        """由 int16 交错 PCM（数组或字节缓冲区）构造；channels 为源声道数（默认与混音器相同），不一致时取首声道复制"""
+        channels = channels or mixer.channels
+        pcm = np.frombuffer(data, dtype='<i2').reshape(-1, channels)
+        if channels != mixer.channels:
+            pcm = np.repeat(pcm[:, :1], mixer.channels, axis=1)
+        return cls(mixer, pcm.astype(np.float32) / 32768.0)
+
+    def play(self) -> 'MixerChannel':
+        return MixerChannel(self.mixer, self.mixer.play(self.pcm, self._volume, sound=self))
+
+    def stop(self):
+        self.mixer.stop_sound(self)
+
+    def set_volume(self, volume: float):
+        self._volume = float(volume)
+
+    def get_volume(self) -> float:
+        return self._volume
+
+    def get_length(self) -> float:
+        return len(self.pcm) / self.mixer.sample_rate
+
+    def get_num_channels(self) -> int:
+        return len(self.mixer.voice_ids(self))
+
+    @property
+    def nbytes(self) -> int:
+        return self.pcm.nbytes
+
+
+class MixerChannel:
+    """play() 的返回值，对应 pygame.mixer.Channel 的 stop / set_volume / get_busy"""
+
+    __slots__ = ('mixer', 'voice_id')
+
+    def __init__(self, mixer: SoftMixer, voice_id: int):
+        self.mixer = mixer
+        self.voice_id = voice_id
+
+    def stop(self):
+        self.mixer.stop(self.voice_id)
+
+    def set_volume(self, volume: float):
+        self.mixer.set_voice_gain(self.voice_id, volume)
+
+    def get_busy(self) -> bool:
+        return self.mixer.is_active(self.voice_id)
+
+
+# ---------------------- 输出后端 ----------------------
+class NullBackend:
+    """不输出声音；默认不自行拉取，由 pump() 手动驱动回调，适合无头测试"""
+
+    def __init__(self, realtime: bool = False, **_):
+        self.realtime = realtime
+        self._callback: Optional[RenderCallback] = None
+        self.block_size = 0
+        self.sample_rate = 0
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self, callback: RenderCallback, sample_rate: int, channels: int, block_size: int):
+        self._callback = callback
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        if self.realtime:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="mixer-output", daemon=True)
+            self._thread.start()
+
+    def pump(self, blocks: int = 1) -> np.ndarray:
+        """同步渲染 blocks 个块并返回拼接结果"""
+        out = np.concatenate([self._callback(self.block_size) for _ in range(blocks)])
+        self.write(out)
+        return out
+
+    def write(self, block: np.ndarray):
+        pass
+
+    def _run(self):
+        # 按实时节奏拉取：以绝对时间为基准，避免累计漂移
+        period = self.block_size / self.sample_rate
+        deadline = time.perf_counter()
+        while self._running:
+            self.write(self._callback(self.block_size))
+            deadline += period
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.perf_counter()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+class FileBackend(NullBackend):
+    """把回调输出写成 16 位 WAV 文件（默认按实时节奏驱动，可用 realtime=False 配合 pump() 离线渲染）"""
+
+    def __init__(self, path: Optional[str] = None, realtime: bool = True, **_):
+        super().__init__(realtime=realtime)
+        self.path = path or "mixer_output.wav"
+        self._wav = None
+        self._wav_lock = threading.Lock()
+
+    def start(self, callback: RenderCallback, sample_rate: int, channels: int, block_size: int):
+        self._wav = wave.open(self.path, 'wb')
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+        super().start(callback, sample_rate, channels, block_size)
+
+    def write(self, block: np.ndarray):
+        with self._wav_lock:
+            if self._wav is not None:
+                self._wav.writeframes((block * 32767.0).astype('<i2').tobytes())
+
+    def stop(self):
+        super().stop()
+        with self._wav_lock:
+            if self._wav is not None:
+                self._wav.close()
+                self._wav = None
+
+
+class SoundDeviceBackend:
+    """通过 sounddevice（PortAudio）回调实时输出，需要 pip install sounddevice"""
+
+    def __init__(self, device=None, latency='low', **_):
+        self.device = device
+        self.latency = latency
+        self.stream = None
+
+    def start(self, callback: RenderCallback, sample_rate: int, channels: int, block_size: int):
+        try:
+            import sounddevice as sd  # type: ignore
+        except Exception as e:
+            raise ImportError("audio.output: sounddevice 需要安装 sounddevice：pip install sounddevice") from e
+
+        def _callback(outdata, frames, time_info, status):
+            if status:
+                logger.debug("音频回调状态: %s", status)
+            outdata[:] = callback(frames)
+
+        self.stream = sd.OutputStream(samplerate=sample_rate, blocksize=block_size, channels=channels,
+                                      dtype='float32', latency=self.latency, device=self.device,
+                                      callback=_callback)
+        self.stream.start()
+
+    def stop(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+
+BACKENDS = {
+    'null': NullBackend,
+    'file': FileBackend,
+    'sounddevice': SoundDeviceBackend,
+}
+
+
+def create_backend(name: str, **options):
+    """按名称创建输出后端（null / file / sounddevice）"""
+    try:
+        backend_cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"未知的音频输出后端: {name}（可选 {', '.join(BACKENDS)}）") from None
+    return backend_cls(**options)
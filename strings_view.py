@@ -0,0 +1,208 @@
+import os
+import zlib
+from typing import Dict, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# 常见中文字体路径，按顺序探测
+FONT_PATHS = (
+    '/System/Library/Fonts/PingFang.ttc',  # macOS
+    '/usr/share/fonts/truetype/wqy/wqy-microhei.ttc',  # Linux
+    'C:/Windows/Fonts/msyh.ttc',  # Windows
+    'C:/Windows/Fonts/simhei.ttf',  # Windows
+    './fonts/wqy-microhei.ttc'  # 当前目录
+)
+
+# 弦名映射
+STRING_LABELS = {
+    'E_low': 'E低音弦',
+    'A': 'A弦',
+    'D': 'D弦',
+    'G': 'G弦',
+    'B': 'B弦',
+    'E_high': 'E高音弦'
+}
+
+BACKGROUND = (20, 20, 30)
+MARGIN_TOP = 50
+MARGIN_BOTTOM = 50
+WAVE_LEFT = 80          # 波形区域左边界
+WAVE_RIGHT_PAD = 20     # 波形区域右边距
+WAVE_STEP = 2           # 相邻波形点的水平间距（像素）
+WAVE_SCALE = 0.5        # 波形值 -> 像素的缩放
+POINT_SHIFT = 4         # cv2 亚像素坐标的小数位数（历史点多于可用像素时间距小于 1 像素）
+
+# 模块级字体缓存：字号 -> 字体；字体路径只探测一次
+_FONT_CACHE: Dict[int, ImageFont.ImageFont] = {}
+_font_path: Optional[str] = None
+_font_probed = False
+
+
+def get_font(size: int) -> ImageFont.ImageFont:
+    """取指定字号的中文字体，找不到中文字体或加载失败时退回 PIL 默认字体（只显示英文）"""
+    global _font_path, _font_probed
+    font = _FONT_CACHE.get(size)
+    if font is not None:
+        return font
+    if not _font_probed:
+        _font_probed = True
+        _font_path = next((path for path in FONT_PATHS if os.path.exists(path)), None)
+        if _font_path is None:
+            print("⚠️ 未找到中文字体，将使用默认字体")
+    try:
+        font = ImageFont.truetype(_font_path, size) if _font_path else ImageFont.load_default()
+    except Exception as e:
+        print(f"⚠️ 字体加载失败: {e}")
+        font = ImageFont.load_default()
+    _FONT_CACHE[size] = font
+    return font
+
+
+class WaveHistory:
+    """所有弦的波形历史：预分配的 (弦数, 2N) float32 镜像环形缓冲
+
+    每个新值同时写入 i 与 i + N 两处，因此最近 count 个点总是一段连续切片，
+    waves() 不拷贝即可按时间顺序返回 (弦数, count) 视图。push() 每帧一次向量化计算所有弦的新值，
+    耗时与历史长度 N 无关；各弦的相位偏移在构造时算好。
+    """
+
+    def __init__(self, names: Sequence[str], length: int = 100):
+        self.names = list(names)
+        self.length = max(2, int(length))
+        self._buf = np.zeros((len(self.names), 2 * self.length), dtype=np.float32)
+        self._head = 0      # 下一次写入的位置，[0, N)
+        self.count = 0
+        # 相位偏移 0~9，按弦名固定（不依赖每次进程随机化的 hash()）
+        self.phase = np.array([zlib.crc32(name.encode('utf-8')) % 10 for name in self.names], dtype=np.float32)
+
+    def push(self, now: float, active: Sequence[bool]) -> np.ndarray:
+        """按当前时间与各弦激活状态追加一个点，返回 waves()"""
+        active = np.asarray(active, dtype=bool)
+        # 激活的弦振幅与频率更大，未激活的弦只有较小的背景波动
+        amplitude = np.where(active, 25 + 15 * np.sin(now * 6 + self.phase), 5 + 2 * np.sin(now * 2 + self.phase))
+        frequency = np.where(active, 2.5 + 1.5 * np.sin(now * 2.5), 0.5)
+        value = amplitude * np.sin(now * frequency)
+        h = self._head
+        self._buf[:, h] = value
+        self._buf[:, h + self.length] = value
+        self._head = (h + 1) % self.length
+        self.count = min(self.count + 1, self.length)
+        return self.waves()
+
+    def waves(self) -> np.ndarray:
+        """(弦数, count) 视图，每行从旧到新"""
+        end = (self._head - 1) % self.length + self.length + 1
+        return self._buf[:, end - self.count:end]
+
+    def clear(self):
+        self._head = 0
+        self.count = 0
+
+
+def _dim(color: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    return (color[0] // 3, color[1] // 3, color[2] // 3)
+
+
+class StringsRenderer:
+    """吉他弦曲线谱渲染器
+
+    背景、弦名标签、标题、图例与弦头只在尺寸或弦配置变化时用 PIL 渲染一次，作为静态图层；
+    每根弦的基准线按激活 / 静音两种状态预先渲染成横条。每帧只做：复制静态图层到复用的缓冲区、
+    按状态贴上基准线横条、用 cv2 画 6 条波形折线（激活弦再加最近 10 个点）。
+    render() 返回的是复用的 RGB uint8 缓冲区，可直接交给 st.image，下一帧会被覆盖。
+    """
+
+    def __init__(self):
+        self._layout_key = None
+        self._static: Optional[np.ndarray] = None
+        self._buffer: Optional[np.ndarray] = None
+        self._rows: Dict[str, int] = {}
+        self._bands: Dict[Tuple[str, bool], np.ndarray] = {}
+
+    @staticmethod
+    def _string_rows(keys, frame_height: int) -> Dict[str, int]:
+        available_height = frame_height - MARGIN_TOP - MARGIN_BOTTOM
+        string_spacing = available_height / (len(keys) - 1) if len(keys) > 1 else 0
+        return {key: int(MARGIN_TOP + i * string_spacing) for i, key in enumerate(keys)}
+
+    def _build_static(self, strings_data: Dict[str, Dict], frame_width: int, frame_height: int):
+        """渲染静态图层与基准线横条"""
+        font, small_font, title_font = get_font(14), get_font(12), get_font(18)
+        img = Image.new('RGB', (frame_width, frame_height), color=BACKGROUND)
+        draw = ImageDraw.Draw(img)
+        self._rows = self._string_rows(list(strings_data), frame_height)
+
+        for key, y_pos in self._rows.items():
+            color = strings_data[key]['color']
+            # 弦名（左侧，带背景矩形）
+            string_name = STRING_LABELS.get(key, key)
+            text_bbox = draw.textbbox((0, 0), string_name, font=font)
+            text_width = text_bbox[2] - text_bbox[0]
+            text_height = text_bbox[3] - text_bbox[1]
+            draw.rectangle([(5, y_pos - text_height // 2), (5 + text_width + 10, y_pos + text_height // 2)],
+                           fill=(40, 40, 60))
+            draw.text((10, y_pos - text_height // 2), string_name, font=font, fill=(255, 255, 255))
+            # 弦头（右侧）
+            draw.ellipse([(frame_width - 25, y_pos - 5), (frame_width - 15, y_pos + 5)], fill=color, outline=color)
+
+        # 标题与图例
+        title = "吉他弦曲线谱"
+        title_bbox = draw.textbbox((0, 0), title, font=title_font)
+        draw.text(((frame_width - (title_bbox[2] - title_bbox[0])) // 2, 20), title,
+                  font=title_font, fill=(255, 255, 255))
+        legend_text = "● 激活 | ○ 静音"
+        legend_bbox = draw.textbbox((0, 0), legend_text, font=small_font)
+        draw.text(((frame_width - (legend_bbox[2] - legend_bbox[0])) // 2, frame_height - 30), legend_text,
+                  font=small_font, fill=(200, 200, 200))
+        self._static = np.array(img)
+
+        # 基准线横条：y_pos-1 .. y_pos+1 三行，激活时 2 像素粗、原色，静音时 1 像素、暗色；弦头仍压在线上
+        self._bands = {}
+        right = frame_width - WAVE_RIGHT_PAD
+        line_end = frame_width - 25 - WAVE_LEFT
+        for key, y_pos in self._rows.items():
+            color = strings_data[key]['color']
+            for active in (False, True):
+                band = self._static[y_pos - 1:y_pos + 2, WAVE_LEFT:right + 1].copy()
+                if active:
+                    band[1:3, :line_end] = color
+                else:
+                    band[1, :line_end] = _dim(color)
+                self._bands[(key, active)] = band
+        self._buffer = np.empty_like(self._static)
+
+    def render(self, strings_data: Dict[str, Dict], frame_width: int = 300, frame_height: int = 400) -> np.ndarray:
+        """绘制一帧曲线谱，strings_data 为 {弦名: {'wave', 'color', 'active'}}"""
+        layout_key = (frame_width, frame_height, tuple((k, tuple(v['color'])) for k, v in strings_data.items()))
+        if layout_key != self._layout_key:
+            self._build_static(strings_data, frame_width, frame_height)
+            self._layout_key = layout_key
+
+        canvas = self._buffer
+        np.copyto(canvas, self._static)
+        right = frame_width - WAVE_RIGHT_PAD
+        for key, y_pos in self._rows.items():
+            string_data = strings_data[key]
+            active = bool(string_data['active'])
+            canvas[y_pos - 1:y_pos + 2, WAVE_LEFT:right + 1] = self._bands[(key, active)]
+
+            wave = np.asarray(string_data['wave'], dtype=np.float32)
+            if len(wave) < 2:
+                continue
+            # 最新的点在右端，向左每点 WAVE_STEP 像素；历史更长时压缩间距铺满波形区域，超出左边界的旧点丢弃
+            step = min(WAVE_STEP, (right - WAVE_LEFT) / (len(wave) - 1))
+            xs = right - (len(wave) - np.arange(len(wave))) * step
+            keep = xs >= WAVE_LEFT
+            if keep.sum() < 2:
+                continue
+            ys = y_pos + np.trunc(wave[keep] * WAVE_SCALE)
+            points = np.round(np.stack([xs[keep], ys], axis=1) * (1 << POINT_SHIFT)).astype(np.int32)
+            color = tuple(string_data['color'])
+            cv2.polylines(canvas, [points], False, color, 1, cv2.LINE_8, POINT_SHIFT)
+            # 激活的弦标出最近的 10 个点
+            if active:
+                for x, y in points[-10:].tolist():
+                    cv2.circle(canvas, (x, y), 2 << POINT_SHIFT, color, -1, cv2.LINE_8, POINT_SHIFT)
+        return canvas
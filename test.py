@@ -5,6 +5,9 @@ from scipy import signal
 from scipy.interpolate import interp1d
 import random
 
+from parallel_jobs import parse_workers_arg, run_jobs
+import sample_manifest
+
 # 生成设置
 SAMPLE_RATE = 44100
 DURATION = 2.5  # 秒
@@ -227,45 +230,59 @@ def write_stereo_wav(filename, samples, sample_rate=SAMPLE_RATE):
         wf.setframerate(sample_rate)
         wf.writeframes(samples_16bit.tobytes())
 
-def generate_all():
+def render_note(s_idx, fret):
+    """
+    生成单个弦/品格的音色并写入文件（进程池任务）
+    """
+    # 计算频率
+    freq = BASE_FREQS[s_idx - 1] * (2 ** (fret/12))
+    
+    # 生成文件名
+    fname = f'string{s_idx}_fret{fret}.wav'
+    out_path = os.path.join(OUTPUT_DIR, fname)
+    
+    # 生成音色
+    try:
+        samples = improved_karplus_strong(freq, s_idx, fret, duration=DURATION)
+        
+        # 添加弦噪声
+        samples = add_string_noise(samples, freq, SAMPLE_RATE)
+        
+        # 写入文件
+        write_stereo_wav(out_path, samples)
+        
+    except Exception as e:
+        print(f"生成失败 {out_path}: {e}")
+        # 生成一个简单的正弦波作为备选
+        t = np.linspace(0, DURATION, int(SAMPLE_RATE * DURATION), False)
+        wave_signal = 0.5 * np.sin(2 * np.pi * freq * t)
+        env = np.exp(-2.0 * t)
+        wave_signal *= env
+        
+        # 立体声
+        stereo = np.column_stack((wave_signal, wave_signal))
+        write_stereo_wav(out_path, stereo)
+    return out_path
+
+def generate_all(workers=None):
     """
     生成所有音符
+    workers: 进程数，None 使用全部 CPU 核心，1 为顺序生成；每个音按文件名固定随机种子
     """
     print("开始生成吉他音色...")
     print("这可能需要一些时间，请耐心等待...")
     
-    for s_idx, base in enumerate(BASE_FREQS, start=1):
-        for fret in range(0, 12):  # 生成前12个品格
-            # 计算频率
-            freq = base * (2 ** (fret/12))
-            
-            # 生成文件名
-            fname = f'string{s_idx}_fret{fret}.wav'
-            out_path = os.path.join(OUTPUT_DIR, fname)
-            
-            print(f'生成: {out_path} 频率={freq:.2f}Hz 弦={s_idx} 品格={fret}')
-            
-            # 生成音色
-            try:
-                samples = improved_karplus_strong(freq, s_idx, fret, duration=DURATION)
-                
-                # 添加弦噪声
-                samples = add_string_noise(samples, freq, SAMPLE_RATE)
-                
-                # 写入文件
-                write_stereo_wav(out_path, samples)
-                
-            except Exception as e:
-                print(f"生成失败 {out_path}: {e}")
-                # 生成一个简单的正弦波作为备选
-                t = np.linspace(0, DURATION, int(SAMPLE_RATE * DURATION), False)
-                wave_signal = 0.5 * np.sin(2 * np.pi * freq * t)
-                env = np.exp(-2.0 * t)
-                wave_signal *= env
-                
-                # 立体声
-                stereo = np.column_stack((wave_signal, wave_signal))
-                write_stereo_wav(out_path, stereo)
+    jobs = [(f'string{s_idx}_fret{fret}', (s_idx, fret))
+            for s_idx in range(1, len(BASE_FREQS) + 1)
+            for fret in range(0, 12)]  # 生成前12个品格
+    paths = run_jobs(render_note, jobs, workers)
+    
+    # 与 generate_guitar_samples 共用输出目录：以本脚本的哈希登记，使其下次运行时重新生成这些文件
+    sample_manifest.record_files(OUTPUT_DIR, {
+        name + '.wav': sample_manifest.params_hash({'generator': 'test.py', 'file': name})
+        for name, _ in jobs
+    })
+    return paths
 
 def generate_sample_chord():
     """
@@ -315,7 +332,7 @@ if __name__ == '__main__':
         exit(1)
     
     # 生成单音
-    generate_all()
+    generate_all(workers=parse_workers_arg())
     
     # 生成示例和弦
     generate_sample_chord()
@@ -0,0 +1,200 @@
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from finger_geometry import FINGER_NAMES
+from hand_frame import HandFrame
+from hand_tracker import HandTracker
+from log_utils import get_logger
+
+logger = get_logger("vision_worker")
+
+
+class FrameRing:
+    """共享内存帧环：slots 个固定尺寸的 uint8 帧槽，进程间只传递槽号，不序列化像素"""
+
+    def __init__(self, shape: Tuple[int, ...], slots: int = 4, name: Optional[str] = None):
+        self.shape = tuple(int(v) for v in shape)
+        self.slots = int(slots)
+        frame_bytes = int(np.prod(self.shape))
+        create = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=frame_bytes * self.slots)
+        self._owner = create
+        self.frames = np.ndarray((self.slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        self.frames = None
+        self.shm.close()
+        if self._owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _pack_hands(hand_data: List[HandFrame]) -> Dict[str, Any]:
+    """HandFrame 列表 -> 紧凑数组（关键点、手型、置信度、手指状态、是否实测）"""
+    n = len(hand_data)
+    return {
+        'coords': np.stack([h.coords for h in hand_data]) if n else np.zeros((0, 21, 3), dtype=np.float32),
+        'handedness': [h.handedness for h in hand_data],
+        'score': np.array([h.score for h in hand_data], dtype=np.float32),
+        'timestamp': np.array([h.timestamp for h in hand_data], dtype=np.float64),
+        'states': np.array([[bool((h.finger_states or {}).get(f)) for f in FINGER_NAMES] for h in hand_data],
+                           dtype=bool).reshape(n, len(FINGER_NAMES)),
+        'measured': np.array([h.measured for h in hand_data], dtype=bool),
+    }
+
+
+def _unpack_hands(packed: Dict[str, Any]) -> List[HandFrame]:
+    return [HandFrame(packed['coords'][i], handedness=label, score=packed['score'][i],
+                      timestamp=packed['timestamp'][i],
+                      finger_states=dict(zip(FINGER_NAMES, map(bool, packed['states'][i]))),
+                      measured=bool(packed['measured'][i]))
+            for i, label in enumerate(packed['handedness'])]
+
+
+def _worker_main(config: Dict[str, Any], ring_name: str, shape: Tuple[int, ...], slots: int, conn):
+    """工作进程：在共享帧槽上运行 HandTracker（关键点直接画在槽内），回传紧凑结果"""
+    ring = FrameRing(shape, slots, name=ring_name)
+    tracker = HandTracker(config)
+    conn.send(('ready', None))
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            slot, frame_id, frame_seconds = msg
+            if frame_seconds is not None:
+                tracker.report_frame_time(frame_seconds)
+            t0 = time.perf_counter()
+            _, hand_data = tracker.process_frame(ring.frames[slot])
+            conn.send((slot, frame_id, _pack_hands(hand_data), time.perf_counter() - t0,
+                       tracker.get_load_stats()))
+    finally:
+        tracker.release()
+        ring.close()
+
+
+class VisionWorkerTracker(HandTracker):
+    """在独立进程中运行 HandTracker 的替身
+
+    帧写入共享内存环（FrameRing），管道中只传 (槽号, frame_id)；工作进程回传每只手的关键点数组与手指状态，
+    这里还原为 HandFrame。MediaPipe 推理、颜色转换与 draw_landmarks 都不再占用主进程的 GIL。
+    process_frame() 为同步调用；submit()/collect() 可流水线化：提交下一帧后再处理上一帧结果。
+    get_hand_gesture 等纯几何方法沿用 HandTracker。
+    """
+
+    def __init__(self, config: Dict[str, Any], slots: int = 4, start_timeout: float = 60.0):
+        self.config = config
+        self.slots = max(2, int(slots))
+        self.start_timeout = start_timeout
+        self.governor = None
+        self.external_recognizer = None
+        self._ctx = mp.get_context('spawn')
+        self._ring: Optional[FrameRing] = None
+        self._proc = None
+        self._conn = None
+        self._next_slot = 0
+        self._inflight: Dict[int, np.ndarray] = {}
+        self._pending_frame_seconds: Optional[float] = None
+        self._load_stats: Dict[str, Any] = {}
+        self.frames = 0
+        self.worker_seconds = 0.0
+
+    # ---------------------- 进程管理 ----------------------
+    def _start(self, shape: Tuple[int, ...]):
+        self.release()
+        self._ring = FrameRing(shape, self.slots)
+        self._conn, child = self._ctx.Pipe()
+        self._proc = self._ctx.Process(target=_worker_main, name="vision-worker", daemon=True,
+                                       args=(self.config, self._ring.name, self._ring.shape, self.slots, child))
+        self._proc.start()
+        child.close()
+        if not self._conn.poll(self.start_timeout):
+            self.release()
+            raise RuntimeError("视觉工作进程启动超时")
+        self._conn.recv()
+        logger.info("视觉工作进程已启动 pid=%s 帧槽 %d × %s", self._proc.pid, self.slots, shape)
+
+    def release(self):
+        """停止工作进程并释放共享内存"""
+        if self._proc is not None:
+            try:
+                self._conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            self._proc.join(timeout=5.0)
+            if self._proc.is_alive():
+                self._proc.terminate()
+            self._conn.close()
+            self._proc = None
+            self._conn = None
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+        self._inflight.clear()
+
+    # ---------------------- 帧传递 ----------------------
+    def submit(self, image: np.ndarray, frame_id: int = 0) -> int:
+        """把帧复制进下一个空闲槽并交给工作进程，返回槽号（在途帧数不超过 slots - 1）"""
+        if self._ring is None or self._ring.shape != image.shape:
+            self._start(image.shape)
+        if len(self._inflight) >= self.slots - 1:
+            raise RuntimeError("在途帧过多，请先 collect()")
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % self.slots
+        self._ring.frames[slot][...] = image
+        self._inflight[slot] = image
+        self._conn.send((slot, frame_id, self._pending_frame_seconds))
+        self._pending_frame_seconds = None
+        return slot
+
+    def collect(self, timeout: Optional[float] = None) -> Optional[Tuple[int, np.ndarray, List[HandFrame]]]:
+        """取回最早提交的一帧结果：(frame_id, 画好关键点的帧, HandFrame 列表)；超时返回 None"""
+        if not self._inflight:
+            return None
+        if timeout is not None and not self._conn.poll(timeout):
+            return None
+        slot, frame_id, packed, seconds, load = self._conn.recv()
+        image = self._inflight.pop(slot)
+        # 与 HandTracker 一致：关键点画在调用方传入的帧上
+        image[...] = self._ring.frames[slot]
+        self.frames += 1
+        self.worker_seconds += seconds
+        self._load_stats = load
+        return frame_id, image, _unpack_hands(packed)
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def process_frame(self, image: np.ndarray) -> Tuple[np.ndarray, List[HandFrame]]:
+        self.submit(image)
+        _, image, hand_data = self.collect()
+        return image, hand_data
+
+    # ---------------------- 统计 / 负载调节 ----------------------
+    def report_frame_time(self, seconds: float):
+        """随下一帧转发给工作进程中的负载调节器"""
+        self._pending_frame_seconds = seconds
+
+    def get_load_stats(self) -> Dict[str, Any]:
+        if self._load_stats:
+            return self._load_stats
+        mc = self.config['model_complexity']
+        return {'tier': None, 'tier_name': f"mc{mc} 全分辨率", 'model_complexity': mc, 'inference_width': None}
+
+    def get_worker_stats(self) -> Dict[str, float]:
+        return {
+            'frames': self.frames,
+            'mean_worker_ms': self.worker_seconds / self.frames * 1000.0 if self.frames else 0.0,
+            'inflight': self.inflight,
+        }
@@ -0,0 +1,149 @@
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from log_utils import get_logger
+
+logger = get_logger("voice_pool")
+
+STEAL_POLICIES = ('oldest', 'quietest')
+
+
+class _VoiceRecord:
+    __slots__ = ('sound', 'channel', 'group', 'volume', 'started', 'length')
+
+    def __init__(self, sound, channel, group, volume: float, length: float):
+        self.sound = sound
+        self.channel = channel
+        self.group = group
+        self.volume = volume
+        self.started = time.perf_counter()
+        self.length = length
+
+    def level(self, now: float) -> float:
+        """估计当前响度：音量 × 样本剩余比例（拨弦样本近似线性衰减）"""
+        if self.length <= 0:
+            return self.volume
+        return self.volume * max(0.0, 1.0 - (now - self.started) / self.length)
+
+
+class VoicePool:
+    """有上限的声部池
+
+    - 同一分组（如同一根弦）上的新音会先闷掉（choke）旧音，像真实吉他一样一根弦只发一个音；
+    - 同时发声数超过 max_voices 时，按 steal 策略（oldest 最早开始 / quietest 估计最轻）抢占一个声部；
+    - reserved(group) 可为某个分组返回专用通道（pygame 中为每根弦预留的 Channel），否则使用 sound.play()；
+      sound.play() 仍拿不到通道时，force_channel() 可强制让出一个通道（pygame.mixer.find_channel(True)）。
+    对 pygame.mixer.Channel 与 soft_mixer.MixerChannel 都适用。
+    """
+
+    def __init__(self, max_voices: int = 12, steal: str = 'oldest', choke: bool = True,
+                 release_ms: int = 30, reserved: Optional[Callable[[Hashable], Any]] = None,
+                 force_channel: Optional[Callable[[], Any]] = None):
+        if steal not in STEAL_POLICIES:
+            raise ValueError(f"未知的抢占策略: {steal}（可选 {', '.join(STEAL_POLICIES)}）")
+        self.max_voices = max(1, int(max_voices))
+        self.steal = steal
+        self.choke = choke
+        self.release_ms = int(release_ms)
+        self._reserved = reserved
+        self._force_channel = force_channel
+        self._voices: List[_VoiceRecord] = []
+        self.started = 0
+        self.stolen = 0
+        self.choked = 0
+        self.dropped = 0
+        self.peak = 0
+
+    @staticmethod
+    def _is_playing(voice: _VoiceRecord) -> bool:
+        try:
+            busy = voice.channel.get_busy()
+            get_sound = getattr(voice.channel, 'get_sound', None)
+            # pygame 的 Channel 会被复用，确认通道上仍是这个样本
+            return bool(busy) and (get_sound is None or get_sound() is voice.sound)
+        except Exception:
+            return False
+
+    def _release(self, voice: _VoiceRecord):
+        try:
+            fadeout = getattr(voice.channel, 'fadeout', None)
+            if fadeout is not None and self.release_ms > 0:
+                fadeout(self.release_ms)
+            else:
+                voice.channel.stop()
+        except Exception:
+            pass
+
+    def _reap(self):
+        self._voices = [v for v in self._voices if self._is_playing(v)]
+
+    def _steal_one(self) -> bool:
+        if not self._voices:
+            return False
+        if self.steal == 'quietest':
+            now = time.perf_counter()
+            victim = min(self._voices, key=lambda v: v.level(now))
+        else:
+            victim = min(self._voices, key=lambda v: v.started)
+        self._voices.remove(victim)
+        self._release(victim)
+        self.stolen += 1
+        logger.debug("抢占声部 group=%s", victim.group)
+        return True
+
+    def play(self, sound, group: Optional[Hashable] = None, volume: Optional[float] = None):
+        """按池规则播放 sound，返回通道（无法获得通道时返回 None）；volume 为 None 时不改动样本音量"""
+        self._reap()
+        if group is not None and self.choke:
+            for voice in [v for v in self._voices if v.group == group]:
+                self._voices.remove(voice)
+                self._release(voice)
+                self.choked += 1
+        while len(self._voices) >= self.max_voices:
+            self._steal_one()
+
+        if volume is not None:
+            sound.set_volume(volume)
+        channel = self._reserved(group) if self._reserved is not None and group is not None else None
+        if channel is not None:
+            channel.play(sound)
+        else:
+            channel = sound.play()
+            # 后端通道耗尽（例如还有池外的声音在播放）时再抢占一次
+            if channel is None and self._steal_one():
+                channel = sound.play()
+            if channel is None and self._force_channel is not None:
+                channel = self._force_channel()
+                if channel is not None:
+                    channel.play(sound)
+        if channel is None:
+            self.dropped += 1
+            logger.debug("无可用通道，丢弃 group=%s", group)
+            return None
+
+        self._voices.append(_VoiceRecord(sound, channel, group, 1.0 if volume is None else volume,
+                                         sound.get_length()))
+        self.started += 1
+        self.peak = max(self.peak, len(self._voices))
+        return channel
+
+    def stop_all(self):
+        for voice in self._voices:
+            self._release(voice)
+        self._voices = []
+
+    @property
+    def active(self) -> int:
+        self._reap()
+        return len(self._voices)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'active': self.active,
+            'peak': self.peak,
+            'max_voices': self.max_voices,
+            'started': self.started,
+            'stolen': self.stolen,
+            'choked': self.choked,
+            'dropped': self.dropped,
+        }